@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import argparse
+import http.client
+import os
+import selectors
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+CODE_DIR = Path(__file__).resolve().parents[1]
+
+
+def _raise_nofile() -> None:
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY else 65536, hard))
+
+
+def _spawn(mode: str, port: int, state_dir: str) -> subprocess.Popen:
+    env = os.environ.copy()
+    env.update({
+        "OPENCLAW_BFF_SERVER": mode,
+        "OPENCLAW_BFF_PORT": str(port),
+        "OPENCLAW_STATE_DIR": os.path.join(state_dir, "state"),
+        "OPENCLAW_LOG_DIR": os.path.join(state_dir, "log"),
+        "OPENCLAW_RUNTIME_DIR": os.path.join(state_dir, "run"),
+        "OPENCLAW_LOG_LEVEL": "WARNING",
+        "PYTHONPATH": str(CODE_DIR),
+    })
+    return subprocess.Popen([sys.executable, "-m", "services.bff_service"], cwd=str(CODE_DIR), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _wait_ready(host: str, port: int, path: str, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", path)
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _latency(host: str, port: int, path: str, headers: Dict[str, str], concurrency: int, requests: int) -> Dict[str, float]:
+    samples: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    per_worker = max(1, requests // concurrency)
+
+    def _worker() -> None:
+        conn = http.client.HTTPConnection(host, port, timeout=10)
+        local: List[float] = []
+        for _ in range(per_worker):
+            t0 = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                conn.getresponse().read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                with lock:
+                    errors[0] += 1
+                continue
+            local.append(time.perf_counter() - t0)
+        conn.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=_worker) for _ in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {
+        "p50_ms": _pct(samples, 0.50) * 1000,
+        "p99_ms": _pct(samples, 0.99) * 1000,
+        "rps": len(samples) / elapsed if elapsed > 0 else 0.0,
+        "errors": errors[0],
+    }
+
+
+def _probe_ms(host: str, port: int, path: str, headers: Dict[str, str], timeout: float) -> Optional[float]:
+    t0 = time.perf_counter()
+    try:
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        conn.request("GET", path, headers=headers)
+        conn.getresponse().read()
+        conn.close()
+    except (OSError, http.client.HTTPException):
+        return None
+    return (time.perf_counter() - t0) * 1000
+
+
+def _sse_capacity(host: str, port: int, path: str, headers: Dict[str, str], max_clients: int, step: int, timeout: float) -> Dict[str, float]:
+    request = b"GET /v1/events/stream HTTP/1.1\r\nHost: bench\r\nAccept: text/event-stream\r\n\r\n"
+    sel = selectors.DefaultSelector()
+    socks: List[socket.socket] = []
+    connected = 0
+    probe = 0.0
+    try:
+        while len(socks) < max_clients:
+            batch: List[socket.socket] = []
+            for _ in range(min(step, max_clients - len(socks))):
+                try:
+                    s = socket.create_connection((host, port), timeout=timeout)
+                    s.sendall(request)
+                except OSError:
+                    break
+                s.setblocking(False)
+                sel.register(s, selectors.EVENT_READ)
+                batch.append(s)
+            socks.extend(batch)
+            pending = set(batch)
+            deadline = time.monotonic() + timeout
+            while pending and time.monotonic() < deadline:
+                for key, _ in sel.select(timeout=max(0.0, deadline - time.monotonic())):
+                    s = key.fileobj
+                    try:
+                        data = s.recv(65536)
+                    except OSError:
+                        data = b""
+                    if s in pending and b"event:" in data:
+                        pending.discard(s)
+            ms = _probe_ms(host, port, path, headers, timeout)
+            if pending or not batch or ms is None:
+                break
+            connected = len(socks)
+            probe = ms
+    finally:
+        for s in socks:
+            sel.unregister(s)
+            s.close()
+        sel.close()
+    return {"sse_clients": connected, "probe_ms": probe}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="BFF latency and SSE capacity: threaded vs asyncio server modes")
+    parser.add_argument("--modes", default="threaded,asyncio")
+    parser.add_argument("--url", default="", help="benchmark an already running BFF instead of spawning one per mode")
+    parser.add_argument("--port", type=int, default=18480)
+    parser.add_argument("--path", default="/readyz")
+    parser.add_argument("--token", default="")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--sse-max", type=int, default=2000)
+    parser.add_argument("--sse-step", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    _raise_nofile()
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    if args.url:
+        parsed = urllib.parse.urlparse(args.url)
+        targets = [("external", parsed.hostname or "127.0.0.1", parsed.port or 80)]
+    else:
+        targets = [(mode, "127.0.0.1", args.port + i) for i, mode in enumerate(m.strip() for m in args.modes.split(",") if m.strip())]
+
+    print(f"{'mode':>10} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>9} {'errors':>7} {'sse clients':>12} {'probe ms':>9}")
+    for mode, host, port in targets:
+        proc = None
+        tmp = None
+        if mode != "external":
+            tmp = tempfile.TemporaryDirectory()
+            proc = _spawn(mode, port, tmp.name)
+        try:
+            if not _wait_ready(host, port, args.path, 30.0):
+                print(f"{mode:>10} failed to start")
+                continue
+            lat = _latency(host, port, args.path, headers, max(1, args.concurrency), max(1, args.requests))
+            sse = _sse_capacity(host, port, args.path, headers, max(1, args.sse_max), max(1, args.sse_step), args.timeout)
+            print(f"{mode:>10} {lat['p50_ms']:>8.2f} {lat['p99_ms']:>8.2f} {lat['rps']:>9.0f} {lat['errors']:>7} {sse['sse_clients']:>12} {sse['probe_ms']:>9.1f}")
+        finally:
+            if proc is not None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+            if tmp is not None:
+                tmp.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.persistence import StateDB, DbConfig
+
+
+def _seed(db: StateDB, total: int) -> None:
+    for i in range(total):
+        db.enqueue_work_item(task_id=f"wi-{i}", priority=i % 10, payload={"i": i, "task_type": "default"})
+
+
+def _run(db: StateDB, claimers: int, batch: int) -> int:
+    claimed = [0] * claimers
+
+    def _worker(idx: int) -> None:
+        agent_id = f"agent-{idx}"
+        while True:
+            if batch <= 1:
+                wi = db.claim_work_item(agent_id=agent_id, lease_ttl_sec=60)
+                got = 1 if wi else 0
+            else:
+                got = len(db.claim_work_items(agent_id=agent_id, n=batch, lease_ttl_sec=60))
+            if not got:
+                return
+            claimed[idx] += got
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(claimers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(claimed)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="StateDB single vs batched claim throughput")
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'claimers':>8} {'mode':>10} {'items':>8} {'sec':>8} {'items/s':>10}")
+    for claimers in (4, 16):
+        for mode, batch in (("single", 1), (f"batch{args.batch}", args.batch)):
+            with tempfile.TemporaryDirectory(prefix="md2-bench-claim-") as td:
+                db = StateDB(DbConfig(path=os.path.join(td, "openclaw.db")))
+                _seed(db, args.items)
+                t0 = time.perf_counter()
+                n = _run(db, claimers=claimers, batch=batch)
+                dt = time.perf_counter() - t0
+                db.close()
+            if n != args.items:
+                raise SystemExit(f"claimed {n} of {args.items}")
+            print(f"{claimers:>8} {mode:>10} {n:>8} {dt:>8.3f} {n / dt:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.persistence import StateDB, DbConfig
+from protocols.workflow import NodeRunStatus
+
+
+def _payload(size: int) -> dict:
+    return {"task_type": "default", "task_data": {"blob": "x" * size, "items": list(range(size // 16))}, "context": {"run_id": "run-bench"}}
+
+
+def _timed(fn: Callable[[], int]) -> tuple[int, float]:
+    t0 = time.perf_counter()
+    n = fn()
+    return n, time.perf_counter() - t0
+
+
+def _claim_ack(db: StateDB, touch_payload: bool) -> int:
+    done = 0
+    while True:
+        wi = db.claim_work_item(agent_id="bench", lease_ttl_sec=60)
+        if not wi:
+            return done
+        if touch_payload:
+            _ = wi.payload
+        db.mark_work_item_running(wi.task_id, "bench")
+        db.ack_work_item(wi.task_id, "bench", ok=True)
+        done += 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Lazy payload decoding on the claim/ack and orchestrator tick paths")
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--payload-bytes", type=int, default=8192)
+    args = parser.parse_args()
+
+    print(f"{'path':<34} {'ops':>7} {'sec':>8} {'ops/s':>10}")
+    with tempfile.TemporaryDirectory(prefix="md2-bench-decode-") as td:
+        for touch in (True, False):
+            db = StateDB(DbConfig(path=os.path.join(td, f"claim-{int(touch)}.db")))
+            for i in range(args.items):
+                db.enqueue_work_item(task_id=f"wi-{i}", priority=1, payload=_payload(args.payload_bytes))
+            n, dt = _timed(lambda: _claim_ack(db, touch_payload=touch))
+            label = "claim/ack (payload decoded)" if touch else "claim/ack (payload untouched)"
+            print(f"{label:<34} {n:>7} {dt:>8.3f} {n / dt:>10.0f}")
+            db.close()
+
+        db = StateDB(DbConfig(path=os.path.join(td, "tick.db")))
+        task_ids = [f"wi-{i}" for i in range(args.items)]
+        for task_id in task_ids:
+            db.enqueue_work_item(task_id=task_id, priority=1, payload=_payload(args.payload_bytes))
+            db.update_node_status("run-bench", task_id, NodeRunStatus.PENDING, snapshot={"node": _payload(args.payload_bytes // 4)})
+
+        n, dt = _timed(lambda: sum(1 for t in task_ids if db.get_work_item(t).payload is not None))
+        print(f"{'tick: get_work_item + payload':<34} {n:>7} {dt:>8.3f} {n / dt:>10.0f}")
+        n, dt = _timed(lambda: sum(1 for t in task_ids if db.get_work_item(t).status is not None))
+        print(f"{'tick: get_work_item (status only)':<34} {n:>7} {dt:>8.3f} {n / dt:>10.0f}")
+        n, dt = _timed(lambda: sum(1 for t in task_ids if db.get_work_item_status(t) is not None))
+        print(f"{'tick: get_work_item_status':<34} {n:>7} {dt:>8.3f} {n / dt:>10.0f}")
+        n, dt = _timed(lambda: sum(1 for nr in db.list_node_runs("run-bench") if nr.snapshot is not None))
+        print(f"{'tick: list_node_runs + snapshot':<34} {n:>7} {dt:>8.3f} {n / dt:>10.0f}")
+        n, dt = _timed(lambda: sum(1 for nr in db.list_node_runs("run-bench") if nr.status is not None))
+        print(f"{'tick: list_node_runs (status only)':<34} {n:>7} {dt:>8.3f} {n / dt:>10.0f}")
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
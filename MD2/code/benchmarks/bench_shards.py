@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.persistence import ShardedWorkQueue, ShardConfig
+
+
+def _parallel(threads: int, fn: Callable[[int], int]) -> int:
+    done = [0] * threads
+
+    def _worker(idx: int) -> None:
+        done[idx] = fn(idx)
+
+    workers = [threading.Thread(target=_worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return sum(done)
+
+
+def _run(shards: int, items: int, threads: int, batch: int) -> List[float]:
+    with tempfile.TemporaryDirectory(prefix="md2-bench-shards-") as td:
+        q = ShardedWorkQueue(ShardConfig(root_dir=td, shards=shards))
+        per_thread = items // threads
+
+        def _enqueue(idx: int) -> int:
+            for i in range(per_thread):
+                q.enqueue_work_item(task_id=f"wi-{idx}-{i}", priority=i % 10, payload={"i": i, "task_type": "default"})
+            return per_thread
+
+        def _claim_ack(idx: int) -> int:
+            agent_id = f"agent-{idx}"
+            n = 0
+            while True:
+                claimed = q.claim_work_items(agent_id=agent_id, n=batch, lease_ttl_sec=60)
+                if not claimed:
+                    return n
+                for wi in claimed:
+                    q.mark_work_item_running(wi.task_id, agent_id)
+                    q.ack_work_item(wi.task_id, agent_id, ok=True)
+                n += len(claimed)
+
+        t0 = time.perf_counter()
+        enqueued = _parallel(threads, _enqueue)
+        t1 = time.perf_counter()
+        acked = _parallel(threads, _claim_ack)
+        t2 = time.perf_counter()
+        q.close()
+    if acked != enqueued:
+        raise SystemExit(f"acked {acked} of {enqueued}")
+    return [enqueued / (t1 - t0), acked / (t2 - t1), enqueued / (t2 - t0)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sharded work queue enqueue/claim/ack throughput")
+    parser.add_argument("--items", type=int, default=4000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'shards':>6} {'enqueue/s':>10} {'claim+ack/s':>12} {'end-to-end/s':>13}")
+    for shards in (1, 4, 8):
+        enq, claim_ack, total = _run(shards, args.items, args.threads, args.batch)
+        print(f"{shards:>6} {enq:>10.0f} {claim_ack:>12.0f} {total:>13.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
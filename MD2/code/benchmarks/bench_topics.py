@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("OPENCLAW_LOG_LEVEL", "WARNING")
+
+from core.message_bus import MessageBus, TopicTrie
+
+
+def _patterns(n: int, seed: int) -> List[str]:
+    rnd = random.Random(seed)
+    out: List[str] = []
+    for i in range(n):
+        tenant = rnd.randrange(1000)
+        kind = i % 10
+        if kind < 6:
+            out.append(f"tenant.{tenant}.run.{rnd.randrange(50)}.status")
+        elif kind < 8:
+            out.append(f"tenant.{tenant}.run.*.status")
+        else:
+            out.append(f"tenant.{tenant}.#")
+    return out
+
+
+def _topics(n: int, seed: int) -> List[str]:
+    rnd = random.Random(seed + 1)
+    return [f"tenant.{rnd.randrange(1000)}.run.{rnd.randrange(50)}.status" for _ in range(n)]
+
+
+def _linear_match(patterns: List[str], topic: str) -> List[int]:
+    parts = topic.split(".")
+    out = []
+    for i, pattern in enumerate(patterns):
+        pp = pattern.split(".")
+        if pp[-1] == "#":
+            head = pp[:-1]
+            ok = len(parts) >= len(head) and all(a == b or a == "*" for a, b in zip(head, parts))
+        else:
+            ok = len(pp) == len(parts) and all(a == b or a == "*" for a, b in zip(pp, parts))
+        if ok:
+            out.append(i)
+    return out
+
+
+def _bench_match(subs: int, publishes: int) -> Dict[str, float]:
+    patterns = _patterns(subs, 7)
+    topics = _topics(publishes, 7)
+    trie: TopicTrie[int] = TopicTrie()
+    for i, p in enumerate(patterns):
+        trie.add(p, i)
+    for topic in topics[:50]:
+        if sorted(trie.match(topic)) != _linear_match(patterns, topic):
+            raise SystemExit(f"mismatch for {topic}")
+    t0 = time.perf_counter()
+    for topic in topics:
+        trie.match(topic)
+    t1 = time.perf_counter()
+    linear = topics[: max(1, publishes // 20)]
+    for topic in linear:
+        _linear_match(patterns, topic)
+    t2 = time.perf_counter()
+    return {"trie_us": (t1 - t0) / len(topics) * 1e6, "linear_us": (t2 - t1) / len(linear) * 1e6}
+
+
+async def _bench_bus(subs: int, publishes: int) -> float:
+    bus = MessageBus()
+    await bus.initialize({"history_limit": 100})
+    for p in _patterns(subs, 7):
+        await bus.subscribe(p, lambda msg: None)
+    topics = _topics(publishes, 7)
+    t0 = time.perf_counter()
+    for topic in topics:
+        await bus.publish(topic, {"ok": True})
+    return (time.perf_counter() - t0) / len(topics) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Topic matching and MessageBus publish cost with many subscriptions")
+    parser.add_argument("--publishes", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'subs':>6} {'trie match us':>14} {'linear match us':>16} {'bus publish us':>15}")
+    for subs in (100, 1000, 10000):
+        m = _bench_match(subs, args.publishes)
+        bus_us = asyncio.run(_bench_bus(subs, args.publishes))
+        print(f"{subs:>6} {m['trie_us']:>14.1f} {m['linear_us']:>16.1f} {bus_us:>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.persistence import JsonlWAL
+
+
+def _run(mode: str, records: int, threads: int, wait: bool) -> float:
+    with tempfile.TemporaryDirectory(prefix="md2-bench-wal-") as td:
+        wal = JsonlWAL(wal_path=os.path.join(td, "events.jsonl"), durability=mode)
+        per_thread = records // threads
+
+        def _worker(idx: int) -> None:
+            for i in range(per_thread):
+                data = {"worker": idx, "i": i, "topic": "bench", "payload": {"x": i}}
+                if wait:
+                    wal.append_nowait("bench", data).result()
+                else:
+                    wal.append("bench", data)
+
+        workers = [threading.Thread(target=_worker, args=(i,)) for i in range(threads)]
+        t0 = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        wal.flush()
+        dt = time.perf_counter() - t0
+        wal.close()
+        count = sum(1 for _ in JsonlWAL(wal_path=os.path.join(td, "events.jsonl")).iter_records())
+    if count != per_thread * threads:
+        raise SystemExit(f"{mode}: wrote {count} of {per_thread * threads}")
+    return count / dt
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="JsonlWAL append throughput per durability mode")
+    parser.add_argument("--records", type=int, default=4000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'mode':<14} {'threads':>7} {'records/s':>10}")
+    for label, mode, wait in (("sync", "sync", False), ("group", "group", False), ("group+wait", "group", True), ("async", "async", False)):
+        for threads in (1, args.threads):
+            rate = _run(mode, args.records, threads, wait)
+            print(f"{label:<14} {threads:>7} {rate:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
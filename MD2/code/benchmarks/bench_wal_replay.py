@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.persistence import JsonlWAL
+
+
+_TYPES = ("scheduler_tick", "orchestrator_node_status", "runner_task_done", "event_bus.publish")
+
+
+def _fill(wal: JsonlWAL, records: int) -> None:
+    for i in range(records):
+        rtype = _TYPES[i % len(_TYPES)]
+        wal.append(rtype, {"run_id": f"run-{i % 97}", "task_id": f"wi-{i}", "i": i, "payload": {"text": "x" * 120, "n": list(range(8))}})
+    wal.roll()
+
+
+def _timed(fn: Callable[[], int]) -> float:
+    t0 = time.perf_counter()
+    n = fn()
+    return n / (time.perf_counter() - t0)
+
+
+def _measure(wal: JsonlWAL) -> Dict[str, float]:
+    return {
+        "full": _timed(lambda: sum(1 for rec in wal.iter_records() if rec.data)),
+        "type_filter": _timed(lambda: sum(1 for rec in wal.iter_records() if rec.type != "runner_task_done" or rec.data)),
+        "seek_tail": _timed(lambda: sum(1 for _ in wal.iter_entries(start=wal.next_seq - 1000))),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="WAL replay speed for the JSONL and binary segment formats")
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--segment-mb", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="md2-bench-wal-replay-") as td:
+        wal_path = os.path.join(td, "events.jsonl")
+        wal = JsonlWAL(wal_path=wal_path, durability="group", segment_max_bytes=args.segment_mb * 1024 * 1024)
+        _fill(wal, args.records)
+        wal.close()
+
+        results = {}
+        sizes = {}
+        for fmt in ("jsonl", "binary"):
+            wal = JsonlWAL(wal_path=wal_path, format=fmt, segment_max_bytes=args.segment_mb * 1024 * 1024)
+            if fmt == "binary":
+                t0 = time.perf_counter()
+                wal.convert("binary")
+                print(f"converted {args.records} records in {time.perf_counter() - t0:.2f}s")
+            sizes[fmt] = sum(int(s["size_bytes"]) for s in wal.segments())
+            results[fmt] = _measure(wal)
+            wal.close()
+
+    print(f"{'format':<8} {'MiB':>7} {'full rec/s':>11} {'type-filter rec/s':>18} {'seek-tail rec/s':>16}")
+    for fmt, r in results.items():
+        print(f"{fmt:<8} {sizes[fmt] / 1048576:>7.1f} {r['full']:>11.0f} {r['type_filter']:>18.0f} {r['seek_tail']:>16.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
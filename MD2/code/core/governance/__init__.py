@@ -1,6 +1,7 @@
 from .auth import InMemoryAuthProvider
 from .rbac import InMemoryAuthorizer
 from .policy_engine import SimplePolicyEngine
+from .decision_cache import AuthzDecision, AuthzDecisionCache, DecisionCacheStats
 from .entropy_control import (
     EntropyControlCenter,
     TaskStatus,
@@ -19,6 +20,9 @@ __all__ = [
     "InMemoryAuthProvider",
     "InMemoryAuthorizer",
     "SimplePolicyEngine",
+    "AuthzDecision",
+    "AuthzDecisionCache",
+    "DecisionCacheStats",
     "EntropyControlCenter",
     "TaskStatus",
     "TaskReport",
@@ -5,14 +5,13 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import asyncio
-from pathlib import Path
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from protocols.interfaces import IAuditSink
-from utils.serializer import Serializer
+from core.persistence.audit_writer import AuditWriter
 
 
 @dataclass
@@ -25,11 +24,11 @@ class AuditRecord:
 
 
 class InMemoryAuditSink(IAuditSink):
-    def __init__(self, max_records: int = 10000, jsonl_path: Optional[str] = None):
+    def __init__(self, max_records: int = 10000, jsonl_path: Optional[str] = None, writer: Optional[AuditWriter] = None):
         self._max_records = int(max_records)
         self._records: List[AuditRecord] = []
         self._lock = asyncio.Lock()
-        self._jsonl_path = jsonl_path
+        self._writer = writer or (AuditWriter(jsonl_path=jsonl_path) if jsonl_path else None)
 
     async def emit(self, event: Dict[str, Any]) -> bool:
         record = AuditRecord(event=event or {})
@@ -38,11 +37,8 @@ class InMemoryAuditSink(IAuditSink):
             if len(self._records) > self._max_records:
                 self._records = self._records[-self._max_records :]
 
-        if self._jsonl_path:
-            path = Path(self._jsonl_path)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            line = Serializer.to_json(record.to_dict()) + "\n"
-            path.open("a", encoding="utf-8").write(line)
+        if self._writer is not None:
+            self._writer.append(record.to_dict())
 
         return True
 
@@ -29,6 +29,11 @@ class InMemoryAuthProvider(IAuthProvider):
         self._tokens: Dict[str, TokenRecord] = {}
         self._refresh_index: Dict[str, TokenRecord] = {}
         self._lock = asyncio.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     async def authenticate(self, credentials: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         user_id = credentials.get("user_id") or credentials.get("username")
@@ -63,6 +68,12 @@ class InMemoryAuthProvider(IAuthProvider):
             "user": record.user,
         }
 
+    async def authorize(self, user_id: str, resource: str, action: str) -> bool:
+        # Permissions live in the RBAC authorizer; this provider only vouches for live sessions.
+        now = datetime.utcnow()
+        async with self._lock:
+            return any(r.user.get("user_id") == str(user_id) and r.expires_at >= now for r in self._tokens.values())
+
     async def validate_token(self, token: str) -> Optional[Dict[str, Any]]:
         async with self._lock:
             record = self._tokens.get(token)
@@ -89,6 +100,7 @@ class InMemoryAuthProvider(IAuthProvider):
                 record = self._tokens.pop(token)
                 if record.refresh_token:
                     self._refresh_index.pop(record.refresh_token, None)
+                self._version += 1
                 return True
             if token in self._refresh_index:
                 self._refresh_index.pop(token, None)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import threading
+import time
+
+
+@dataclass
+class AuthzDecision:
+    allowed: bool
+    user: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+    reason: Any = None
+
+
+@dataclass
+class DecisionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class AuthzDecisionCache:
+    def __init__(self, ttl_sec: float = 2.0, max_entries: int = 4096):
+        self._ttl = max(0.0, float(ttl_sec))
+        self._max = max(1, int(max_entries))
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[Any, ...], float, AuthzDecision]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = DecisionCacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0
+
+    def get(self, key: Hashable, versions: Tuple[Any, ...]) -> Optional[AuthzDecision]:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            if entry[0] != versions or entry[1] <= now:
+                del self._entries[key]
+                self._stats.stale += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[2]
+
+    def put(self, key: Hashable, versions: Tuple[Any, ...], decision: AuthzDecision, max_age_sec: Optional[float] = None) -> None:
+        ttl = self._ttl if max_age_sec is None else min(self._ttl, float(max_age_sec))
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (versions, time.monotonic() + ttl, decision)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, token: str = "") -> int:
+        with self._lock:
+            if token:
+                keys = [k for k in self._entries if isinstance(k, tuple) and k and k[0] == token]
+            else:
+                keys = list(self._entries)
+            for k in keys:
+                del self._entries[k]
+            self._stats.invalidations += 1
+            return len(keys)
+
+    def stats(self) -> DecisionCacheStats:
+        with self._lock:
+            return DecisionCacheStats(**{**self._stats.__dict__, "size": len(self._entries)})
@@ -26,7 +26,13 @@ class SimplePolicyEngine(IPolicyEngine):
     def __init__(self, default_allow: bool = False):
         self._default_allow = bool(default_allow)
         self._rules: List[PolicyRule] = []
+        self._attrs: Dict[str, Any] = {}
         self._lock = asyncio.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     async def decide(
         self,
@@ -69,8 +75,35 @@ class SimplePolicyEngine(IPolicyEngine):
     async def add_rule(self, rule: PolicyRule) -> bool:
         async with self._lock:
             self._rules.append(rule)
+            self._version += 1
+        return True
+
+    async def get(self, key: str) -> Optional[Any]:
+        async with self._lock:
+            return self._attrs.get(key)
+
+    async def set(self, key: str, value: Any) -> bool:
+        async with self._lock:
+            self._attrs[key] = value
+            self._version += 1
         return True
 
+    async def pop(self, key: str) -> Optional[Any]:
+        async with self._lock:
+            if key not in self._attrs:
+                return None
+            self._version += 1
+            return self._attrs.pop(key)
+
+    async def snapshot(self) -> Dict[str, Any]:
+        async with self._lock:
+            return {
+                "default_allow": self._default_allow,
+                "version": self._version,
+                "rules": [dict(r.__dict__) for r in self._rules],
+                "attrs": dict(self._attrs),
+            }
+
     def _match(self, pattern: str, value: str) -> bool:
         return pattern == "*" or str(pattern) == str(value)
 
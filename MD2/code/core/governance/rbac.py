@@ -27,6 +27,11 @@ class InMemoryAuthorizer(IAuthorizer):
         self._roles: Dict[str, Role] = {}
         self._user_roles: Dict[str, Set[str]] = {}
         self._lock = asyncio.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     async def check_permission(self, user_id: str, resource: str, action: str) -> bool:
         perms = await self._get_effective_permissions(user_id)
@@ -40,7 +45,9 @@ class InMemoryAuthorizer(IAuthorizer):
         async with self._lock:
             if user_id not in self._user_permissions:
                 self._user_permissions[user_id] = set()
-            self._user_permissions[user_id].add((resource, action))
+            if (resource, action) not in self._user_permissions[user_id]:
+                self._user_permissions[user_id].add((resource, action))
+                self._version += 1
         return True
 
     async def revoke_permission(self, user_id: str, resource: str, action: str) -> bool:
@@ -50,12 +57,14 @@ class InMemoryAuthorizer(IAuthorizer):
             if (resource, action) not in self._user_permissions[user_id]:
                 return False
             self._user_permissions[user_id].remove((resource, action))
+            self._version += 1
             return True
 
     async def add_role(self, role_name: str, permissions: List[Dict[str, str]]) -> bool:
         perms: Set[Permission] = set((p["resource"], p["action"]) for p in permissions)
         async with self._lock:
             self._roles[role_name] = Role(name=role_name, permissions=perms)
+            self._version += 1
         return True
 
     async def assign_role(self, user_id: str, role_name: str) -> bool:
@@ -64,7 +73,9 @@ class InMemoryAuthorizer(IAuthorizer):
                 return False
             if user_id not in self._user_roles:
                 self._user_roles[user_id] = set()
-            self._user_roles[user_id].add(role_name)
+            if role_name not in self._user_roles[user_id]:
+                self._user_roles[user_id].add(role_name)
+                self._version += 1
         return True
 
     async def unassign_role(self, user_id: str, role_name: str) -> bool:
@@ -72,6 +83,7 @@ class InMemoryAuthorizer(IAuthorizer):
             if user_id not in self._user_roles or role_name not in self._user_roles[user_id]:
                 return False
             self._user_roles[user_id].remove(role_name)
+            self._version += 1
         return True
 
     async def _get_effective_permissions(self, user_id: str) -> Set[Permission]:
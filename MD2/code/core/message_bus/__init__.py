@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from .message_bus import MessageBus, Message, Subscription, MessageBusStats
+from .topic_trie import TopicTrie, is_pattern
 
 __all__ = [
     "MessageBus",
     "Message",
     "Subscription",
     "MessageBusStats",
+    "TopicTrie",
+    "is_pattern",
 ]
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 import sys
 import os
+import uuid
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from protocols.interfaces import IMessageBus, IModule
 from protocols.trace import TraceContext
 from utils.logger import get_logger
 
+from .topic_trie import TopicTrie, is_pattern, split_pattern
+
 
 Handler = Callable[[Dict[str, Any]], Any]
 
@@ -25,6 +29,7 @@ class Message:
     timestamp: int = field(default_factory=lambda: int(datetime.now(tz=timezone.utc).timestamp()))
     headers: Dict[str, str] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    seq: int = 0
 
 
 @dataclass
@@ -50,8 +55,11 @@ class MessageBus(IModule, IMessageBus):
     def __init__(self):
         self._subscriptions: Dict[str, Subscription] = {}
         self._topic_subscriptions: Dict[str, List[str]] = {}
-        self._message_history: Dict[str, List[Message]] = {}
+        self._trie: TopicTrie[str] = TopicTrie()
+        self._message_history: Dict[str, Deque[Message]] = {}
+        self._evicted_through: Dict[str, int] = {}
         self._history_limit: int = 100
+        self._epoch = uuid.uuid4().hex[:8]
         self._initialized = False
         self._logger = get_logger("message_bus")
         self._subscription_counter = 0
@@ -68,7 +76,11 @@ class MessageBus(IModule, IMessageBus):
 
     async def initialize(self, config: Dict[str, Any]) -> bool:
         if config.get("history_limit"):
-            self._history_limit = config["history_limit"]
+            self._history_limit = max(1, int(config["history_limit"]))
+            for topic, ring in list(self._message_history.items()):
+                if len(ring) > self._history_limit:
+                    self._evicted_through[topic] = ring[-self._history_limit - 1].seq
+                self._message_history[topic] = deque(ring, maxlen=self._history_limit)
 
         self._initialized = True
         self._logger.info("Message bus initialized", history_limit=self._history_limit)
@@ -77,6 +89,7 @@ class MessageBus(IModule, IMessageBus):
     async def shutdown(self) -> bool:
         self._subscriptions.clear()
         self._topic_subscriptions.clear()
+        self._trie = TopicTrie()
         self._initialized = False
         self._logger.info("Message bus shutdown")
         return True
@@ -94,6 +107,15 @@ class MessageBus(IModule, IMessageBus):
         if command == "publish":
             success = await self.publish(args.get("topic", ""), args.get("payload", {}), args.get("trace_id"))
             return {"success": success}
+        elif command == "publish_many":
+            message_ids = await self.publish_many(args.get("topic", ""), list(args.get("payloads") or []), args.get("trace_id"))
+            return {"message_ids": message_ids}
+        elif command == "history_since":
+            try:
+                messages = self.get_history_since(args.get("topic", ""), args.get("message_id", ""), int(args.get("limit", 0) or 0), strict=bool(args.get("strict", True)))
+            except ValueError as e:
+                return {"error": str(e)}
+            return {"messages": messages}
         elif command == "subscribe":
             sub_id = await self.subscribe(args.get("topic", ""), args.get("handler"))
             return {"subscription_id": sub_id}
@@ -107,25 +129,41 @@ class MessageBus(IModule, IMessageBus):
             return {"error": f"Unknown command: {command}"}
 
     async def publish(self, topic: str, payload: Dict[str, Any], trace_id: Optional[str] = None) -> bool:
-        self._message_counter += 1
-        message_id = f"msg_{self._message_counter}"
+        message = self._record(topic, payload, trace_id)
+        self._stats["published"] += 1
+        subscription_ids = self._trie.match(topic)
+        await self._deliver(message, subscription_ids)
+        self._logger.debug("Message published", topic=topic, message_id=message.message_id, subscribers=len(subscription_ids))
+        return True
+
+    async def publish_many(self, topic: str, payloads: List[Dict[str, Any]], trace_id: Optional[str] = None) -> List[str]:
+        messages = [self._record(topic, payload, trace_id) for payload in payloads]
+        self._stats["published"] += len(messages)
+        subscription_ids = self._trie.match(topic)
+        for message in messages:
+            await self._deliver(message, subscription_ids)
+        self._logger.debug("Messages published", topic=topic, count=len(messages), subscribers=len(subscription_ids))
+        return [m.message_id for m in messages]
 
+    def _record(self, topic: str, payload: Dict[str, Any], trace_id: Optional[str]) -> Message:
+        self._message_counter += 1
+        seq = self._message_counter
         message = Message(
-            message_id=message_id,
+            message_id=f"msg_{self._epoch}_{seq}",
             topic=topic,
             payload=payload,
             trace_id=trace_id,
+            seq=seq,
         )
-
-        if topic not in self._message_history:
-            self._message_history[topic] = []
-        self._message_history[topic].append(message)
-        if len(self._message_history[topic]) > self._history_limit:
-            self._message_history[topic] = self._message_history[topic][-self._history_limit :]
-
-        self._stats["published"] += 1
-
-        subscription_ids = self._topic_subscriptions.get(topic, [])
+        ring = self._message_history.get(topic)
+        if ring is None:
+            ring = self._message_history[topic] = deque(maxlen=self._history_limit)
+        if len(ring) == ring.maxlen:
+            self._evicted_through[topic] = ring[0].seq
+        ring.append(message)
+        return message
+
+    async def _deliver(self, message: Message, subscription_ids: List[str]) -> None:
         for sub_id in subscription_ids:
             sub = self._subscriptions.get(sub_id)
             if not sub:
@@ -142,15 +180,13 @@ class MessageBus(IModule, IMessageBus):
                 self._stats["errors"] += 1
                 self._logger.error(
                     "Message handler error",
-                    topic=topic,
+                    topic=message.topic,
                     subscription_id=sub_id,
                     error=str(e),
                 )
 
-        self._logger.debug("Message published", topic=topic, message_id=message_id, subscribers=len(subscription_ids))
-        return True
-
     async def subscribe(self, topic: str, handler: Any) -> str:
+        split_pattern(topic)
         self._subscription_counter += 1
         subscription_id = f"sub_{self._subscription_counter}"
 
@@ -165,6 +201,7 @@ class MessageBus(IModule, IMessageBus):
         if topic not in self._topic_subscriptions:
             self._topic_subscriptions[topic] = []
         self._topic_subscriptions[topic].append(subscription_id)
+        self._trie.add(topic, subscription_id)
 
         self._logger.info("Subscription created", topic=topic, subscription_id=subscription_id)
         return subscription_id
@@ -177,14 +214,50 @@ class MessageBus(IModule, IMessageBus):
         if sub.topic in self._topic_subscriptions:
             if subscription_id in self._topic_subscriptions[sub.topic]:
                 self._topic_subscriptions[sub.topic].remove(subscription_id)
+        self._trie.remove(sub.topic, subscription_id)
 
         self._logger.info("Subscription removed", subscription_id=subscription_id)
         return True
 
     def get_history(self, topic: str, limit: int = 10) -> List[Dict[str, Any]]:
-        messages = self._message_history.get(topic, [])
+        messages = list(self._message_history.get(topic, ()))
         return [m.__dict__ for m in messages[-limit:]]
 
+    def get_history_since(self, topic: str, message_id: str = "", limit: int = 0, strict: bool = True) -> List[Dict[str, Any]]:
+        since = self._seq_of(message_id)
+        if is_pattern(topic):
+            trie: TopicTrie[str] = TopicTrie()
+            trie.add(topic, topic)
+            topics = [t for t in self._message_history if trie.match(t)]
+        else:
+            topics = [topic]
+        # Without a cursor the caller asked for whatever is retained, so there is no gap to report.
+        if strict and message_id and any(self._evicted_through.get(t, 0) > since for t in topics):
+            raise ValueError("history_gap")
+        out: List[Message] = []
+        for t in topics:
+            newer: List[Message] = []
+            for m in reversed(self._message_history.get(t, ())):
+                if m.seq <= since:
+                    break
+                newer.append(m)
+            out.extend(newer)
+        out.sort(key=lambda m: m.seq)
+        if limit:
+            out = out[: int(limit)]
+        return [m.__dict__ for m in out]
+
+    def _seq_of(self, message_id: str) -> int:
+        if not message_id:
+            return 0
+        prefix = f"msg_{self._epoch}_"
+        if not str(message_id).startswith(prefix):
+            return 0
+        try:
+            return int(str(message_id)[len(prefix):])
+        except ValueError:
+            return 0
+
     def get_stats(self) -> MessageBusStats:
         return MessageBusStats(
             total_published=self._stats["published"],
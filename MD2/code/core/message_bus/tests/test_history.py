@@ -0,0 +1,52 @@
+import asyncio
+import os
+import sys
+import unittest
+
+code_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.message_bus.message_bus import MessageBus
+
+
+class TestHistorySince(unittest.TestCase):
+    def setUp(self):
+        self.bus = MessageBus()
+        asyncio.run(self.bus.initialize({"history_limit": 3}))
+
+    def _publish(self, topic, n):
+        ids = []
+        for i in range(n):
+            asyncio.run(self.bus.publish(topic, {"i": i}))
+            ids.append(self.bus.get_history(topic, limit=1)[0]["message_id"])
+        return ids
+
+    def test_returns_messages_after_cursor(self):
+        ids = self._publish("jobs.a", 3)
+        got = self.bus.get_history_since("jobs.a", ids[0])
+        self.assertEqual([m["payload"]["i"] for m in got], [1, 2])
+
+    def test_evicted_cursor_raises_history_gap(self):
+        ids = self._publish("jobs.a", 5)
+        with self.assertRaises(ValueError) as ctx:
+            self.bus.get_history_since("jobs.a", ids[0])
+        self.assertEqual(str(ctx.exception), "history_gap")
+        self.assertEqual(len(self.bus.get_history_since("jobs.a", ids[0], strict=False)), 3)
+        self.assertEqual(len(self.bus.get_history_since("jobs.a", ids[1])), 3)
+
+    def test_gap_on_any_matching_topic_is_reported(self):
+        first = self._publish("jobs.a", 1)[0]
+        self._publish("jobs.b", 5)
+        with self.assertRaises(ValueError):
+            self.bus.get_history_since("jobs.*", first)
+        result = asyncio.run(self.bus.execute("history_since", {"topic": "jobs.*", "message_id": first}))
+        self.assertEqual(result, {"error": "history_gap"})
+
+    def test_no_cursor_returns_retained_history(self):
+        self._publish("jobs.a", 5)
+        self.assertEqual([m["payload"]["i"] for m in self.bus.get_history_since("jobs.a")], [2, 3, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+
+SEPARATOR = "."
+WILDCARD_ONE = "*"
+WILDCARD_REST = "#"
+
+
+def is_pattern(topic: str) -> bool:
+    return any(part in (WILDCARD_ONE, WILDCARD_REST) for part in str(topic).split(SEPARATOR))
+
+
+def split_pattern(pattern: str) -> List[str]:
+    parts = str(pattern).split(SEPARATOR)
+    if WILDCARD_REST in parts[:-1]:
+        raise ValueError("invalid_topic_pattern")
+    return parts
+
+
+class _Node(Generic[K]):
+    __slots__ = ("children", "keys", "rest")
+
+    def __init__(self):
+        self.children: Dict[str, _Node[K]] = {}
+        self.keys: Dict[K, int] = {}
+        self.rest: Dict[K, int] = {}
+
+
+class TopicTrie(Generic[K]):
+    def __init__(self):
+        self._root: _Node[K] = _Node()
+        self._seq = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, pattern: str, key: K) -> None:
+        parts = split_pattern(pattern)
+        node = self._root
+        rest = parts[-1] == WILDCARD_REST
+        for part in parts[:-1] if rest else parts:
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node()
+            node = child
+        bucket = node.rest if rest else node.keys
+        if key not in bucket:
+            self._seq += 1
+            self._size += 1
+            bucket[key] = self._seq
+
+    def remove(self, pattern: str, key: K) -> bool:
+        parts = split_pattern(pattern)
+        rest = parts[-1] == WILDCARD_REST
+        path: List[Tuple[_Node[K], str]] = []
+        node: Optional[_Node[K]] = self._root
+        for part in parts[:-1] if rest else parts:
+            child = node.children.get(part)
+            if child is None:
+                return False
+            path.append((node, part))
+            node = child
+        bucket = node.rest if rest else node.keys
+        if bucket.pop(key, None) is None:
+            return False
+        self._size -= 1
+        for parent, part in reversed(path):
+            child = parent.children[part]
+            if child.keys or child.rest or child.children:
+                break
+            del parent.children[part]
+        return True
+
+    def match(self, topic: str) -> List[K]:
+        parts = str(topic).split(SEPARATOR)
+        found: Dict[K, int] = {}
+        stack: List[Tuple[_Node[K], int]] = [(self._root, 0)]
+        depth = len(parts)
+        while stack:
+            node, i = stack.pop()
+            if node.rest:
+                found.update(node.rest)
+            if i == depth:
+                if node.keys:
+                    found.update(node.keys)
+                continue
+            child = node.children.get(parts[i])
+            if child is not None:
+                stack.append((child, i + 1))
+            star = node.children.get(WILDCARD_ONE)
+            if star is not None:
+                stack.append((star, i + 1))
+        if len(found) <= 1:
+            return list(found)
+        return sorted(found, key=found.__getitem__)
@@ -1,13 +1,18 @@
-from .event_bus import InMemoryEventBus
+from .event_bus import InMemoryEventBus, SubscriberStats, OVERFLOW_POLICIES
 from .persistent_bus import PersistentEventBus, ChannelStats
+from .wal_follower import WalEventFollower, FollowerStats
 from .tracing import InMemoryTracer
 from .metrics import InMemoryMetricsCollector
 from .evidence import EvidenceStore
 
 __all__ = [
     "InMemoryEventBus",
+    "SubscriberStats",
+    "OVERFLOW_POLICIES",
     "PersistentEventBus",
     "ChannelStats",
+    "WalEventFollower",
+    "FollowerStats",
     "InMemoryTracer",
     "InMemoryMetricsCollector",
     "EvidenceStore",
@@ -9,62 +9,176 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.message_bus.topic_trie import TopicTrie, split_pattern
 from protocols.interfaces import IEventBus
 from utils.logger import get_logger
 
 
 Handler = Callable[[Dict[str, Any]], Any]
 
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+@dataclass
+class SubscriberStats:
+    subscription_id: str
+    topic: str
+    overflow: str
+    queue_size: int
+    lag: int = 0
+    max_lag: int = 0
+    enqueued: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    errors: int = 0
+
 
 @dataclass
 class Subscription:
     subscription_id: str
     topic: str
     handler: Handler
+    overflow: str = "block"
+    queue: Optional["asyncio.Queue[Dict[str, Any]]"] = None
+    task: Optional["asyncio.Task[None]"] = None
+    stats: Optional[SubscriberStats] = None
 
 
 class InMemoryEventBus(IEventBus):
-    def __init__(self):
+    def __init__(self, queue_size: int = 1024, overflow: str = "block", drain_timeout_sec: float = 5.0):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("invalid_overflow_policy")
         self._subscriptions: Dict[str, Subscription] = {}
         self._topics: Dict[str, List[str]] = {}
+        self._trie: TopicTrie[str] = TopicTrie()
         self._lock = asyncio.Lock()
+        self._queue_size = max(1, int(queue_size))
+        self._overflow = overflow
+        self._drain_timeout = max(0.0, float(drain_timeout_sec))
         self._logger = get_logger("observability.event_bus")
 
     async def publish(self, topic: str, event: Dict[str, Any]) -> bool:
         async with self._lock:
-            subscription_ids = list(self._topics.get(topic, []))
+            subscription_ids = self._trie.match(topic)
 
         for sub_id in subscription_ids:
             sub = self._subscriptions.get(sub_id)
             if not sub:
                 continue
-            try:
-                result = sub.handler(event)
-                if asyncio.iscoroutine(result):
-                    await result
-            except Exception as e:
-                self._logger.error("event_handler_error", topic=topic, subscription_id=sub_id, error=str(e))
+            await self._enqueue(sub, event)
 
         return True
 
-    async def subscribe(self, topic: str, handler: Callable[[Dict[str, Any]], None]) -> str:
+    async def subscribe(self, topic: str, handler: Callable[[Dict[str, Any]], None], queue_size: Optional[int] = None, overflow: Optional[str] = None) -> str:
+        policy = overflow or self._overflow
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError("invalid_overflow_policy")
+        split_pattern(topic)
+        size = max(1, int(queue_size or self._queue_size))
         subscription_id = str(uuid.uuid4())
-        sub = Subscription(subscription_id=subscription_id, topic=topic, handler=handler)
+        sub = Subscription(
+            subscription_id=subscription_id,
+            topic=topic,
+            handler=handler,
+            overflow=policy,
+            queue=asyncio.Queue(maxsize=size),
+            stats=SubscriberStats(subscription_id=subscription_id, topic=topic, overflow=policy, queue_size=size),
+        )
+        sub.task = asyncio.get_running_loop().create_task(self._consume(sub), name=f"event-bus:{topic}:{subscription_id[:8]}")
 
         async with self._lock:
             self._subscriptions[subscription_id] = sub
             if topic not in self._topics:
                 self._topics[topic] = []
             self._topics[topic].append(subscription_id)
+            self._trie.add(topic, subscription_id)
 
         return subscription_id
 
-    async def unsubscribe(self, subscription_id: str) -> bool:
+    async def unsubscribe(self, subscription_id: str, timeout: Optional[float] = None) -> bool:
         async with self._lock:
-            sub = self._subscriptions.pop(subscription_id, None)
-            if not sub:
-                return False
-            if sub.topic in self._topics and subscription_id in self._topics[sub.topic]:
-                self._topics[sub.topic].remove(subscription_id)
-            return True
+            sub = self._detach_locked(subscription_id)
+        if not sub:
+            return False
+        await self._retire([sub], timeout)
+        return True
+
+    async def drain(self) -> None:
+        for sub in list(self._subscriptions.values()):
+            if sub.queue is not None:
+                await sub.queue.join()
 
+    async def close(self, timeout: Optional[float] = None) -> None:
+        async with self._lock:
+            subs = [self._detach_locked(sub_id) for sub_id in list(self._subscriptions)]
+        await self._retire([sub for sub in subs if sub], timeout)
+
+    def get_subscriber_stats(self) -> List[SubscriberStats]:
+        out: List[SubscriberStats] = []
+        for sub in list(self._subscriptions.values()):
+            st = sub.stats
+            st.lag = sub.queue.qsize()
+            out.append(SubscriberStats(**st.__dict__))
+        return out
+
+    def _detach_locked(self, subscription_id: str) -> Optional[Subscription]:
+        sub = self._subscriptions.pop(subscription_id, None)
+        if not sub:
+            return None
+        if sub.topic in self._topics and subscription_id in self._topics[sub.topic]:
+            self._topics[sub.topic].remove(subscription_id)
+        self._trie.remove(sub.topic, subscription_id)
+        return sub
+
+    async def _retire(self, subs: List[Subscription], timeout: Optional[float]) -> None:
+        # Detached subscriptions get no new events; let their consumers finish what is queued
+        # within the grace period, and count whatever is left as dropped.
+        grace = self._drain_timeout if timeout is None else max(0.0, float(timeout))
+        current = asyncio.current_task()
+        waits = [sub.queue.join() for sub in subs if sub.task is not None and sub.task is not current and not sub.task.done()]
+        if waits and grace > 0:
+            try:
+                await asyncio.wait_for(asyncio.gather(*waits), grace)
+            except asyncio.TimeoutError:
+                pass
+        for sub in subs:
+            left = sub.queue.qsize()
+            if left:
+                sub.stats.dropped += left
+                self._logger.warn("event_queue_discarded", topic=sub.topic, subscription_id=sub.subscription_id, dropped=left)
+            if sub.task is not None and sub.task is not current:
+                sub.task.cancel()
+
+    async def _enqueue(self, sub: Subscription, event: Dict[str, Any]) -> None:
+        q = sub.queue
+        st = sub.stats
+        if q.full():
+            if sub.overflow == "drop_newest":
+                st.dropped += 1
+                return
+            if sub.overflow == "drop_oldest":
+                q.get_nowait()
+                q.task_done()
+                st.dropped += 1
+        if sub.overflow == "block":
+            await q.put(event)
+        else:
+            q.put_nowait(event)
+        st.enqueued += 1
+        st.max_lag = max(st.max_lag, q.qsize())
+
+    async def _consume(self, sub: Subscription) -> None:
+        q = sub.queue
+        st = sub.stats
+        while True:
+            event = await q.get()
+            try:
+                result = sub.handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                st.delivered += 1
+            except Exception as e:
+                st.errors += 1
+                self._logger.error("event_handler_error", topic=sub.topic, subscription_id=sub.subscription_id, error=str(e))
+            finally:
+                q.task_done()
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
 import json
+import uuid
 
-from core.persistence import JsonlWAL, StateDB
+from core.persistence import JsonlWAL, StateDB, WalTopicIndex
 from protocols.events import EventEnvelope
 from protocols.trace import TraceContext
 
-from .event_bus import InMemoryEventBus
+from .event_bus import InMemoryEventBus, SubscriberStats
 
 
 Handler = Callable[[Dict[str, Any]], Any]
@@ -23,9 +25,11 @@ class ChannelStats:
 
 
 class PersistentEventBus:
-    def __init__(self, wal: JsonlWAL, state_db: StateDB):
+    def __init__(self, wal: JsonlWAL, state_db: StateDB, index: Optional[WalTopicIndex] = None):
         self._wal = wal
         self._db = state_db
+        # Share the persisted index the runtime container uses, so startup does not rescan the WAL.
+        self._index = index or WalTopicIndex(wal, index_path=str(Path(wal.path).with_name(f"{Path(wal.path).stem}.topics.json")))
         self._mem = InMemoryEventBus()
         self._published: Dict[str, int] = {}
 
@@ -33,12 +37,12 @@ class PersistentEventBus:
         env = EventEnvelope(
             topic=str(topic),
             version=str((event or {}).get("version", "v1")),
-            event_id=str((event or {}).get("event_id", "")) or "",
+            event_id=str((event or {}).get("event_id", "")) or uuid.uuid4().hex,
             trace=_trace_from_event(event),
             payload=dict((event or {}).get("payload") or event or {}),
             meta=dict((event or {}).get("meta") or {}),
         )
-        self._wal.append("event_bus.publish", {"topic": topic, "envelope": _as_dict(env)})
+        self._index.append(topic, {"envelope": _as_dict(env)})
         self._published[topic] = int(self._published.get(topic, 0)) + 1
         return await self._mem.publish(topic, _as_dict(env))
 
@@ -49,29 +53,29 @@ class PersistentEventBus:
         return await self._mem.unsubscribe(subscription_id)
 
     def get_channel_stats(self) -> List[ChannelStats]:
+        subscribers: Dict[str, int] = {}
+        for sub in self._mem.get_subscriber_stats():
+            subscribers[sub.topic] = subscribers.get(sub.topic, 0) + 1
         stats: List[ChannelStats] = []
         for topic, count in self._published.items():
-            stats.append(ChannelStats(topic=topic, published=int(count), subscribers=0))
+            stats.append(ChannelStats(topic=topic, published=int(count), subscribers=subscribers.get(topic, 0)))
         return stats
 
+    def get_subscriber_stats(self) -> List[SubscriberStats]:
+        return self._mem.get_subscriber_stats()
+
     def replay(self, subscriber_id: str, topic: str, handler: Handler, max_records: int = 1000) -> int:
         offset = int(self._db.get_event_offset(subscriber_id=subscriber_id, topic=topic))
         delivered = 0
-        for i, rec in enumerate(self._wal.iter_records()):
-            if rec.type != "event_bus.publish":
-                continue
+        for topic_seq, rec in self._index.iter_topic(topic, start=offset):
             data = rec.data or {}
-            if str(data.get("topic")) != str(topic):
-                continue
-            if i < offset:
-                continue
             env = data.get("envelope") or {}
             try:
                 handler(dict(env))
             except Exception:
                 pass
             delivered += 1
-            offset = i + 1
+            offset = topic_seq + 1
             if delivered >= int(max_records):
                 break
         self._db.set_event_offset(subscriber_id=subscriber_id, topic=topic, offset=offset)
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import sys
+import unittest
+
+code_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.observability import InMemoryEventBus
+
+
+class TestShutdown(unittest.TestCase):
+    def _run(self, delay, timeout, n=5, close=False):
+        async def main():
+            bus = InMemoryEventBus(drain_timeout_sec=5.0)
+            seen = []
+
+            async def handler(event):
+                await asyncio.sleep(delay)
+                seen.append(event["i"])
+
+            sub_id = await bus.subscribe("jobs.*", handler)
+            for i in range(n):
+                await bus.publish("jobs.a", {"i": i})
+            if close:
+                await bus.close(timeout=timeout)
+            else:
+                self.assertTrue(await bus.unsubscribe(sub_id, timeout=timeout))
+            await bus.publish("jobs.a", {"i": n})
+            await asyncio.sleep(0)
+            return seen
+
+        return asyncio.run(main())
+
+    def test_unsubscribe_delivers_queued_events(self):
+        seen = self._run(delay=0.01, timeout=None)
+        self.assertEqual(seen, [0, 1, 2, 3, 4])
+
+    def test_close_delivers_queued_events(self):
+        seen = self._run(delay=0.01, timeout=None, close=True)
+        self.assertEqual(seen, [0, 1, 2, 3, 4])
+
+    def test_grace_period_bounds_shutdown(self):
+        async def main():
+            bus = InMemoryEventBus()
+            seen = []
+
+            async def handler(event):
+                await asyncio.sleep(0.2)
+                seen.append(event["i"])
+
+            sub_id = await bus.subscribe("jobs.a", handler)
+            for i in range(5):
+                await bus.publish("jobs.a", {"i": i})
+            sub = bus._subscriptions[sub_id]
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            await bus.unsubscribe(sub_id, timeout=0.3)
+            elapsed = loop.time() - t0
+            await asyncio.sleep(0)
+            return seen, sub.stats, elapsed
+
+        seen, stats, elapsed = asyncio.run(main())
+        self.assertLess(elapsed, 1.0)
+        # One event was mid-handler when the consumer was cancelled; the rest were still queued.
+        self.assertLess(len(seen), 4)
+        self.assertEqual(len(seen) + stats.dropped, 4)
+
+    def test_unsubscribe_from_own_handler_does_not_wait(self):
+        async def main():
+            bus = InMemoryEventBus(drain_timeout_sec=5.0)
+            ids = []
+
+            async def handler(event):
+                await bus.unsubscribe(ids[0])
+
+            ids.append(await bus.subscribe("jobs.a", handler))
+            await bus.publish("jobs.a", {"i": 0})
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            await asyncio.sleep(0.05)
+            return bus.get_subscriber_stats(), loop.time() - t0
+
+        stats, elapsed = asyncio.run(main())
+        self.assertEqual(stats, [])
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
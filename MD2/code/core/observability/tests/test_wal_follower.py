@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+
+code_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.observability import InMemoryEventBus, PersistentEventBus, WalEventFollower
+from core.persistence import DbConfig, JsonlWAL, StateDB, WalTopicIndex
+from core.runtime import build_runtime_container, get_runtime_paths
+
+
+def _publish(wal_path, db_path, writer, count):
+    wal = JsonlWAL(wal_path, durability="group", segment_max_bytes=4096)
+    index = WalTopicIndex(wal, index_path=os.path.join(os.path.dirname(wal_path), "events.topics.json"))
+    bus = PersistentEventBus(wal, StateDB(DbConfig(path=db_path)), index=index)
+
+    async def _run():
+        for i in range(count):
+            await bus.publish("jobs", {"payload": {"writer": writer, "i": i}})
+
+    asyncio.run(_run())
+    wal.close()
+
+
+class TestWalEventFollowerTwoWriters(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.wal_path = os.path.join(self.tmp.name, "wal", "events.jsonl")
+        self.db_path = os.path.join(self.tmp.name, "state.db")
+        os.makedirs(os.path.dirname(self.wal_path))
+        self.db = StateDB(DbConfig(path=self.db_path))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_delivers_every_event_from_two_writer_processes(self):
+        writers = [multiprocessing.Process(target=_publish, args=(self.wal_path, self.db_path, w, 50)) for w in range(2)]
+        for p in writers:
+            p.start()
+        for p in writers:
+            p.join(timeout=60)
+            self.assertEqual(p.exitcode, 0)
+
+        got = []
+
+        async def _follow():
+            bus = InMemoryEventBus()
+            await bus.subscribe("jobs", lambda e: got.append((e["payload"]["writer"], e["payload"]["i"])))
+            follower = WalEventFollower(self.wal_path, self.db, bus, "test", topics=["jobs"], batch_size=7)
+            while await follower.poll_once():
+                pass
+            await bus.drain()
+            return follower.stats()
+
+        stats = asyncio.run(_follow())
+        self.assertEqual(stats.delivered, 100)
+        self.assertEqual(stats.skipped, 0)
+        self.assertEqual(sorted(got), sorted((w, i) for w in range(2) for i in range(50)))
+        self.assertEqual(self.db.get_event_offset(subscriber_id="test", topic="jobs"), 100)
+
+        seqs = [seq for seq, _ in JsonlWAL(self.wal_path).iter_entries()]
+        self.assertEqual(seqs, list(range(100)))
+
+
+class TestPersistentEventBus(unittest.TestCase):
+    def test_default_index_is_persisted_next_to_the_wal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            wal = JsonlWAL(os.path.join(tmp, "wal", "events.jsonl"))
+            db = StateDB(DbConfig(path=os.path.join(tmp, "state.db")))
+            bus = PersistentEventBus(wal, db)
+            asyncio.run(bus.publish("jobs", {"payload": {"i": 1}}))
+            asyncio.run(bus.publish("jobs", {"event_id": "e2", "payload": {"i": 2}}))
+            self.assertTrue(os.path.exists(os.path.join(tmp, "wal", "events.topics.json")))
+
+            got = []
+            reopened = PersistentEventBus(wal, db)
+            self.assertEqual(reopened.replay("s", "jobs", got.append), 2)
+            self.assertTrue(got[0]["event_id"])
+            self.assertEqual(got[1]["event_id"], "e2")
+            self.assertEqual(db.get_event_offset(subscriber_id="s", topic="jobs"), 2)
+            wal.close()
+            db.close()
+
+
+class TestRuntimeEventBus(unittest.TestCase):
+    def test_container_bus_publishes_through_the_wal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            rt = build_runtime_container(get_runtime_paths(os.path.join(tmp, "state"), os.path.join(tmp, "log"), os.path.join(tmp, "run")))
+            got = []
+
+            async def _run():
+                await rt.event_bus.publish("orchestrator", {"payload": {"type": "orchestrator_run_succeeded", "run_id": "r1"}})
+                bus = InMemoryEventBus()
+                await bus.subscribe("orchestrator", lambda e: got.append(e["payload"]))
+                follower = WalEventFollower(rt.wal.path, rt.state_db, bus, "test", topics=["orchestrator"])
+                await follower.poll_once()
+                await bus.drain()
+
+            asyncio.run(_run())
+            rt.audit_writer.close()
+            self.assertEqual(got, [{"type": "orchestrator_run_succeeded", "run_id": "r1"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
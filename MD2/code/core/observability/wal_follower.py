@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import asyncio
+
+from core.persistence import StateDB, WalTail, WalTopicIndex
+
+from .event_bus import InMemoryEventBus
+
+
+@dataclass
+class FollowerStats:
+    polls: int = 0
+    delivered: int = 0
+    skipped: int = 0
+    next_seq: int = 0
+    offsets_saved: int = 0
+
+
+class WalEventFollower:
+    def __init__(
+        self,
+        wal_path: str,
+        state_db: StateDB,
+        bus: InMemoryEventBus,
+        subscriber_id: str,
+        topics: Optional[Iterable[str]] = None,
+        index: Optional[WalTopicIndex] = None,
+        start_seq: Optional[int] = None,
+        min_poll_sec: float = 0.005,
+        max_poll_sec: float = 0.05,
+        batch_size: int = 500,
+    ):
+        self._db = state_db
+        self._bus = bus
+        self._subscriber_id = str(subscriber_id)
+        self._topics = set(topics) if topics else None
+        self._min_poll = max(0.001, float(min_poll_sec))
+        self._max_poll = max(self._min_poll, float(max_poll_sec))
+        self._batch = max(1, int(batch_size))
+        self._offsets: Dict[str, int] = {}
+        self._stats = FollowerStats()
+        self._stopped = asyncio.Event()
+        for row in self._db.list_event_offsets():
+            if row["subscriber_id"] == self._subscriber_id and (self._topics is None or row["topic"] in self._topics):
+                self._offsets[row["topic"]] = int(row["offset"])
+        if start_seq is None:
+            start_seq = 0
+            if index is not None:
+                known = self._topics if self._topics is not None else set(index.topics()) | set(self._offsets)
+                start_seq = min((index.wal_position(t, self._offsets.get(t, 0)) for t in known), default=0)
+        self._tail = WalTail(wal_path, start_seq=int(start_seq))
+
+    def stats(self) -> FollowerStats:
+        self._stats.next_seq = self._tail.next_seq
+        return FollowerStats(**self._stats.__dict__)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    async def run(self) -> None:
+        delay = self._min_poll
+        try:
+            while not self._stopped.is_set():
+                delivered = await self.poll_once()
+                delay = self._min_poll if delivered else min(self._max_poll, delay * 2)
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._tail.close()
+
+    async def poll_once(self) -> int:
+        self._stats.polls += 1
+        dirty: Dict[str, int] = {}
+        delivered = 0
+        for _, rec in self._tail.poll(max_records=self._batch):
+            if rec.type != "event_bus.publish":
+                continue
+            data = rec.data or {}
+            topic = str(data.get("topic", ""))
+            if self._topics is not None and topic not in self._topics:
+                continue
+            topic_seq = int(data.get("topic_seq", -1))
+            if topic_seq < 0 or topic_seq < self._offsets.get(topic, 0):
+                self._stats.skipped += 1
+                continue
+            await self._bus.publish(topic, dict(data.get("envelope") or {}))
+            self._offsets[topic] = topic_seq + 1
+            dirty[topic] = topic_seq + 1
+            delivered += 1
+        for topic, offset in dirty.items():
+            self._db.set_event_offset(subscriber_id=self._subscriber_id, topic=topic, offset=offset)
+        self._stats.delivered += delivered
+        self._stats.offsets_saved += len(dirty)
+        return delivered
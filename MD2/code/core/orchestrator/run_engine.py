@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
-from core.persistence import StateDB
+from core.persistence import StateDB, ShardedWorkQueue
 from core.persistence import JsonlWAL
 
 from protocols.workflow import RunStatus, NodeRunStatus, WorkItemStatus, now_unix
@@ -18,35 +19,56 @@ class OrchestratorHealth:
 
 
 class RunEngine:
-    def __init__(self, state_db: StateDB, wal: JsonlWAL):
+    def __init__(self, state_db: StateDB, wal: JsonlWAL, work_queue: StateDB | ShardedWorkQueue | None = None):
         self._db = state_db
         self._wal = wal
+        self._queue = work_queue or state_db
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._events: Deque[Tuple[str, Dict[str, Any]]] = deque(maxlen=10000)
 
     def tick(self, now: Optional[int] = None, limit_runs: int = 50) -> OrchestratorHealth:
         ts = int(now if now is not None else now_unix())
         progressed = 0
         runs = self._db.list_runs_by_status(statuses=[RunStatus.QUEUED.value, RunStatus.RUNNING.value, RunStatus.BLOCKED.value], limit=limit_runs)
         for run in runs:
-            run_id = str(run["run_id"])
-            workflow_id = str(run["workflow_id"])
-            status = str(run["status"])
-            if status == RunStatus.BLOCKED.value:
-                if self._try_unblock(run_id, ts):
-                    self._db.update_run_status(run_id, RunStatus.RUNNING)
-                else:
-                    continue
-            if status == RunStatus.QUEUED.value:
-                self._db.update_run_status(run_id, RunStatus.RUNNING)
+            self._pending = []
+            with self._db.transaction():
+                progressed += self._tick_run(run, ts)
+            # Only log what the transaction actually committed.
+            for record_type, data in self._pending:
+                self._wal.append(record_type, data)
+            self._events.extend(self._pending)
+            self._pending = []
 
-            wf = self._db.get_latest_workflow(workflow_id)
-            if not wf:
-                self._db.update_run_status(run_id, RunStatus.FAILED, ended_at=ts)
-                self._wal.append("orchestrator_missing_workflow", {"run_id": run_id, "workflow_id": workflow_id})
-                continue
+        return OrchestratorHealth(state="running", scanned_runs=len(runs), progressed_nodes=progressed)
 
-            progressed += self._progress_run(run_id=run_id, workflow=wf, ts=ts)
+    def drain_events(self) -> List[Tuple[str, Dict[str, Any]]]:
+        events = list(self._events)
+        self._events.clear()
+        return events
 
-        return OrchestratorHealth(state="running", scanned_runs=len(runs), progressed_nodes=progressed)
+    def _defer(self, record_type: str, data: Dict[str, Any]) -> None:
+        self._pending.append((record_type, data))
+
+    def _tick_run(self, run: Dict[str, Any], ts: int) -> int:
+        run_id = str(run["run_id"])
+        workflow_id = str(run["workflow_id"])
+        status = str(run["status"])
+        if status == RunStatus.BLOCKED.value:
+            if self._try_unblock(run_id, ts):
+                self._db.update_run_status(run_id, RunStatus.RUNNING)
+            else:
+                return 0
+        if status == RunStatus.QUEUED.value:
+            self._db.update_run_status(run_id, RunStatus.RUNNING)
+
+        wf = self._db.get_latest_workflow(workflow_id)
+        if not wf:
+            self._db.update_run_status(run_id, RunStatus.FAILED, ended_at=ts)
+            self._defer("orchestrator_missing_workflow", {"run_id": run_id, "workflow_id": workflow_id})
+            return 0
+
+        return self._progress_run(run_id=run_id, workflow=wf, ts=ts)
 
     def _progress_run(self, run_id: str, workflow: Dict[str, Any], ts: int) -> int:
         dag = dict(workflow.get("dag") or {})
@@ -89,7 +111,7 @@ class RunEngine:
                     snap["approval_id"] = approval_id
                     self._db.update_node_status(run_id, node_id, NodeRunStatus.WAITING_APPROVAL, snapshot=snap)
                     self._db.update_run_status(run_id, RunStatus.BLOCKED)
-                    self._wal.append("orchestrator_waiting_approval", {"run_id": run_id, "node_id": node_id, "approval_id": approval_id})
+                    self._defer("orchestrator_waiting_approval", {"run_id": run_id, "node_id": node_id, "approval_id": approval_id})
                     progressed += 1
                 continue
 
@@ -99,33 +121,33 @@ class RunEngine:
                 continue
 
             task_id = f"wi-{run_id}-{node_id}"
-            existing = self._db.get_work_item(task_id)
-            if not existing:
+            existing = self._queue.get_work_item_status(task_id)
+            if existing is None:
                 payload = {
                     "task_type": str(node.get("task_type") or "default"),
                     "task_data": dict(node.get("task_data") or {}),
                     "context": {"run_id": run_id, "node_id": node_id, "workflow_id": workflow.get("workflow_id")},
                 }
-                self._db.enqueue_work_item(task_id=task_id, priority=int(node.get("priority", 0) or 0), payload=payload, idempotency_key=str(node.get("idempotency_key") or task_id))
+                self._queue.enqueue_work_item(task_id=task_id, priority=int(node.get("priority", 0) or 0), payload=payload, idempotency_key=str(node.get("idempotency_key") or task_id))
                 self._db.update_node_status(run_id, node_id, NodeRunStatus.RUNNING, snapshot={"work_item": task_id})
-                self._wal.append("orchestrator_dispatched_work_item", {"run_id": run_id, "node_id": node_id, "task_id": task_id})
+                self._defer("orchestrator_dispatched_work_item", {"run_id": run_id, "node_id": node_id, "task_id": task_id})
                 progressed += 1
                 continue
 
-            if existing.status == WorkItemStatus.ACKED:
+            if existing == WorkItemStatus.ACKED:
                 self._db.update_node_status(run_id, node_id, NodeRunStatus.SUCCEEDED, snapshot={"work_item": task_id})
                 progressed += 1
                 continue
-            if existing.status in {WorkItemStatus.FAILED, WorkItemStatus.DEAD_LETTER}:
+            if existing in {WorkItemStatus.FAILED, WorkItemStatus.DEAD_LETTER}:
                 self._db.update_node_status(run_id, node_id, NodeRunStatus.FAILED, snapshot={"work_item": task_id})
                 self._db.update_run_status(run_id, RunStatus.FAILED, ended_at=ts)
-                self._wal.append("orchestrator_node_failed", {"run_id": run_id, "node_id": node_id, "task_id": task_id})
+                self._defer("orchestrator_node_failed", {"run_id": run_id, "node_id": node_id, "task_id": task_id})
                 progressed += 1
                 return progressed
 
         if all(nr.status == NodeRunStatus.SUCCEEDED for nr in self._db.list_node_runs(run_id)):
             self._db.update_run_status(run_id, RunStatus.SUCCEEDED, ended_at=ts)
-            self._wal.append("orchestrator_run_succeeded", {"run_id": run_id})
+            self._defer("orchestrator_run_succeeded", {"run_id": run_id})
         return progressed
 
     def _try_unblock(self, run_id: str, ts: int) -> bool:
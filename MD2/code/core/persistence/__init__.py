@@ -1,17 +1,43 @@
 from .state_store import StateStore
-from .jsonl_wal import JsonlWAL
+from .jsonl_wal import JsonlWAL, WalSegment
 from .snapshot_store import SnapshotStore
 from .sqlite_store import SqliteStateStore
-from .state_db import StateDB, DbConfig
-from .schema import SchemaMigration, ALL_MIGRATIONS
+from .state_db import StateDB, DbConfig, LockWaitStats
+from .schema import SchemaMigration, ALL_MIGRATIONS, CHANGE_TABLES, ARCHIVE_TABLES
+from .retention import RetentionEngine, RetentionPolicy, RetentionHealth
+from .heartbeats import HeartbeatCoalescer, HeartbeatStats
+from .work_queue import ShardedWorkQueue, ShardConfig
+from .topic_index import WalTopicIndex, TopicCursor
+from .wal_tail import WalTail
+from .wal_compactor import WalCompactor, WalCompactionPolicy, WalCompactionHealth
+from .audit_writer import AuditWriter, AuditWriterStats
 
 __all__ = [
     "StateStore",
     "JsonlWAL",
+    "WalSegment",
     "SnapshotStore",
     "SqliteStateStore",
     "StateDB",
     "DbConfig",
+    "LockWaitStats",
     "SchemaMigration",
     "ALL_MIGRATIONS",
+    "CHANGE_TABLES",
+    "ARCHIVE_TABLES",
+    "RetentionEngine",
+    "RetentionPolicy",
+    "RetentionHealth",
+    "HeartbeatCoalescer",
+    "HeartbeatStats",
+    "ShardedWorkQueue",
+    "ShardConfig",
+    "WalTopicIndex",
+    "TopicCursor",
+    "WalTail",
+    "WalCompactor",
+    "WalCompactionPolicy",
+    "WalCompactionHealth",
+    "AuditWriter",
+    "AuditWriterStats",
 ]
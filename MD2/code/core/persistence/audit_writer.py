@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+import atexit
+import os
+import queue
+import threading
+import uuid
+
+from protocols.workflow import now_unix
+from utils.serializer import Serializer
+
+from .file_lock import FileLock
+from .state_db import StateDB
+
+
+@dataclass
+class AuditWriterStats:
+    accepted: int = 0
+    rows_written: int = 0
+    lines_written: int = 0
+    batches: int = 0
+    blocked: int = 0
+    rotations: int = 0
+    reopens: int = 0
+    retried: int = 0
+    spilled: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: int(v) for k, v in self.__dict__.items()}
+
+
+_ROW = "row"
+_LINE = "line"
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        state_db: Optional[StateDB] = None,
+        jsonl_path: str = "",
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval_sec: float = 0.2,
+        max_jsonl_bytes: int = 64 * 1024 * 1024,
+        backups: int = 5,
+    ):
+        self._db = state_db
+        self._path = Path(jsonl_path) if jsonl_path else None
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._batch = max(1, int(batch_size))
+        self._interval = max(0.01, float(flush_interval_sec))
+        self._max_bytes = max(0, int(max_jsonl_bytes))
+        self._backups = max(0, int(backups))
+        self._fh: Optional[TextIO] = None
+        self._file_lock = FileLock(str(self._path) + ".lock") if self._path else None
+        self._failed: List[Dict[str, Any]] = []
+        self._max_failed = max(self._batch, int(queue_size))
+        self._stats = AuditWriterStats()
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def record(self, trace_id: str, actor: str, action: str, resource: str, result: Dict[str, Any], timestamp: Optional[int] = None) -> str:
+        audit_id = f"au-{uuid.uuid4().hex}"
+        row = {
+            "audit_id": audit_id,
+            "trace_id": str(trace_id),
+            "actor": str(actor),
+            "action": str(action),
+            "resource": str(resource),
+            "result": dict(result or {}),
+            "timestamp": int(timestamp if timestamp is not None else now_unix()),
+        }
+        self._submit(_ROW, row)
+        return audit_id
+
+    def append(self, event: Dict[str, Any]) -> None:
+        self._submit(_LINE, dict(event or {}))
+
+    def flush(self) -> int:
+        with self._io_lock:
+            return self._drain(block=False)
+
+    def close(self) -> int:
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._stop.set()
+        if thread is not None:
+            thread.join(timeout=max(1.0, self._interval * 10))
+        written = self.flush()
+        with self._io_lock:
+            if self._failed:
+                self._write([])
+            if self._failed:
+                self._spill(self._failed)
+                self._failed = []
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if self._file_lock is not None:
+                self._file_lock.close()
+        return written
+
+    def stats(self) -> Dict[str, Any]:
+        out = self._stats.to_dict()
+        out["pending"] = self._queue.qsize()
+        out["failed_pending"] = len(self._failed)
+        return out
+
+    def _submit(self, kind: str, item: Dict[str, Any]) -> None:
+        with self._lock:
+            closed = self._closed
+            if not closed and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            self._stats.accepted += 1
+        if closed:
+            with self._io_lock:
+                self._write([(kind, item)])
+            return
+        try:
+            self._queue.put_nowait((kind, item))
+        except queue.Full:
+            self._stats.blocked += 1
+            self._queue.put((kind, item))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._io_lock:
+                self._drain(block=True)
+
+    def _drain(self, block: bool) -> int:
+        written = 0
+        while True:
+            batch: List[Tuple[str, Dict[str, Any]]] = []
+            try:
+                batch.append(self._queue.get(timeout=self._interval) if block and not written else self._queue.get_nowait())
+                while len(batch) < self._batch:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                return written
+            self._write(batch)
+            written += len(batch)
+            if len(batch) < self._batch:
+                return written
+
+    def _write(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        rows = [item for kind, item in batch if kind == _ROW]
+        if self._db is not None and (rows or self._failed):
+            # Rows that failed earlier go first; INSERT OR IGNORE makes the retry idempotent.
+            pending = self._failed + rows
+            if self._failed:
+                self._stats.retried += len(self._failed)
+            try:
+                self._stats.rows_written += self._db.add_audit_logs(pending)
+                self._failed = []
+            except Exception:
+                self._stats.errors += 1
+                overflow = len(pending) - self._max_failed
+                if overflow > 0:
+                    self._spill(pending[:overflow])
+                    pending = pending[overflow:]
+                self._failed = pending
+        if self._path is not None and batch:
+            try:
+                with self._file_lock:
+                    fh = self._open()
+                    fh.write("".join(Serializer.to_json(item) + "\n" for _, item in batch))
+                    fh.flush()
+                    self._stats.lines_written += len(batch)
+                    if self._max_bytes and fh.tell() >= self._max_bytes:
+                        self._rotate()
+            except OSError:
+                self._stats.errors += 1
+        self._stats.batches += 1
+
+    def _open(self) -> TextIO:
+        # Several processes share the file; reopen when another one rotated it away.
+        if self._fh is not None:
+            try:
+                current = os.stat(self._path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current != os.fstat(self._fh.fileno()).st_ino:
+                self._fh.close()
+                self._fh = None
+                self._stats.reopens += 1
+        if self._fh is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self._path.open("a", encoding="utf-8")
+        return self._fh
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        if self._path is None:
+            self._stats.errors += 1
+            return
+        path = self._path.with_name(f"{self._path.stem}.failed{self._path.suffix}")
+        try:
+            with self._file_lock:
+                with path.open("a", encoding="utf-8") as fh:
+                    fh.write("".join(Serializer.to_json(row) + "\n" for row in rows))
+            self._stats.spilled += len(rows)
+        except OSError:
+            self._stats.errors += 1
+
+    def _rotate(self) -> None:
+        self._fh.close()
+        self._fh = None
+        if self._backups <= 0:
+            self._path.unlink(missing_ok=True)
+        else:
+            for i in range(self._backups - 1, 0, -1):
+                src = self._path.with_name(f"{self._path.name}.{i}")
+                if src.exists():
+                    os.replace(src, self._path.with_name(f"{self._path.name}.{i + 1}"))
+            os.replace(self._path, self._path.with_name(f"{self._path.name}.1"))
+        self._stats.rotations += 1
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import threading
+
+from protocols.workflow import now_unix
+
+from .state_db import StateDB
+
+
+@dataclass
+class HeartbeatStats:
+    recorded: int = 0
+    flushes: int = 0
+    immediate_flushes: int = 0
+    rows_written: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"recorded": int(self.recorded), "flushes": int(self.flushes), "immediate_flushes": int(self.immediate_flushes), "rows_written": int(self.rows_written)}
+
+
+class HeartbeatCoalescer:
+    def __init__(self, state_db: StateDB, flush_interval_sec: int = 5):
+        self._db = state_db
+        self._interval = max(0, int(flush_interval_sec))
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flushed: Dict[str, Dict[str, Any]] = {}
+        self._stats = HeartbeatStats()
+
+    def record(
+        self,
+        agent_id: str,
+        status: str,
+        cpu: float,
+        mem: float,
+        queue_depth: int,
+        skills: List[str],
+        metrics: Dict[str, Any],
+        now: Optional[int] = None,
+    ) -> bool:
+        ts = int(now if now is not None else now_unix())
+        beat = {"agent_id": agent_id, "status": str(status), "cpu": cpu, "mem": mem, "queue_depth": int(queue_depth), "skills": list(skills), "metrics": dict(metrics or {}), "last_seen": ts}
+        with self._lock:
+            self._pending[agent_id] = beat
+            self._stats.recorded += 1
+            prev = self._flushed.get(agent_id)
+            transition = prev is None or prev["status"] != beat["status"] or (prev["queue_depth"] > 0) != (beat["queue_depth"] > 0)
+            if not transition and ts - int(prev["last_seen"]) < self._interval:
+                return False
+            if transition:
+                self._stats.immediate_flushes += 1
+            self._flush_locked()
+        return True
+
+    def flush(self) -> int:
+        with self._lock:
+            return self._flush_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = self._stats.to_dict()
+            out["pending"] = len(self._pending)
+            out["flush_interval_sec"] = self._interval
+        return out
+
+    def _flush_locked(self) -> int:
+        if not self._pending:
+            return 0
+        beats = list(self._pending.values())
+        written = self._db.write_agent_heartbeats(beats, flush_window_sec=self._interval)
+        self._pending.clear()
+        for beat in beats:
+            self._flushed[beat["agent_id"]] = beat
+        self._stats.flushes += 1
+        self._stats.rows_written += written
+        return written
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import atexit
 import json
+import mmap
 import os
+import shutil
 import threading
+import time
+
+from .file_lock import FileLock
+from .wal_format import BINARY_SUFFIX, FRAME_FOOTER, FRAME_RECORD, WAL_FORMATS, encode_frame, iso_to_us, iter_frames, read_frame, us_to_iso
+
+
+DURABILITY_MODES = ("sync", "group", "async")
 
 
 @dataclass
@@ -20,35 +31,751 @@ class WalRecord:
         return {"ts": self.ts, "type": self.type, "data": self.data}
 
 
+class _LazyField:
+    def __init__(self, name: str, decode: Callable[[Any], Any]):
+        self._name = name
+        self._raw = f"_raw_{name}"
+        self._decode = decode
+
+    def __get__(self, obj: Any, owner: type) -> Any:
+        if obj is None:
+            return self
+        state = obj.__dict__
+        value = self._decode(state.pop(self._raw))
+        state[self._name] = value
+        return value
+
+
+class LazyWalRecord(WalRecord):
+    ts = _LazyField("ts", us_to_iso)
+    data = _LazyField("data", lambda raw: dict(json.loads(raw.decode("utf-8")) or {}) if raw else {})
+
+    def __init__(self, ts_us: int, type: str, raw_data: bytes):
+        self.__dict__.update(type=type, ts_us=ts_us, _raw_ts=ts_us, _raw_data=raw_data)
+
+
+@dataclass
+class WalSegment:
+    name: str
+    first_seq: int
+    last_seq: int = -1
+    count: int = 0
+    first_ts: str = ""
+    last_ts: str = ""
+    size_bytes: int = 0
+    created_at: float = 0.0
+    sealed: bool = False
+    footer_offset: int = 0
+    sparse: List[Tuple[int, int, str]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "first_seq": self.first_seq,
+            "last_seq": self.last_seq,
+            "count": self.count,
+            "first_ts": self.first_ts,
+            "last_ts": self.last_ts,
+            "size_bytes": self.size_bytes,
+            "created_at": self.created_at,
+            "sealed": self.sealed,
+            "footer_offset": self.footer_offset,
+        }
+
+    @classmethod
+    def from_dict(cls, obj: Dict[str, Any]) -> "WalSegment":
+        return cls(
+            name=str(obj["name"]),
+            first_seq=int(obj["first_seq"]),
+            last_seq=int(obj.get("last_seq", -1)),
+            count=int(obj.get("count", 0)),
+            first_ts=str(obj.get("first_ts", "")),
+            last_ts=str(obj.get("last_ts", "")),
+            size_bytes=int(obj.get("size_bytes", 0)),
+            created_at=float(obj.get("created_at", 0.0)),
+            sealed=bool(obj.get("sealed", False)),
+            footer_offset=int(obj.get("footer_offset", 0)),
+        )
+
+
 class JsonlWAL:
-    def __init__(self, wal_path: str):
+    def __init__(
+        self,
+        wal_path: str,
+        durability: str = "sync",
+        group_max_records: int = 64,
+        group_max_delay_ms: float = 5.0,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        segment_max_age_sec: float = 86400.0,
+        index_interval: int = 256,
+        format: str = "jsonl",
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError("invalid_durability")
+        if format not in WAL_FORMATS:
+            raise ValueError("invalid_wal_format")
         self._path = Path(wal_path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.Lock()
+        self._dir = self._path.parent
+        self._stem = self._path.stem
+        self._suffix = self._path.suffix or ".jsonl"
+        self._index_path = self._dir / f"{self._stem}.index.json"
+        self._mode = durability
+        self._format = format
+        self._max_records = max(1, int(group_max_records))
+        self._max_delay_sec = max(0.0, float(group_max_delay_ms)) / 1000.0
+        self._seg_max_bytes = max(1024, int(segment_max_bytes))
+        self._seg_max_age = max(0.0, float(segment_max_age_sec))
+        self._index_interval = max(1, int(index_interval))
+        # Seq allocation, rolls, seals and index rewrites are serialized across
+        # processes by the flock; each holder re-reads the on-disk state first.
+        self._lock = threading.RLock()
+        self._cond = threading.Condition(self._lock)
+        self._flock = FileLock(str(self._dir / f"{self._stem}.lock"))
+        self._fh: Optional[BinaryIO] = None
+        self._fh_name = ""
+        self._segments: List[WalSegment] = []
+        self._index_sig: Optional[Tuple[int, int, int]] = None
+        self._next_seq = 0
+        self._queue: List[Tuple[int, str, bytes, bytes]] = []
+        self._waiters: List[Tuple[int, Future]] = []
+        self._appended = 0
+        self._written = 0
+        self._durable = 0
+        self._force = False
+        self._closed = False
+        self._corrupt = 0
+        self._sparse_cache: Dict[str, List[Tuple[int, int, str]]] = {}
+        with self._lock, self._flock:
+            self._sync_locked()
+            if self._path.exists():
+                self._adopt_legacy_file()
+        self._thread: Optional[threading.Thread] = None
+        if self._mode != "sync":
+            self._thread = threading.Thread(target=self._flusher, name=f"wal-flusher:{self._path.name}", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    @property
+    def path(self) -> str:
+        return str(self._path)
+
+    @property
+    def durability(self) -> str:
+        return self._mode
+
+    @property
+    def format(self) -> str:
+        return self._format
+
+    @property
+    def corrupt_records(self) -> int:
+        return self._corrupt
+
+    @property
+    def next_seq(self) -> int:
+        with self._lock, self._flock:
+            self._sync_locked()
+            return self._next_seq
+
+    def segments(self) -> List[Dict[str, Any]]:
+        with self._lock, self._flock:
+            self._sync_locked()
+            return [s.to_dict() for s in self._segments]
+
+    @contextmanager
+    def exclusive(self) -> Iterator["JsonlWAL"]:
+        with self._lock, self._flock:
+            self._sync_locked()
+            yield self
 
     def append(self, record_type: str, data: Dict[str, Any]) -> bool:
-        rec = WalRecord(ts=datetime.utcnow().isoformat(), type=str(record_type), data=data or {})
-        line = json.dumps(rec.to_dict(), ensure_ascii=False)
+        self._submit(record_type, data, None)
+        return True
+
+    def append_record(self, record_type: str, data: Dict[str, Any]) -> int:
+        return self._submit(record_type, data, None, write_through=True)
+
+    def append_nowait(self, record_type: str, data: Dict[str, Any]) -> "Future[int]":
+        fut: "Future[int]" = Future()
+        self._submit(record_type, data, fut)
+        return fut
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if self._mode == "sync":
+            return True
+        fut: "Future[int]" = Future()
+        with self._cond:
+            self._waiters.append((self._appended, fut))
+            self._force = True
+            self._cond.notify_all()
+        fut.result(timeout=timeout)
+        return True
+
+    def roll(self) -> bool:
+        with self._lock, self._flock:
+            if self._queue:
+                items, self._queue = self._queue, []
+                self._write_locked(items)
+            self._sync_locked()
+            active = self._active()
+            if active is None or active.count == 0:
+                return False
+            self._seal_locked()
+            return True
+
+    def close(self) -> None:
+        thread = self._thread
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
         with self._lock:
-            with self._path.open("a", encoding="utf-8") as f:
-                f.write(line + "\n")
-                f.flush()
-                os.fsync(f.fileno())
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+                self._fh_name = ""
+            self._flock.close()
+
+    def iter_records(self, start: int = 0, since_ts: str = "") -> Iterator[WalRecord]:
+        return (rec for _, rec in self.iter_entries(start=start, since_ts=since_ts))
+
+    def iter_entries(self, start: int = 0, since_ts: str = "") -> Iterator[Tuple[int, WalRecord]]:
+        start = int(start)
+        since_ts = str(since_ts or "")
+        opened: List[Tuple[WalSegment, List[Tuple[int, int, str]], BinaryIO]] = []
+        with self._lock, self._flock:
+            if self._queue:
+                items, self._queue = self._queue, []
+                self._write_locked(items)
+            self._sync_locked()
+            for seg in self._segments:
+                if seg.count == 0 or seg.last_seq < start or (since_ts and seg.last_ts < since_ts):
+                    continue
+                try:
+                    fh = (self._dir / seg.name).open("rb")
+                except FileNotFoundError:
+                    # Dropped by another instance; reload the index on the next call.
+                    self._index_sig = None
+                    continue
+                opened.append((replace(seg, sparse=[]), list(seg.sparse) if not seg.sealed else self._load_sparse(seg, fh), fh))
+        return self._iter_segments(opened, start, since_ts)
+
+    def compact_segment(self, name: str, keep: Callable[[int, WalRecord], bool], archive_dir: str = "") -> int:
+        return self._rewrite_segment(name, keep, None, archive_dir)
+
+    def convert_segment(self, name: str, format: str = "binary") -> bool:
+        if format not in WAL_FORMATS:
+            raise ValueError("invalid_wal_format")
+        if _format_of(name) == format:
+            return False
+        return self._rewrite_segment(name, None, format, "") >= 0
+
+    def convert(self, format: str = "binary") -> int:
+        with self._lock, self._flock:
+            self._sync_locked()
+            names = [s.name for s in self._segments if s.sealed and _format_of(s.name) != format]
+        return sum(1 for name in names if self.convert_segment(name, format))
+
+    def drop_segment(self, name: str, archive_dir: str = "") -> bool:
+        with self._lock, self._flock:
+            self._sync_locked()
+            seg = self._removable(name)
+            if seg is None:
+                return False
+            self._segments = [s for s in self._segments if s.name != name]
+            self._sparse_cache.pop(name, None)
+            self._save_index_locked()
+            path = self._dir / name
+            if archive_dir:
+                target = Path(archive_dir)
+                target.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(path), str(target / name))
+            else:
+                path.unlink(missing_ok=True)
         return True
 
-    def iter_records(self) -> Iterator[WalRecord]:
-        if not self._path.exists():
-            return iter(())
-        def _iter() -> Iterator[WalRecord]:
-            with self._path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
+    def _removable(self, name: str, include_last: bool = False) -> Optional[WalSegment]:
+        for seg in self._segments if include_last else self._segments[:-1]:
+            if seg.name == name:
+                return seg if seg.sealed else None
+        return None
+
+    def _rewrite_segment(self, name: str, keep: Optional[Callable[[int, WalRecord], bool]], format: Optional[str], archive_dir: str) -> int:
+        converting = format is not None
+        with self._lock, self._flock:
+            self._sync_locked()
+            seg = self._removable(name, include_last=converting)
+            if seg is None:
+                return -1 if converting else 0
+            seg = replace(seg, sparse=[])
+        src_fmt = _format_of(seg.name)
+        dst_fmt = format or src_fmt
+        path = self._dir / seg.name
+        number = int(seg.name[len(self._stem) + 1:].split(".", 1)[0])
+        out = WalSegment(name=self._segment_name(number, dst_fmt), first_seq=seg.first_seq, created_at=seg.created_at)
+        target = self._dir / out.name
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.rewrite")
+        try:
+            src = path.open("rb")
+        except FileNotFoundError:
+            return -1 if converting else 0
+        with src, tmp.open("wb") as dst:
+            for seq, rec, raw in self._iter_raw(seg, src, 0, seg.first_seq - 1, with_raw=not converting):
+                if rec is None or (keep is not None and not keep(seq, rec)):
+                    continue
+                if converting:
+                    raw = _encode(dst_fmt, seq, iso_to_us(rec.ts), rec.type, rec.data)
+                if out.count % self._index_interval == 0:
+                    out.sparse.append((seq, out.size_bytes, rec.ts))
+                if out.count == 0:
+                    out.first_seq = seq
+                dst.write(raw)
+                out.size_bytes += len(raw)
+                out.count += 1
+                out.last_seq = seq
+                out.first_ts = out.first_ts or rec.ts
+                out.last_ts = rec.ts
+            footer = self._footer_bytes(out)
+            dst.write(footer)
+            dst.flush()
+            os.fsync(dst.fileno())
+        dropped = seg.count - out.count
+        if not converting and (dropped <= 0 or out.count == 0):
+            tmp.unlink()
+            if out.count == 0 and self.drop_segment(seg.name, archive_dir=archive_dir):
+                return seg.count
+            return 0
+        if archive_dir:
+            Path(archive_dir).mkdir(parents=True, exist_ok=True)
+            shutil.copy2(str(path), str(Path(archive_dir) / seg.name))
+        out.footer_offset = out.size_bytes
+        out.size_bytes += len(footer)
+        out.sealed = True
+        with self._lock, self._flock:
+            self._sync_locked()
+            cur = self._removable(seg.name, include_last=converting)
+            if cur is None or cur.count != seg.count or cur.size_bytes != seg.size_bytes:
+                tmp.unlink()
+                return -1 if converting else 0
+            os.replace(tmp, target)
+            self._segments = [out if s.name == seg.name else s for s in self._segments]
+            self._sparse_cache.pop(seg.name, None)
+            self._sparse_cache[out.name] = out.sparse
+            out.sparse = []
+            self._save_index_locked()
+            if target != path:
+                path.unlink()
+        return dropped
+
+    def _iter_segments(self, opened: List[Tuple[WalSegment, List[Tuple[int, int, str]], BinaryIO]], start: int, since_ts: str) -> Iterator[Tuple[int, WalRecord]]:
+        try:
+            for seg, sparse, fh in opened:
+                offset, prev = 0, seg.first_seq - 1
+                for seq, off, ts in sparse:
+                    if seq > start or (since_ts and ts > since_ts):
+                        break
+                    offset, prev = off, seq - 1
+                for seq, rec, _ in self._iter_raw(seg, fh, offset, prev):
+                    if rec is None or seq < start:
                         continue
-                    try:
-                        obj = json.loads(line)
-                        yield WalRecord(ts=str(obj.get("ts", "")), type=str(obj.get("type", "")), data=dict(obj.get("data") or {}))
-                    except Exception:
+                    if since_ts and rec.ts < since_ts:
                         continue
-        return _iter()
+                    yield seq, rec
+                fh.close()
+        finally:
+            for _, _, fh in opened:
+                fh.close()
+
+    def _iter_raw(self, seg: WalSegment, fh: BinaryIO, offset: int, prev: int, with_raw: bool = False) -> Iterator[Tuple[int, Optional[WalRecord], bytes]]:
+        end = seg.footer_offset if seg.sealed else seg.size_bytes
+        if _format_of(seg.name) == "jsonl":
+            for seq, obj, raw in _read_lines(fh, offset, end, prev):
+                if obj is None:
+                    self._corrupt += 1
+                    yield seq, None, raw
+                    continue
+                yield seq, WalRecord(ts=str(obj.get("ts", "")), type=str(obj.get("type", "")), data=dict(obj.get("data") or {})), raw
+            return
+        if end <= offset:
+            return
+        if seg.sealed:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            base = 0
+        else:
+            fh.seek(offset)
+            buf = fh.read(end - offset)
+            base = offset
+        try:
+            for frame in iter_frames(buf, offset - base, end - base):
+                if frame.kind == FRAME_FOOTER:
+                    return
+                raw = buf[frame.offset:frame.offset + frame.size] if with_raw else b""
+                if not frame.valid or frame.kind != FRAME_RECORD:
+                    self._corrupt += 1
+                    yield frame.seq, None, raw
+                    continue
+                yield frame.seq, LazyWalRecord(frame.ts_us, frame.type, buf[frame.payload_start:frame.payload_end]), raw
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+    def _load_sparse(self, seg: WalSegment, fh: BinaryIO) -> List[Tuple[int, int, str]]:
+        cached = self._sparse_cache.get(seg.name)
+        if cached is None:
+            fh.seek(seg.footer_offset)
+            footer = _decode_footer(seg.name, fh.read(seg.size_bytes - seg.footer_offset))
+            cached = [(int(s), int(o), str(t)) for s, o, t in footer.get("sparse") or []]
+            self._sparse_cache[seg.name] = cached
+        return cached
+
+    def _submit(self, record_type: str, data: Dict[str, Any], fut: Optional[Future], write_through: bool = False) -> int:
+        ts_us = time.time_ns() // 1000
+        ts = us_to_iso(ts_us)
+        if self._format == "binary":
+            type_raw = str(record_type).encode("utf-8")
+            body = json.dumps(data or {}, ensure_ascii=False).encode("utf-8")
+        else:
+            type_raw = b""
+            body = json.dumps(WalRecord(ts=ts, type=str(record_type), data=data or {}).to_dict(), ensure_ascii=False).encode("utf-8")
+        item = (ts_us, ts, type_raw, body)
+        seq = -1
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("wal_closed")
+            self._appended += 1
+            count = self._appended
+            if self._mode == "async" and not write_through:
+                self._queue.append(item)
+            else:
+                # Seqs are only known once the write holds the WAL lock.
+                items, self._queue = self._queue + [item], []
+                seq = self._write_locked(items)
+            if self._mode == "sync":
+                os.fsync(self._fh.fileno())
+                self._durable = count
+                if fut is not None:
+                    fut.set_result(seq)
+                return seq
+            if fut is not None:
+                self._waiters.append((count, fut))
+            pending = count - self._durable
+            if pending == 1 or pending >= self._max_records:
+                self._cond.notify_all()
+        return seq
+
+    def _active(self) -> Optional[WalSegment]:
+        if self._segments and not self._segments[-1].sealed:
+            return self._segments[-1]
+        return None
+
+    def _segment_name(self, first_seq: int, format: Optional[str] = None) -> str:
+        suffix = BINARY_SUFFIX if (format or self._format) == "binary" else self._suffix
+        return f"{self._stem}-{first_seq:012d}{suffix}"
+
+    def _write_locked(self, items: Iterable[Tuple[int, str, bytes, bytes]]) -> int:
+        n = 0
+        seq = -1
+        with self._flock:
+            self._sync_locked()
+            for ts_us, ts, type_raw, body in items:
+                seq = self._next_seq
+                if self._format == "binary":
+                    raw = encode_frame(FRAME_RECORD, seq, ts_us, type_raw, body)
+                else:
+                    raw = b'{"seq": %d, ' % seq + body[1:] + b"\n"
+                seg = self._active()
+                if seg is not None and _format_of(seg.name) != self._format:
+                    self._seal_locked()
+                    seg = None
+                if seg is not None and seg.count and (seg.size_bytes + len(raw) > self._seg_max_bytes or (self._seg_max_age and time.time() - seg.created_at >= self._seg_max_age)):
+                    self._seal_locked()
+                    seg = None
+                if seg is None:
+                    seg = WalSegment(name=self._segment_name(seq), first_seq=seq, created_at=time.time())
+                    self._segments.append(seg)
+                fh = self._handle(seg)
+                if seg.count % self._index_interval == 0:
+                    seg.sparse.append((seq, seg.size_bytes, ts))
+                fh.write(raw)
+                seg.size_bytes += len(raw)
+                seg.count += 1
+                seg.last_seq = seq
+                seg.first_ts = seg.first_ts or ts
+                seg.last_ts = ts
+                self._next_seq = seq + 1
+                n += 1
+            if self._fh is not None:
+                self._fh.flush()
+        self._written += n
+        return seq
+
+    def _handle(self, seg: WalSegment) -> BinaryIO:
+        if self._fh is not None and self._fh_name != seg.name:
+            self._fh.close()
+            self._fh = None
+        if self._fh is None:
+            self._fh = (self._dir / seg.name).open("ab")
+            self._fh_name = seg.name
+        return self._fh
+
+    def _seal_locked(self) -> None:
+        seg = self._active()
+        if seg is None:
+            return
+        fh = self._handle(seg)
+        raw = self._footer_bytes(seg)
+        fh.write(raw)
+        fh.flush()
+        os.fsync(fh.fileno())
+        fh.close()
+        self._fh = None
+        self._fh_name = ""
+        seg.footer_offset = seg.size_bytes
+        seg.size_bytes += len(raw)
+        seg.sealed = True
+        self._sparse_cache[seg.name] = seg.sparse
+        seg.sparse = []
+        self._save_index_locked()
+
+    def _footer_bytes(self, seg: WalSegment) -> bytes:
+        footer = {**{k: v for k, v in seg.to_dict().items() if k not in {"sealed", "footer_offset", "size_bytes"}}, "sparse": seg.sparse}
+        if _format_of(seg.name) == "binary":
+            return encode_frame(FRAME_FOOTER, max(0, seg.last_seq), 0, b"", json.dumps(footer, ensure_ascii=False).encode("utf-8"))
+        return (json.dumps({"footer": footer}, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def _save_index_locked(self) -> None:
+        tmp = self._index_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump({"segments": [s.to_dict() for s in self._segments if s.sealed]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._index_path)
+        self._index_sig = _stat_sig(self._index_path)
+
+    def _sync_locked(self) -> None:
+        sig = _stat_sig(self._index_path)
+        seg = self._active()
+        if sig == self._index_sig and seg is not None:
+            try:
+                size = os.fstat(self._fh.fileno()).st_size if self._fh_name == seg.name else (self._dir / seg.name).stat().st_size
+            except FileNotFoundError:
+                size = -1
+            if size == seg.size_bytes:
+                return
+            if size > seg.size_bytes:
+                self._scan_tail(seg)
+                if not seg.sealed:
+                    self._next_seq = (seg.last_seq + 1) if seg.count else seg.first_seq
+                    return
+        self._reload_locked(sig)
+
+    def _reload_locked(self, sig: Optional[Tuple[int, int, int]]) -> None:
+        known: Dict[str, WalSegment] = {}
+        if sig is not None:
+            try:
+                for obj in json.loads(self._index_path.read_text(encoding="utf-8")).get("segments") or []:
+                    seg = WalSegment.from_dict(obj)
+                    known[seg.name] = seg
+            except Exception:
+                known = {}
+        found: Dict[int, Path] = {}
+        prefix = f"{self._stem}-"
+        for suffix in dict.fromkeys((self._suffix, BINARY_SUFFIX)):
+            for p in self._dir.glob(f"{prefix}*{suffix}"):
+                num = p.name[len(prefix):-len(suffix)]
+                if not num.isdigit():
+                    continue
+                other = found.get(int(num))
+                if other is not None and other.name in known:
+                    p.unlink()
+                    continue
+                if other is not None:
+                    other.unlink()
+                found[int(num)] = p
+        current = {s.name: s for s in self._segments}
+        segments: List[WalSegment] = []
+        for first_seq, p in sorted(found.items()):
+            seg = known.get(p.name)
+            old = current.get(p.name)
+            if seg is not None and seg.sealed:
+                if old is not None and (old.count != seg.count or old.size_bytes != seg.size_bytes):
+                    self._sparse_cache.pop(p.name, None)
+            elif old is not None and not old.sealed and p.stat().st_size >= old.size_bytes:
+                seg = old
+                self._scan_tail(seg)
+            else:
+                seg = self._scan_segment(p, first_seq)
+            segments.append(seg)
+        names = {s.name for s in segments}
+        for name in [n for n in self._sparse_cache if n not in names]:
+            del self._sparse_cache[name]
+        self._segments = segments
+        self._index_sig = sig
+        if segments:
+            last = segments[-1]
+            self._next_seq = max(self._next_seq, (last.last_seq + 1) if last.count else last.first_seq)
+
+    def _adopt_legacy_file(self) -> None:
+        active = self._active()
+        if active is not None:
+            self._seal_locked()
+        first_seq = self._next_seq
+        target = self._dir / self._segment_name(first_seq, "jsonl")
+        if self._path.stat().st_size == 0:
+            self._path.unlink()
+            return
+        os.replace(self._path, target)
+        seg = self._scan_segment(target, first_seq)
+        self._segments.append(seg)
+        if seg.count:
+            self._next_seq = seg.last_seq + 1
+        self._seal_locked()
+
+    def _scan_segment(self, path: Path, first_seq: int) -> WalSegment:
+        seg = WalSegment(name=path.name, first_seq=first_seq, created_at=path.stat().st_mtime)
+        self._scan_tail(seg)
+        return seg
+
+    def _scan_tail(self, seg: WalSegment) -> None:
+        # Only called with the WAL lock held, so no other writer has a record in flight
+        # and anything torn past the last complete record can be truncated.
+        path = self._dir / seg.name
+        size = path.stat().st_size
+        offset = seg.size_bytes
+        prev = seg.last_seq if seg.count else seg.first_seq - 1
+
+        def _note(seq: int, ts: str) -> None:
+            if seg.count % self._index_interval == 0:
+                seg.sparse.append((seq, offset, ts))
+            if seg.count == 0:
+                seg.first_seq = seq
+            seg.count += 1
+            seg.last_seq = seq
+            seg.first_ts = seg.first_ts or ts
+            seg.last_ts = ts or seg.last_ts
+
+        if _format_of(path.name) == "binary":
+            if size > offset:
+                with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    for frame in iter_frames(buf, offset, size):
+                        if frame.valid and frame.kind == FRAME_FOOTER:
+                            seg.sealed = True
+                            seg.footer_offset = offset
+                            offset += frame.size
+                            break
+                        if frame.valid:
+                            _note(frame.seq, us_to_iso(frame.ts_us))
+                        offset += frame.size
+        else:
+            with path.open("rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    obj = _decode_line(raw)
+                    if obj is not None and "footer" in obj:
+                        seg.sealed = True
+                        seg.footer_offset = offset
+                        offset += len(raw)
+                        break
+                    seq = int(obj.get("seq", prev + 1)) if obj is not None else prev + 1
+                    _note(seq, str(obj.get("ts", "")) if obj is not None else "")
+                    prev = seq
+                    offset += len(raw)
+        if offset < size and not seg.sealed:
+            with path.open("r+b") as f:
+                f.truncate(offset)
+        seg.size_bytes = offset
+        if seg.sealed:
+            seg.sparse = []
+            self._sparse_cache.pop(seg.name, None)
+
+    def _flusher(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and not self._force and self._appended == self._durable:
+                    self._cond.wait()
+                deadline = time.monotonic() + self._max_delay_sec
+                while not self._closed and not self._force and self._appended - self._durable < self._max_records:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._queue:
+                    items, self._queue = self._queue, []
+                    self._write_locked(items)
+                target = self._written
+                do_sync = self._fh is not None and (self._mode == "group" or self._force or self._closed)
+                fd = os.dup(self._fh.fileno()) if do_sync else -1
+                self._force = False
+                closing = self._closed
+            if fd >= 0:
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            with self._cond:
+                if target > self._durable:
+                    self._durable = target
+                ready = [f for s, f in self._waiters if s <= target]
+                self._waiters = [(s, f) for s, f in self._waiters if s > target]
+                done = closing and self._appended == self._durable
+            for f in ready:
+                f.set_result(target)
+            if done:
+                return
+
+
+def _stat_sig(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _format_of(name: str) -> str:
+    return "binary" if name.endswith(BINARY_SUFFIX) else "jsonl"
+
+
+def _encode(format: str, seq: int, ts_us: int, record_type: str, data: Dict[str, Any]) -> bytes:
+    if format == "binary":
+        return encode_frame(FRAME_RECORD, seq, ts_us, str(record_type).encode("utf-8"), json.dumps(data or {}, ensure_ascii=False).encode("utf-8"))
+    body = json.dumps({"seq": seq, **WalRecord(ts=us_to_iso(ts_us), type=str(record_type), data=data or {}).to_dict()}, ensure_ascii=False)
+    return (body + "\n").encode("utf-8")
+
+
+def _decode_footer(name: str, raw: bytes) -> Dict[str, Any]:
+    if _format_of(name) == "binary":
+        frame = read_frame(raw, 0)
+        if frame is None or not frame.valid or frame.kind != FRAME_FOOTER:
+            return {}
+        return dict(json.loads(raw[frame.payload_start:frame.payload_end]) or {})
+    obj = _decode_line(raw.split(b"\n", 1)[0]) or {}
+    return dict(obj.get("footer") or {})
+
+def _decode_line(raw: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        obj = json.loads(raw)
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
+
 
+def _read_lines(fh: BinaryIO, offset: int, end: int, prev: int) -> Iterator[Tuple[int, Optional[Dict[str, Any]], bytes]]:
+    fh.seek(offset)
+    pos = offset
+    for raw in fh:
+        if pos >= end or not raw.endswith(b"\n"):
+            return
+        pos += len(raw)
+        obj = _decode_line(raw)
+        if obj is not None and "footer" in obj:
+            return
+        seq = int(obj.get("seq", prev + 1)) if obj is not None else prev + 1
+        prev = seq
+        yield seq, obj, raw
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any
+
+from utils.serializer import Serializer
+
+from protocols.workflow import (
+    NodeRunRecord,
+    NodeRunStatus,
+    RunRecord,
+    RunStatus,
+    WorkItemRecord,
+    WorkItemStatus,
+)
+
+
+class _LazyJson:
+    def __init__(self, name: str):
+        self._name = name
+        self._raw = f"_raw_{name}"
+
+    def __get__(self, obj: Any, owner: type) -> Any:
+        if obj is None:
+            return self
+        state = obj.__dict__
+        raw = state.get(self._raw)
+        value = Serializer.from_json(raw) if raw else {}
+        state[self._name] = value
+        state.pop(self._raw, None)
+        return value
+
+
+class LazyWorkItemRecord(WorkItemRecord):
+    payload = _LazyJson("payload")
+
+    def __init__(self, raw_payload: str, **values: Any):
+        self.__dict__.update(values)
+        self.__dict__["_raw_payload"] = raw_payload
+
+
+class LazyRunRecord(RunRecord):
+    config_snapshot = _LazyJson("config_snapshot")
+
+    def __init__(self, raw_config_snapshot: str, **values: Any):
+        self.__dict__.update(values)
+        self.__dict__["_raw_config_snapshot"] = raw_config_snapshot
+
+
+class LazyNodeRunRecord(NodeRunRecord):
+    snapshot = _LazyJson("snapshot")
+
+    def __init__(self, raw_snapshot: str, **values: Any):
+        self.__dict__.update(values)
+        self.__dict__["_raw_snapshot"] = raw_snapshot
+
+
+def work_item_from_row(row: Any) -> LazyWorkItemRecord:
+    return LazyWorkItemRecord(
+        raw_payload=str(row["payload"]),
+        task_id=str(row["task_id"]),
+        agent_id=str(row["agent_id"]),
+        priority=int(row["priority"]),
+        status=WorkItemStatus(str(row["status"])),
+        lease_owner=str(row["lease_owner"]),
+        lease_expires_at=int(row["lease_expires_at"]),
+        idempotency_key=str(row["idempotency_key"]),
+        created_at=int(row["created_at"]),
+        updated_at=int(row["updated_at"]),
+    )
+
+
+def run_from_row(row: Any) -> LazyRunRecord:
+    return LazyRunRecord(
+        raw_config_snapshot=str(row["config_snapshot"]),
+        run_id=str(row["run_id"]),
+        trace_id=str(row["trace_id"]),
+        workflow_id=str(row["workflow_id"]),
+        status=RunStatus(str(row["status"])),
+        started_at=int(row["started_at"]),
+        ended_at=int(row["ended_at"]),
+    )
+
+
+def node_run_from_row(row: Any) -> LazyNodeRunRecord:
+    return LazyNodeRunRecord(
+        raw_snapshot=str(row["snapshot"]),
+        node_id=str(row["node_id"]),
+        run_id=str(row["run_id"]),
+        status=NodeRunStatus(str(row["status"])),
+        started_at=int(row["started_at"]),
+        ended_at=int(row["ended_at"]),
+    )
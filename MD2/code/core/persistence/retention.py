@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from protocols.workflow import now_unix
+
+from .schema import ARCHIVE_TABLES
+from .state_db import StateDB
+
+
+_DAY_SEC = 86400
+
+
+@dataclass
+class RetentionPolicy:
+    # Work item idempotency keys are only unique within the hot table, so a key
+    # can be reused once its item has been archived (after max_age_sec).
+    max_age_sec: int = 30 * _DAY_SEC
+    table_max_age_sec: Dict[str, int] = field(default_factory=dict)
+    change_log_max_age_sec: int = 7 * _DAY_SEC
+    interval_sec: int = 3600
+    batch_size: int = 500
+    max_rows_per_tick: int = 50000
+    vacuum_pages: int = 1024
+    convert_vacuum_mode: bool = False
+
+    def max_age_for(self, table: str) -> int:
+        return int(self.table_max_age_sec.get(table, self.max_age_sec))
+
+
+@dataclass
+class RetentionHealth:
+    state: str
+    archived: Dict[str, int] = field(default_factory=dict)
+    change_log_pruned: int = 0
+    vacuumed_pages: int = 0
+    archives: List[str] = field(default_factory=list)
+    last_run_at: int = 0
+
+
+class RetentionEngine:
+    def __init__(self, state_db: StateDB, policy: Optional[RetentionPolicy] = None, shards: Optional[List[StateDB]] = None):
+        self._db = state_db
+        self._dbs = [state_db] + [s for s in (shards or []) if s is not state_db]
+        self._policy = policy or RetentionPolicy()
+        self._last_run_at = 0
+        self._backlog = False
+        self._vacuum_checked = False
+
+    def tick(self, now: Optional[int] = None) -> RetentionHealth:
+        ts = int(now if now is not None else now_unix())
+        if self._policy.max_age_sec <= 0 and not self._policy.table_max_age_sec:
+            return RetentionHealth(state="disabled")
+        if self._last_run_at and not self._backlog and ts - self._last_run_at < int(self._policy.interval_sec):
+            return RetentionHealth(state="idle", last_run_at=self._last_run_at)
+        return self.run_once(ts)
+
+    def run_once(self, now: Optional[int] = None) -> RetentionHealth:
+        ts = int(now if now is not None else now_unix())
+        p = self._policy
+        if p.convert_vacuum_mode and not self._vacuum_checked:
+            for db in self._dbs:
+                db.enable_incremental_vacuum()
+        self._vacuum_checked = True
+
+        archived: Dict[str, int] = {}
+        budget = max(0, int(p.max_rows_per_tick))
+        for table in ARCHIVE_TABLES:
+            age = p.max_age_for(table)
+            if age <= 0:
+                continue
+            for db in self._dbs:
+                moved = db.archive_rows(table, before=ts - age, batch_size=p.batch_size, max_rows=budget)
+                total = sum(moved.values())
+                if total:
+                    archived[table] = archived.get(table, 0) + total
+                if budget:
+                    budget -= total
+                    if budget <= 0:
+                        break
+            if p.max_rows_per_tick > 0 and budget <= 0:
+                break
+
+        pruned = 0
+        vacuumed = 0
+        for db in self._dbs:
+            if p.change_log_max_age_sec > 0:
+                pruned += db.prune_change_log(before=ts - int(p.change_log_max_age_sec))
+            vacuumed += db.incremental_vacuum(max_pages=p.vacuum_pages)
+        self._last_run_at = ts
+        self._backlog = p.max_rows_per_tick > 0 and budget <= 0
+        state = "backlog" if self._backlog else "running"
+        return RetentionHealth(
+            state=state,
+            archived=archived,
+            change_log_pruned=pruned,
+            vacuumed_pages=vacuumed,
+            archives=sorted({a["month"] for db in self._dbs for a in db.list_archives()}),
+            last_run_at=ts,
+        )
@@ -54,4 +54,204 @@ SCHEMA_V2 = SchemaMigration(
 )
 
 
-ALL_MIGRATIONS = [SCHEMA_V1, SCHEMA_V2]
+CHANGE_TABLES = {
+    "runs": "NEW.run_id",
+    "node_runs": "NEW.run_id || ':' || NEW.node_id",
+    "work_items": "NEW.task_id",
+    "approvals": "NEW.approval_id",
+    "schedules": "NEW.id",
+    "agent_heartbeats": "NEW.agent_id",
+    "workflows": "NEW.workflow_id || ':' || NEW.version",
+}
+
+
+def _change_triggers(tables: List[str]) -> List[str]:
+    stmts: List[str] = []
+    for table in tables:
+        key = CHANGE_TABLES[table]
+        for op, event in (("insert", "INSERT"), ("update", "UPDATE"), ("delete", "DELETE")):
+            row_key = key.replace("NEW.", "OLD.") if op == "delete" else key
+            stmts.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_cdc_{op} AFTER {event} ON {table} BEGIN "
+                f"INSERT INTO change_log(tbl, row_key, op, changed_at) VALUES('{table}', {row_key}, '{op}', CAST(strftime('%s','now') AS INTEGER)); END"
+            )
+    return stmts
+
+
+SCHEMA_V3 = SchemaMigration(
+    version=3,
+    ddl=[
+        "CREATE TABLE IF NOT EXISTS change_log (seq INTEGER PRIMARY KEY AUTOINCREMENT, tbl TEXT NOT NULL, row_key TEXT NOT NULL, op TEXT NOT NULL, changed_at INTEGER NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS idx_change_log_tbl_seq ON change_log(tbl, seq)",
+        *_change_triggers(["runs", "node_runs", "work_items", "approvals", "schedules", "agent_heartbeats"]),
+    ],
+)
+
+
+COUNTER_KEYS = {
+    "work_items": "'work_items:' || {row}.status || ':' || {row}.priority",
+    "runs": "'runs:' || {row}.status",
+    "approvals": "'approvals:' || {row}.status",
+    "agent_heartbeats": "'agents:' || {row}.status",
+}
+
+
+def _bump(key: str, delta: int) -> str:
+    return (
+        f"INSERT INTO counters(name, value) SELECT {key}, 0 WHERE NOT EXISTS (SELECT 1 FROM counters WHERE name = {key}); "
+        f"UPDATE counters SET value = value + ({delta}) WHERE name = {key};"
+    )
+
+
+def _counter_triggers() -> List[str]:
+    stmts: List[str] = []
+    for table, key in COUNTER_KEYS.items():
+        new_key = key.format(row="NEW")
+        old_key = key.format(row="OLD")
+        stmts.append(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_cnt_insert AFTER INSERT ON {table} BEGIN {_bump(new_key, 1)} END")
+        stmts.append(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_cnt_delete AFTER DELETE ON {table} BEGIN {_bump(old_key, -1)} END")
+        stmts.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_cnt_update AFTER UPDATE ON {table} WHEN {old_key} IS NOT {new_key} BEGIN "
+            f"{_bump(old_key, -1)} {_bump(new_key, 1)} END"
+        )
+        stmts.append(f"INSERT OR REPLACE INTO counters(name, value) SELECT {key.format(row=table)} AS name, COUNT(*) FROM {table} GROUP BY name")
+    return stmts
+
+
+SCHEMA_V4 = SchemaMigration(
+    version=4,
+    ddl=[
+        "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        *_counter_triggers(),
+    ],
+)
+
+
+SCHEMA_V5 = SchemaMigration(
+    version=5,
+    ddl=[
+        "CREATE INDEX IF NOT EXISTS idx_audit_ts_id ON audit_logs(timestamp, audit_id)",
+        "CREATE INDEX IF NOT EXISTS idx_evidence_created_id ON evidence(created_at, evidence_id)",
+        "CREATE INDEX IF NOT EXISTS idx_evidence_trace_created ON evidence(trace_id, created_at, evidence_id)",
+        "CREATE INDEX IF NOT EXISTS idx_work_items_created_id ON work_items(created_at, task_id)",
+        "CREATE INDEX IF NOT EXISTS idx_work_items_status_created ON work_items(status, created_at, task_id)",
+        "CREATE INDEX IF NOT EXISTS idx_approvals_created_id ON approvals(created_at, approval_id)",
+        "CREATE INDEX IF NOT EXISTS idx_approvals_status_created ON approvals(status, created_at, approval_id)",
+        "CREATE INDEX IF NOT EXISTS idx_learning_reports_created_id ON learning_reports(created_at, report_id)",
+    ],
+)
+
+
+SCHEMA_V6 = SchemaMigration(
+    version=6,
+    ddl=[
+        "ALTER TABLE agent_heartbeats ADD COLUMN flush_window_sec INTEGER NOT NULL DEFAULT 0",
+    ],
+)
+
+
+SCHEMA_V7 = SchemaMigration(
+    version=7,
+    ddl=[
+        *_change_triggers(["workflows"]),
+    ],
+)
+
+
+ARCHIVE_GUARD = "archive"
+
+
+def _guarded_counter_deletes() -> List[str]:
+    stmts: List[str] = []
+    for table, key in COUNTER_KEYS.items():
+        stmts.append(f"DROP TRIGGER IF EXISTS trg_{table}_cnt_delete")
+        stmts.append(
+            f"CREATE TRIGGER trg_{table}_cnt_delete AFTER DELETE ON {table} "
+            f"WHEN NOT EXISTS (SELECT 1 FROM trigger_guards WHERE name = '{ARCHIVE_GUARD}') BEGIN {_bump(key.format(row='OLD'), -1)} END"
+        )
+    return stmts
+
+
+SCHEMA_V8 = SchemaMigration(
+    version=8,
+    ddl=[
+        "CREATE TABLE IF NOT EXISTS trigger_guards (name TEXT PRIMARY KEY)",
+        *_guarded_counter_deletes(),
+    ],
+)
+
+
+# Subscriber offsets used to count global WAL lines; they are per-topic sequence numbers now.
+# A WAL line count cannot be mapped to a topic_seq from SQL, so every offset restarts at 0.
+# Records written before topic_seq existed carry none and are never replayed, but records that
+# upgraded publishers already wrote with a topic_seq are delivered again: delivery across this
+# upgrade is at-least-once, and subscribers dedupe on the envelope's event_id.
+SCHEMA_V9 = SchemaMigration(
+    version=9,
+    ddl=[
+        "UPDATE event_offsets SET offset = 0",
+    ],
+)
+
+
+ARCHIVED_PREFIX = "archived:"
+
+
+def _hot_counter_deletes() -> List[str]:
+    stmts: List[str] = []
+    for table, key in COUNTER_KEYS.items():
+        old_key = key.format(row="OLD")
+        archived_key = f"'{ARCHIVED_PREFIX}' || {old_key}"
+        prefix = key.split("'")[1]
+        hot = f"SELECT {key.format(row=table)} AS name, COUNT(*) AS n FROM {table} GROUP BY name"
+        stmts.append(f"DROP TRIGGER IF EXISTS trg_{table}_cnt_delete")
+        stmts.append(f"CREATE TRIGGER trg_{table}_cnt_delete AFTER DELETE ON {table} BEGIN {_bump(old_key, -1)} END")
+        stmts.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_cnt_archive AFTER DELETE ON {table} "
+            f"WHEN EXISTS (SELECT 1 FROM trigger_guards WHERE name = '{ARCHIVE_GUARD}') BEGIN {_bump(archived_key, 1)} END"
+        )
+        # Whatever V8 kept beyond the hot rows was archived; move it to the archived tally.
+        stmts.append(
+            f"INSERT OR REPLACE INTO counters(name, value) SELECT '{ARCHIVED_PREFIX}' || c.name, c.value - COALESCE(h.n, 0) "
+            f"FROM counters c LEFT JOIN ({hot}) h ON h.name = c.name WHERE c.name LIKE '{prefix}%' AND c.value > COALESCE(h.n, 0)"
+        )
+        stmts.append(f"DELETE FROM counters WHERE name LIKE '{prefix}%'")
+        stmts.append(f"INSERT INTO counters(name, value) {hot}")
+    return stmts
+
+
+# Counters hold hot-table counts again; archiving moves a row's count under archived:*.
+SCHEMA_V10 = SchemaMigration(
+    version=10,
+    ddl=[
+        *_hot_counter_deletes(),
+    ],
+)
+
+
+ALL_MIGRATIONS = [SCHEMA_V1, SCHEMA_V2, SCHEMA_V3, SCHEMA_V4, SCHEMA_V5, SCHEMA_V6, SCHEMA_V7, SCHEMA_V8, SCHEMA_V9, SCHEMA_V10]
+
+
+_TERMINAL_RUN = "status IN ('succeeded', 'failed', 'canceled')"
+
+ARCHIVE_TABLES = {
+    "node_runs": (
+        "(SELECT MAX(r.started_at, r.ended_at) FROM runs r WHERE r.run_id = node_runs.run_id)",
+        f"run_id IN (SELECT run_id FROM runs WHERE {_TERMINAL_RUN})",
+    ),
+    "runs": ("MAX(started_at, ended_at)", _TERMINAL_RUN),
+    "work_items": ("updated_at", "status IN ('acked', 'failed', 'dead_letter')"),
+    "audit_logs": ("timestamp", "1"),
+    "evidence": ("created_at", "1"),
+    "schedule_triggers": ("created_at", "1"),
+}
+
+
+def archive_ddl() -> List[str]:
+    stmts: List[str] = []
+    for m in ALL_MIGRATIONS:
+        for stmt in m.ddl:
+            for table in ARCHIVE_TABLES:
+                if stmt.startswith(f"CREATE TABLE IF NOT EXISTS {table} (") or (stmt.startswith("CREATE INDEX ") and f" ON {table}(" in stmt):
+                    stmts.append(stmt)
+    return stmts
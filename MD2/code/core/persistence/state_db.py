@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import queue
 import sqlite3
 import threading
 import time
@@ -29,7 +32,13 @@ from protocols.approvals import ApprovalStatus, ApprovalRequest, ApprovalDecisio
 from protocols.workflows import WorkflowDefinition
 from protocols.learning import LearningReport
 
-from .schema import ALL_MIGRATIONS
+from .records import work_item_from_row, run_from_row, node_run_from_row
+from .schema import ALL_MIGRATIONS, ARCHIVE_GUARD, ARCHIVED_PREFIX, ARCHIVE_TABLES, CHANGE_TABLES, archive_ddl
+
+
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_MAX_PAGE_SIZE = 1000
+_WORK_ITEM_COLUMNS = ("task_id", "agent_id", "priority", "payload", "status", "lease_owner", "lease_expires_at", "idempotency_key", "created_at", "updated_at")
 
 
 def _coerce_float(value: Any, default: float = 0.0) -> float:
@@ -78,6 +87,92 @@ def _flatten_learning_content(entry: Dict[str, Any]) -> Dict[str, Any]:
     return merged
 
 
+def _work_item_dict_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "task_id": str(row["task_id"]),
+        "agent_id": str(row["agent_id"]),
+        "priority": int(row["priority"]),
+        "payload": Serializer.from_json(str(row["payload"])),
+        "status": str(row["status"]),
+        "lease_owner": str(row["lease_owner"]),
+        "lease_expires_at": int(row["lease_expires_at"]),
+        "idempotency_key": str(row["idempotency_key"]),
+        "created_at": int(row["created_at"]),
+        "updated_at": int(row["updated_at"]),
+    }
+
+
+def _approval_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "approval_id": str(row["approval_id"]),
+        "task_id": str(row["task_id"]),
+        "status": str(row["status"]),
+        "risk_score": _normalize_risk_score(row["risk_score"]),
+        "risk_factors": _normalize_risk_factors(Serializer.from_json(str(row["risk_factors_json"]))),
+        "requester": Serializer.from_json(str(row["requester_json"])),
+        "expires_at": int(row["expires_at"]),
+        "decision": Serializer.from_json(str(row["decision_json"])),
+        "created_at": int(row["created_at"]),
+        "updated_at": int(row["updated_at"]),
+    }
+
+
+def _learning_report_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    item = {"report_id": str(row["report_id"]), "agent_id": str(row["agent_id"]), "content": Serializer.from_json(str(row["content_json"])), "created_at": int(row["created_at"])}
+    return _flatten_learning_content(item)
+
+
+def _evidence_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "evidence_id": str(row["evidence_id"]),
+        "trace_id": str(row["trace_id"]),
+        "type": str(row["type"]),
+        "content": Serializer.from_json(str(row["content"])),
+        "hash": str(row["hash"]),
+        "created_at": int(row["created_at"]),
+    }
+
+
+def _audit_log_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "audit_id": str(row["audit_id"]),
+        "trace_id": str(row["trace_id"]),
+        "actor": str(row["actor"]),
+        "action": str(row["action"]),
+        "resource": str(row["resource"]),
+        "result": Serializer.from_json(str(row["result"])),
+        "timestamp": int(row["timestamp"]),
+    }
+
+
+def _month_bounds(month: str) -> Tuple[int, int]:
+    year, mon = (int(x) for x in month.split("-"))
+    start = datetime(year, mon, 1, tzinfo=timezone.utc)
+    end = datetime(year + mon // 12, mon % 12 + 1, 1, tzinfo=timezone.utc)
+    return int(start.timestamp()), int(end.timestamp())
+
+
+def _counter_sections(rows: List[Tuple[str, int]]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {
+        "work_items": {"by_status": {}, "by_status_priority": {}},
+        "runs": {},
+        "approvals": {},
+        "agents": {},
+    }
+    for name, value in rows:
+        if value <= 0:
+            continue
+        parts = name.split(":")
+        if parts[0] == "work_items" and len(parts) == 3:
+            _, status, priority = parts
+            by_status = out["work_items"]["by_status"]
+            by_status[status] = int(by_status.get(status, 0)) + value
+            out["work_items"]["by_status_priority"].setdefault(status, {})[priority] = value
+        elif parts[0] in {"runs", "approvals", "agents"} and len(parts) == 2:
+            out[parts[0]][parts[1]] = value
+    return out
+
+
 def _can_transition(current, target, transitions: Dict[Any, List[Any]]) -> bool:
     if current == target:
         return True
@@ -87,20 +182,49 @@ def _can_transition(current, target, transitions: Dict[Any, List[Any]]) -> bool:
 @dataclass
 class DbConfig:
     path: str
+    read_pool_size: int = 4
+    group_commit_window_ms: float = 0.0
+    archive_dir: str = ""
+
+
+@dataclass
+class LockWaitStats:
+    method: str
+    calls: int = 0
+    wait_total_ms: float = 0.0
+    wait_max_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        avg = self.wait_total_ms / self.calls if self.calls else 0.0
+        return {"method": self.method, "calls": int(self.calls), "wait_total_ms": round(self.wait_total_ms, 3), "wait_avg_ms": round(avg, 3), "wait_max_ms": round(self.wait_max_ms, 3)}
 
 
 class StateDB:
     def __init__(self, config: DbConfig):
         self._path = Path(config.path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._archive_dir = Path(config.archive_dir) if config.archive_dir else self._path.parent / "archive"
         self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._tls = threading.local()
+        self._group_window_sec = max(0.0, float(config.group_commit_window_ms)) / 1000.0
+        self._dirty_seq = 0
+        self._committed_seq = 0
+        self._commit_leader = False
+        self._commit_cond = threading.Condition(threading.Lock())
+        self._read_pool_size = max(0, int(config.read_pool_size))
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._readers_all: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._stats: Dict[str, LockWaitStats] = {}
+        self._stats_lock = threading.Lock()
         self._configure()
         self.migrate()
 
     def _configure(self) -> None:
         with self._lock:
+            self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
             self._conn.execute("PRAGMA journal_mode=WAL")
             self._conn.execute("PRAGMA synchronous=NORMAL")
             self._conn.execute("PRAGMA foreign_keys=ON")
@@ -121,50 +245,212 @@ class StateDB:
                 self._conn.commit()
 
     def close(self) -> None:
+        with self._readers_lock:
+            readers = list(self._readers_all)
+            self._readers_all.clear()
+        for conn in readers:
+            conn.close()
         with self._lock:
+            self._flush_locked()
             self._conn.close()
 
+    @contextmanager
+    def transaction(self) -> Iterator["StateDB"]:
+        t0 = time.perf_counter()
+        with self._lock:
+            depth = self._tx_depth()
+            if depth == 0:
+                self._record_wait("transaction", t0)
+                if self._conn.in_transaction:
+                    self._flush_locked()
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._tls.tx_depth = depth + 1
+            try:
+                yield self
+            except BaseException:
+                self._tls.tx_depth = depth
+                if depth == 0:
+                    self._conn.rollback()
+                raise
+            self._tls.tx_depth = depth
+            if depth == 0:
+                self._flush_locked()
+
+    def get_lock_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._stats_lock:
+            return {name: st.to_dict() for name, st in sorted(self._stats.items())}
+
+    def reset_lock_stats(self) -> None:
+        with self._stats_lock:
+            self._stats.clear()
+
+    def _tx_depth(self) -> int:
+        return int(getattr(self._tls, "tx_depth", 0))
+
+    def _commit(self) -> None:
+        if self._tx_depth() > 0:
+            return
+        if self._group_window_sec <= 0:
+            self._conn.commit()
+            return
+        self._dirty_seq += 1
+        self._tls.commit_ticket = self._dirty_seq
+
+    def _flush_locked(self) -> None:
+        seq = self._dirty_seq
+        if self._conn.in_transaction:
+            self._conn.commit()
+        with self._commit_cond:
+            if seq > self._committed_seq:
+                self._committed_seq = seq
+            self._commit_cond.notify_all()
+
+    def _await_group_commit(self, ticket: int) -> None:
+        with self._commit_cond:
+            while self._committed_seq < ticket:
+                if not self._commit_leader:
+                    self._commit_leader = True
+                    break
+                self._commit_cond.wait()
+            else:
+                return
+        try:
+            time.sleep(self._group_window_sec)
+            with self._lock:
+                self._flush_locked()
+        finally:
+            with self._commit_cond:
+                self._commit_leader = False
+                self._commit_cond.notify_all()
+
+    @contextmanager
+    def _write(self, method: str) -> Iterator[sqlite3.Connection]:
+        t0 = time.perf_counter()
+        with self._lock:
+            self._record_wait(method, t0)
+            yield self._conn
+        ticket = int(getattr(self._tls, "commit_ticket", 0))
+        if ticket:
+            self._tls.commit_ticket = 0
+            self._await_group_commit(ticket)
+
+    @contextmanager
+    def _read(self, method: str) -> Iterator[sqlite3.Connection]:
+        if self._read_pool_size <= 0 or self._tx_depth() > 0:
+            with self._write(method) as conn:
+                yield conn
+            return
+        t0 = time.perf_counter()
+        conn = self._checkout_reader()
+        self._record_wait(method, t0)
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if len(self._readers_all) < self._read_pool_size:
+                conn = sqlite3.connect(self._path.resolve().as_uri() + "?mode=ro", uri=True, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                self._readers_all.append(conn)
+                return conn
+        return self._readers.get()
+
+    def _record_wait(self, method: str, t0: float) -> None:
+        waited_ms = (time.perf_counter() - t0) * 1000.0
+        with self._stats_lock:
+            st = self._stats.get(method)
+            if st is None:
+                st = LockWaitStats(method=method)
+                self._stats[method] = st
+            st.calls += 1
+            st.wait_total_ms += waited_ms
+            if waited_ms > st.wait_max_ms:
+                st.wait_max_ms = waited_ms
+
+    def _select(
+        self,
+        method: str,
+        sql: str,
+        params: Tuple[Any, ...],
+        include_archive: bool = False,
+        order: Optional[Callable[[sqlite3.Row], Any]] = None,
+        descending: bool = False,
+        limit: int = 0,
+    ) -> List[sqlite3.Row]:
+        with self._read(method) as conn:
+            rows = conn.execute(sql.format(db=""), params).fetchall()
+        if not include_archive or (limit and order is None and len(rows) >= limit):
+            return rows
+        archives = self._archive_paths()
+        if archives:
+            arc = sqlite3.connect("file::memory:", uri=True)
+            arc.row_factory = sqlite3.Row
+            try:
+                for path in archives:
+                    arc.execute("ATTACH DATABASE ? AS arc", (path.resolve().as_uri() + "?mode=ro",))
+                    try:
+                        rows.extend(arc.execute(sql.format(db="arc."), params).fetchall())
+                    finally:
+                        arc.execute("DETACH DATABASE arc")
+                    if limit and order is None and len(rows) >= limit:
+                        break
+            finally:
+                arc.close()
+        if order is not None:
+            rows.sort(key=order, reverse=descending)
+        return rows[:limit] if limit else rows
+
     def create_schedule(self, workflow_id: str, version: str, enabled: bool, policy: Dict[str, Any]) -> ScheduleRecord:
         ok, err = schedule_policy_validate(policy)
         if not ok:
             raise ValueError(err)
         schedule_id = f"sch-{uuid.uuid4().hex}"
         next_fire_at = 0
-        with self._lock:
+        with self._write("create_schedule"):
             self._conn.execute(
                 "INSERT INTO schedules(id, workflow_id, version, enabled, policy_json, next_fire_at) VALUES(?,?,?,?,?,?)",
                 (schedule_id, workflow_id, version, 1 if enabled else 0, Serializer.to_json(policy), int(next_fire_at)),
             )
-            self._conn.commit()
+            self._commit()
         return ScheduleRecord(id=schedule_id, workflow_id=workflow_id, version=version, enabled=enabled, policy_json=policy, next_fire_at=next_fire_at)
 
     def set_schedule_next_fire_at(self, schedule_id: str, next_fire_at: int) -> bool:
-        with self._lock:
+        with self._write("set_schedule_next_fire_at"):
             cur = self._conn.execute("UPDATE schedules SET next_fire_at = ? WHERE id = ?", (int(next_fire_at), schedule_id))
-            self._conn.commit()
+            self._commit()
             return cur.rowcount > 0
 
     def add_schedule_trigger(self, schedule_id: str, fire_at: int, run_id: str, status: str) -> bool:
         now = now_unix()
-        with self._lock:
+        with self._write("add_schedule_trigger"):
             self._conn.execute(
                 "INSERT INTO schedule_triggers(schedule_id, fire_at, run_id, status, created_at) VALUES(?,?,?,?,?)",
                 (schedule_id, int(fire_at), str(run_id), str(status), int(now)),
             )
-            self._conn.commit()
+            self._commit()
         return True
 
-    def list_schedule_triggers(self, schedule_id: str, limit: int = 20) -> List[Dict[str, Any]]:
-        with self._lock:
-            rows = self._conn.execute(
-                "SELECT schedule_id, fire_at, run_id, status, created_at FROM schedule_triggers WHERE schedule_id = ? ORDER BY fire_at DESC LIMIT ?",
-                (schedule_id, int(limit)),
-            ).fetchall()
+    def list_schedule_triggers(self, schedule_id: str, limit: int = 20, include_archive: bool = False) -> List[Dict[str, Any]]:
+        rows = self._select(
+            "list_schedule_triggers",
+            "SELECT schedule_id, fire_at, run_id, status, created_at FROM {db}schedule_triggers WHERE schedule_id = ? ORDER BY fire_at DESC LIMIT ?",
+            (schedule_id, int(limit)),
+            include_archive,
+            order=lambda r: int(r["fire_at"]),
+            descending=True,
+            limit=int(limit),
+        )
         return [{"schedule_id": str(r["schedule_id"]), "fire_at": int(r["fire_at"]), "run_id": str(r["run_id"]), "status": str(r["status"]), "created_at": int(r["created_at"])} for r in rows]
 
     def get_schedule(self, schedule_id: str) -> Optional[ScheduleRecord]:
-        with self._lock:
-            cur = self._conn.execute("SELECT * FROM schedules WHERE id = ?", (schedule_id,))
+        with self._read("get_schedule") as conn:
+            cur = conn.execute("SELECT * FROM schedules WHERE id = ?", (schedule_id,))
             row = cur.fetchone()
             if not row:
                 return None
@@ -186,12 +472,12 @@ class StateDB:
         ok, err = schedule_policy_validate(next_policy)
         if not ok:
             raise ValueError(err)
-        with self._lock:
+        with self._write("update_schedule"):
             self._conn.execute(
                 "UPDATE schedules SET enabled = ?, policy_json = ? WHERE id = ?",
                 (1 if next_enabled else 0, Serializer.to_json(next_policy), schedule_id),
             )
-            self._conn.commit()
+            self._commit()
         return ScheduleRecord(
             id=current.id,
             workflow_id=current.workflow_id,
@@ -212,8 +498,8 @@ class StateDB:
             params.append(cursor)
         sql = f"SELECT * FROM schedules {where} ORDER BY id ASC LIMIT ?"
         params.append(int(limit))
-        with self._lock:
-            rows = self._conn.execute(sql, tuple(params)).fetchall()
+        with self._read("list_schedules") as conn:
+            rows = conn.execute(sql, tuple(params)).fetchall()
         items = [
             ScheduleRecord(
                 id=str(r["id"]),
@@ -229,8 +515,8 @@ class StateDB:
         return items, next_cursor
 
     def list_due_schedules(self, now: int, limit: int = 100) -> List[Dict[str, Any]]:
-        with self._lock:
-            rows = self._conn.execute(
+        with self._read("list_due_schedules") as conn:
+            rows = conn.execute(
                 "SELECT * FROM schedules WHERE enabled = 1 AND (next_fire_at <= ? OR next_fire_at = 0) ORDER BY next_fire_at ASC LIMIT ?",
                 (int(now), int(limit)),
             ).fetchall()
@@ -249,7 +535,7 @@ class StateDB:
         return out
 
     def upsert_run(self, run: RunRecord) -> RunRecord:
-        with self._lock:
+        with self._write("upsert_run"):
             self._conn.execute(
                 "INSERT INTO runs(run_id, trace_id, workflow_id, status, config_snapshot, started_at, ended_at) VALUES(?,?,?,?,?,?,?) "
                 "ON CONFLICT(run_id) DO UPDATE SET trace_id=excluded.trace_id, workflow_id=excluded.workflow_id, status=excluded.status, "
@@ -264,12 +550,12 @@ class StateDB:
                     int(run.ended_at),
                 ),
             )
-            self._conn.commit()
+            self._commit()
         return run
 
     def update_run_status(self, run_id: str, status: RunStatus, ended_at: Optional[int] = None) -> bool:
         end = int(ended_at if ended_at is not None else 0)
-        with self._lock:
+        with self._write("update_run_status"):
             row = self._conn.execute("SELECT status FROM runs WHERE run_id = ?", (run_id,)).fetchone()
             if not row:
                 return False
@@ -277,23 +563,14 @@ class StateDB:
             if not _can_transition(current, status, RUN_TRANSITIONS):
                 return False
             cur = self._conn.execute("UPDATE runs SET status = ?, ended_at = ? WHERE run_id = ?", (status.value, end, run_id))
-            self._conn.commit()
+            self._commit()
             return cur.rowcount > 0
 
-    def get_run(self, run_id: str) -> Optional[RunRecord]:
-        with self._lock:
-            row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
-        if not row:
+    def get_run(self, run_id: str, include_archive: bool = False) -> Optional[RunRecord]:
+        rows = self._select("get_run", "SELECT * FROM {db}runs WHERE run_id = ?", (run_id,), include_archive, limit=1)
+        if not rows:
             return None
-        return RunRecord(
-            run_id=str(row["run_id"]),
-            trace_id=str(row["trace_id"]),
-            workflow_id=str(row["workflow_id"]),
-            status=RunStatus(str(row["status"])),
-            config_snapshot=Serializer.from_json(str(row["config_snapshot"])),
-            started_at=int(row["started_at"]),
-            ended_at=int(row["ended_at"]),
-        )
+        return run_from_row(rows[0])
 
     def list_runs(self, workflow_id: str = "", limit: int = 50, cursor: str = "") -> Tuple[List[RunRecord], str]:
         where = ""
@@ -306,20 +583,9 @@ class StateDB:
             params.append(cursor)
         sql = f"SELECT * FROM runs {where} ORDER BY run_id ASC LIMIT ?"
         params.append(int(limit))
-        with self._lock:
-            rows = self._conn.execute(sql, tuple(params)).fetchall()
-        runs = [
-            RunRecord(
-                run_id=str(r["run_id"]),
-                trace_id=str(r["trace_id"]),
-                workflow_id=str(r["workflow_id"]),
-                status=RunStatus(str(r["status"])),
-                config_snapshot=Serializer.from_json(str(r["config_snapshot"])),
-                started_at=int(r["started_at"]),
-                ended_at=int(r["ended_at"]),
-            )
-            for r in rows
-        ]
+        with self._read("list_runs") as conn:
+            rows = conn.execute(sql, tuple(params)).fetchall()
+        runs = [run_from_row(r) for r in rows]
         next_cursor = runs[-1].run_id if len(runs) == limit else ""
         return runs, next_cursor
 
@@ -329,8 +595,8 @@ class StateDB:
             return []
         q = ",".join(["?"] * len(st))
         sql = f"SELECT run_id, trace_id, workflow_id, status, config_snapshot, started_at, ended_at FROM runs WHERE status IN ({q}) ORDER BY started_at ASC LIMIT ?"
-        with self._lock:
-            rows = self._conn.execute(sql, (*st, int(limit))).fetchall()
+        with self._read("list_runs_by_status") as conn:
+            rows = conn.execute(sql, (*st, int(limit))).fetchall()
         out: List[Dict[str, Any]] = []
         for r in rows:
             out.append(
@@ -347,7 +613,7 @@ class StateDB:
         return out
 
     def upsert_node_run(self, node: NodeRunRecord) -> NodeRunRecord:
-        with self._lock:
+        with self._write("upsert_node_run"):
             self._conn.execute(
                 "INSERT INTO node_runs(run_id, node_id, status, snapshot, started_at, ended_at) VALUES(?,?,?,?,?,?) "
                 "ON CONFLICT(run_id, node_id) DO UPDATE SET status=excluded.status, snapshot=excluded.snapshot, started_at=excluded.started_at, ended_at=excluded.ended_at",
@@ -360,14 +626,14 @@ class StateDB:
                     int(node.ended_at),
                 ),
             )
-            self._conn.commit()
+            self._commit()
         return node
 
     def update_node_status(self, run_id: str, node_id: str, status: NodeRunStatus, snapshot: Optional[Dict[str, Any]] = None, ended_at: Optional[int] = None) -> bool:
         now = now_unix()
         snap = snapshot if snapshot is not None else {}
         end = int(ended_at if ended_at is not None else 0)
-        with self._lock:
+        with self._write("update_node_status"):
             row = self._conn.execute("SELECT status FROM node_runs WHERE run_id = ? AND node_id = ?", (run_id, node_id)).fetchone()
             if row:
                 current = NodeRunStatus(str(row["status"]))
@@ -378,88 +644,68 @@ class StateDB:
                 "ON CONFLICT(run_id, node_id) DO UPDATE SET status=excluded.status, snapshot=excluded.snapshot, ended_at=excluded.ended_at",
                 (run_id, node_id, status.value, Serializer.to_json(snap), int(now), int(end)),
             )
-            self._conn.commit()
+            self._commit()
             return cur.rowcount > 0
 
-    def list_node_runs(self, run_id: str) -> List[NodeRunRecord]:
-        with self._lock:
-            rows = self._conn.execute("SELECT * FROM node_runs WHERE run_id = ? ORDER BY node_id ASC", (run_id,)).fetchall()
-        return [
-            NodeRunRecord(
-                node_id=str(r["node_id"]),
-                run_id=str(r["run_id"]),
-                status=NodeRunStatus(str(r["status"])),
-                snapshot=Serializer.from_json(str(r["snapshot"])),
-                started_at=int(r["started_at"]),
-                ended_at=int(r["ended_at"]),
-            )
-            for r in rows
-        ]
+    def list_node_runs(self, run_id: str, include_archive: bool = False) -> List[NodeRunRecord]:
+        rows = self._select("list_node_runs", "SELECT * FROM {db}node_runs WHERE run_id = ? ORDER BY node_id ASC", (run_id,), include_archive, order=lambda r: str(r["node_id"]))
+        return [node_run_from_row(r) for r in rows]
 
     def enqueue_work_item(self, task_id: str, priority: int, payload: Dict[str, Any], idempotency_key: str = "") -> WorkItemRecord:
         idem = idempotency_key or f"wi:{task_id}"
         now = now_unix()
         record = WorkItemRecord(task_id=task_id, agent_id="", priority=int(priority), payload=payload, status=WorkItemStatus.CREATED, lease_owner="", lease_expires_at=0, idempotency_key=idem, created_at=now, updated_at=now)
-        with self._lock:
+        with self._write("enqueue_work_item"):
             self._conn.execute(
                 "INSERT INTO work_items(task_id, agent_id, priority, payload, status, lease_owner, lease_expires_at, idempotency_key, created_at, updated_at) VALUES(?,?,?,?,?,?,?,?,?,?)",
                 (record.task_id, record.agent_id, record.priority, Serializer.to_json(record.payload), record.status.value, record.lease_owner, int(record.lease_expires_at), record.idempotency_key, int(record.created_at), int(record.updated_at)),
             )
-            self._conn.commit()
+            self._commit()
         return record
 
-    def list_work_items(self, status: str = "", limit: int = 50) -> List[Dict[str, Any]]:
-        with self._lock:
+    def list_work_items(self, status: str = "", limit: int = 50, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        columns = "*"
+        if fields:
+            wanted = [f for f in fields if f in _WORK_ITEM_COLUMNS]
+            if not wanted:
+                raise ValueError("invalid_fields")
+            columns = ", ".join(wanted)
+        with self._read("list_work_items") as conn:
             if status:
-                rows = self._conn.execute(
-                    "SELECT * FROM work_items WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                rows = conn.execute(
+                    f"SELECT {columns} FROM work_items WHERE status = ? ORDER BY created_at DESC LIMIT ?",
                     (status, int(limit)),
                 ).fetchall()
             else:
-                rows = self._conn.execute(
-                    "SELECT * FROM work_items ORDER BY created_at DESC LIMIT ?",
+                rows = conn.execute(
+                    f"SELECT {columns} FROM work_items ORDER BY created_at DESC LIMIT ?",
                     (int(limit),),
                 ).fetchall()
-        
-        out: List[Dict[str, Any]] = []
-        for r in rows:
-            out.append(
-                {
-                    "task_id": str(r["task_id"]),
-                    "agent_id": str(r["agent_id"]),
-                    "priority": int(r["priority"]),
-                    "payload": Serializer.from_json(str(r["payload"])),
-                    "status": str(r["status"]),
-                    "lease_owner": str(r["lease_owner"]),
-                    "lease_expires_at": int(r["lease_expires_at"]),
-                    "idempotency_key": str(r["idempotency_key"]),
-                    "created_at": int(r["created_at"]),
-                    "updated_at": int(r["updated_at"]),
-                }
-            )
-        return out
-
-    def get_work_item(self, task_id: str) -> Optional[WorkItemRecord]:
-        with self._lock:
-            row = self._conn.execute("SELECT * FROM work_items WHERE task_id = ?", (task_id,)).fetchone()
+        if not fields:
+            return [_work_item_dict_from_row(r) for r in rows]
+        return [{k: (Serializer.from_json(str(r[k])) if k == "payload" else r[k]) for k in r.keys()} for r in rows]
+
+    def has_work_item(self, task_id: str = "", idempotency_key: str = "") -> bool:
+        with self._read("has_work_item") as conn:
+            row = conn.execute("SELECT 1 FROM work_items WHERE task_id = ? OR idempotency_key = ? LIMIT 1", (str(task_id), str(idempotency_key))).fetchone()
+        return row is not None
+
+    def get_work_item_status(self, task_id: str) -> Optional[WorkItemStatus]:
+        with self._read("get_work_item_status") as conn:
+            row = conn.execute("SELECT status FROM work_items WHERE task_id = ?", (task_id,)).fetchone()
         if not row:
             return None
-        return WorkItemRecord(
-            task_id=str(row["task_id"]),
-            agent_id=str(row["agent_id"]),
-            priority=int(row["priority"]),
-            payload=Serializer.from_json(str(row["payload"])),
-            status=WorkItemStatus(str(row["status"])),
-            lease_owner=str(row["lease_owner"]),
-            lease_expires_at=int(row["lease_expires_at"]),
-            idempotency_key=str(row["idempotency_key"]),
-            created_at=int(row["created_at"]),
-            updated_at=int(row["updated_at"]),
-        )
+        return WorkItemStatus(str(row["status"]))
+
+    def get_work_item(self, task_id: str, include_archive: bool = False) -> Optional[WorkItemRecord]:
+        rows = self._select("get_work_item", "SELECT * FROM {db}work_items WHERE task_id = ?", (task_id,), include_archive, limit=1)
+        if not rows:
+            return None
+        return work_item_from_row(rows[0])
 
     def mark_work_item_running(self, task_id: str, agent_id: str) -> bool:
         now = now_unix()
-        with self._lock:
+        with self._write("mark_work_item_running"):
             row = self._conn.execute("SELECT status FROM work_items WHERE task_id = ? AND agent_id = ?", (task_id, agent_id)).fetchone()
             if not row:
                 return False
@@ -470,12 +716,12 @@ class StateDB:
                 "UPDATE work_items SET status=?, updated_at=? WHERE task_id=? AND agent_id=? AND status IN (?,?)",
                 (WorkItemStatus.RUNNING.value, int(now), task_id, agent_id, WorkItemStatus.CLAIMED.value, WorkItemStatus.RUNNING.value),
             )
-            self._conn.commit()
+            self._commit()
             return cur.rowcount > 0
 
     def reclaim_expired_leases(self, now: Optional[int] = None, limit: int = 100) -> int:
         ts = int(now if now is not None else now_unix())
-        with self._lock:
+        with self._write("reclaim_expired_leases"):
             rows = self._conn.execute(
                 "SELECT task_id FROM work_items WHERE status=? AND lease_expires_at > 0 AND lease_expires_at <= ? ORDER BY lease_expires_at ASC LIMIT ?",
                 (WorkItemStatus.CLAIMED.value, ts, int(limit)),
@@ -488,46 +734,73 @@ class StateDB:
                 f"UPDATE work_items SET status=?, agent_id=?, lease_owner=?, lease_expires_at=?, updated_at=? WHERE task_id IN ({q})",
                 (WorkItemStatus.CREATED.value, "", "", 0, ts, *task_ids),
             )
-            self._conn.commit()
+            self._commit()
             return cur.rowcount
 
     def claim_work_item(self, agent_id: str, max_priority: int = 10, lease_ttl_sec: int = 60) -> Optional[WorkItemRecord]:
+        items = self.claim_work_items(agent_id=agent_id, n=1, max_priority=max_priority, lease_ttl_sec=lease_ttl_sec)
+        return items[0] if items else None
+
+    def claim_work_items(self, agent_id: str, n: int = 1, max_priority: int = 10, lease_ttl_sec: int = 60) -> List[WorkItemRecord]:
+        limit = int(n)
+        if limit <= 0:
+            return []
         now = now_unix()
         lease_expires_at = now + int(lease_ttl_sec)
-        with self._lock:
-            row = self._conn.execute(
-                "SELECT * FROM work_items WHERE status = ? AND priority <= ? ORDER BY priority DESC, created_at ASC LIMIT 1",
-                (WorkItemStatus.CREATED.value, int(max_priority)),
-            ).fetchone()
-            if not row:
-                return None
-            task_id = str(row["task_id"])
-            updated_at = now
-            self._conn.execute(
-                "UPDATE work_items SET status=?, agent_id=?, lease_owner=?, lease_expires_at=?, updated_at=? WHERE task_id=? AND status=?",
-                (WorkItemStatus.CLAIMED.value, agent_id, agent_id, int(lease_expires_at), int(updated_at), task_id, WorkItemStatus.CREATED.value),
-            )
-            self._conn.commit()
-            row2 = self._conn.execute("SELECT * FROM work_items WHERE task_id = ?", (task_id,)).fetchone()
-        if not row2:
-            return None
-        return WorkItemRecord(
-            task_id=str(row2["task_id"]),
-            agent_id=str(row2["agent_id"]),
-            priority=int(row2["priority"]),
-            payload=Serializer.from_json(str(row2["payload"])),
-            status=WorkItemStatus(str(row2["status"])),
-            lease_owner=str(row2["lease_owner"]),
-            lease_expires_at=int(row2["lease_expires_at"]),
-            idempotency_key=str(row2["idempotency_key"]),
-            created_at=int(row2["created_at"]),
-            updated_at=int(row2["updated_at"]),
-        )
+        claim_params = (WorkItemStatus.CLAIMED.value, agent_id, agent_id, int(lease_expires_at), int(now))
+        pick_params = (WorkItemStatus.CREATED.value, int(max_priority), limit, WorkItemStatus.CREATED.value)
+        with self._write("claim_work_items"):
+            if _SUPPORTS_RETURNING:
+                rows = self._conn.execute(
+                    "UPDATE work_items SET status=?, agent_id=?, lease_owner=?, lease_expires_at=?, updated_at=? "
+                    "WHERE task_id IN (SELECT task_id FROM work_items WHERE status = ? AND priority <= ? ORDER BY priority DESC, created_at ASC LIMIT ?) AND status=? "
+                    "RETURNING *",
+                    (*claim_params, *pick_params),
+                ).fetchall()
+            else:
+                picked = self._conn.execute(
+                    "SELECT task_id FROM work_items WHERE status = ? AND priority <= ? ORDER BY priority DESC, created_at ASC LIMIT ?",
+                    pick_params[:3],
+                ).fetchall()
+                task_ids = [str(r["task_id"]) for r in picked]
+                rows = []
+                if task_ids:
+                    q = ",".join(["?"] * len(task_ids))
+                    self._conn.execute(
+                        f"UPDATE work_items SET status=?, agent_id=?, lease_owner=?, lease_expires_at=?, updated_at=? WHERE task_id IN ({q}) AND status=?",
+                        (*claim_params, *task_ids, WorkItemStatus.CREATED.value),
+                    )
+                    rows = self._conn.execute(
+                        f"SELECT * FROM work_items WHERE task_id IN ({q}) AND status = ? AND lease_owner = ?",
+                        (*task_ids, WorkItemStatus.CLAIMED.value, agent_id),
+                    ).fetchall()
+            self._commit()
+        items = [work_item_from_row(r) for r in rows]
+        items.sort(key=lambda w: (-w.priority, w.created_at, w.task_id))
+        return items
+
+    def renew_leases(self, agent_id: str, task_ids: List[str], ttl: int = 60) -> List[str]:
+        ids = [str(t) for t in (task_ids or [])]
+        if not ids:
+            return []
+        now = now_unix()
+        lease_expires_at = now + int(ttl)
+        q = ",".join(["?"] * len(ids))
+        params = (int(lease_expires_at), int(now), agent_id, WorkItemStatus.CLAIMED.value, WorkItemStatus.RUNNING.value, *ids)
+        where = f"lease_owner = ? AND status IN (?,?) AND task_id IN ({q})"
+        with self._write("renew_leases"):
+            if _SUPPORTS_RETURNING:
+                rows = self._conn.execute(f"UPDATE work_items SET lease_expires_at=?, updated_at=? WHERE {where} RETURNING task_id", params).fetchall()
+            else:
+                self._conn.execute(f"UPDATE work_items SET lease_expires_at=?, updated_at=? WHERE {where}", params)
+                rows = self._conn.execute(f"SELECT task_id FROM work_items WHERE {where} AND lease_expires_at = ?", (*params[2:], int(lease_expires_at))).fetchall()
+            self._commit()
+        return [str(r["task_id"]) for r in rows]
 
     def ack_work_item(self, task_id: str, agent_id: str, ok: bool) -> bool:
         now = now_unix()
         new_status = WorkItemStatus.ACKED.value if ok else WorkItemStatus.FAILED.value
-        with self._lock:
+        with self._write("ack_work_item"):
             row = self._conn.execute("SELECT status FROM work_items WHERE task_id = ? AND agent_id = ?", (task_id, agent_id)).fetchone()
             if not row:
                 return False
@@ -538,25 +811,44 @@ class StateDB:
                 "UPDATE work_items SET status=?, updated_at=? WHERE task_id=? AND agent_id=?",
                 (new_status, int(now), task_id, agent_id),
             )
-            self._conn.commit()
+            self._commit()
             return cur.rowcount > 0
 
     def write_agent_heartbeat(self, agent_id: str, status: str, cpu: float, mem: float, queue_depth: int, skills: List[str], metrics: Dict[str, Any]) -> bool:
-        now = now_unix()
-        with self._lock:
-            self._conn.execute(
-                "INSERT INTO agent_heartbeats(agent_id, status, cpu, mem, queue_depth, skills_json, metrics_json, last_seen) VALUES(?,?,?,?,?,?,?,?) "
+        beat = {"agent_id": agent_id, "status": status, "cpu": cpu, "mem": mem, "queue_depth": queue_depth, "skills": skills, "metrics": metrics, "last_seen": now_unix()}
+        return self.write_agent_heartbeats([beat]) > 0
+
+    def write_agent_heartbeats(self, beats: List[Dict[str, Any]], flush_window_sec: int = 0) -> int:
+        if not beats:
+            return 0
+        rows = [
+            (
+                str(b["agent_id"]),
+                str(b["status"]),
+                float(b.get("cpu", 0.0)),
+                float(b.get("mem", 0.0)),
+                int(b.get("queue_depth", 0)),
+                Serializer.to_json(list(b.get("skills") or [])),
+                Serializer.to_json(dict(b.get("metrics") or {})),
+                int(b.get("last_seen") or now_unix()),
+                int(flush_window_sec),
+            )
+            for b in beats
+        ]
+        with self._write("write_agent_heartbeats"):
+            self._conn.executemany(
+                "INSERT INTO agent_heartbeats(agent_id, status, cpu, mem, queue_depth, skills_json, metrics_json, last_seen, flush_window_sec) VALUES(?,?,?,?,?,?,?,?,?) "
                 "ON CONFLICT(agent_id) DO UPDATE SET status=excluded.status, cpu=excluded.cpu, mem=excluded.mem, queue_depth=excluded.queue_depth, "
-                "skills_json=excluded.skills_json, metrics_json=excluded.metrics_json, last_seen=excluded.last_seen",
-                (agent_id, str(status), float(cpu), float(mem), int(queue_depth), Serializer.to_json(list(skills)), Serializer.to_json(dict(metrics or {})), int(now)),
+                "skills_json=excluded.skills_json, metrics_json=excluded.metrics_json, last_seen=excluded.last_seen, flush_window_sec=excluded.flush_window_sec",
+                rows,
             )
-            self._conn.commit()
-        return True
+            self._commit()
+        return len(rows)
 
     def list_idle_agents(self, idle_before: int, max_queue_depth: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
-        with self._lock:
-            rows = self._conn.execute(
-                "SELECT * FROM agent_heartbeats WHERE last_seen <= ? AND queue_depth <= ? ORDER BY last_seen ASC LIMIT ?",
+        with self._read("list_idle_agents") as conn:
+            rows = conn.execute(
+                "SELECT * FROM agent_heartbeats WHERE last_seen + flush_window_sec <= ? AND queue_depth <= ? ORDER BY last_seen ASC LIMIT ?",
                 (int(idle_before), int(max_queue_depth), int(limit)),
             ).fetchall()
         out: List[Dict[str, Any]] = []
@@ -576,8 +868,8 @@ class StateDB:
         return out
 
     def list_all_agents(self, limit: int = 100) -> List[Dict[str, Any]]:
-        with self._lock:
-            rows = self._conn.execute(
+        with self._read("list_all_agents") as conn:
+            rows = conn.execute(
                 "SELECT * FROM agent_heartbeats ORDER BY last_seen DESC LIMIT ?",
                 (int(limit),),
             ).fetchall()
@@ -598,18 +890,18 @@ class StateDB:
         return out
 
     def upsert_workflow(self, wf: WorkflowDefinition) -> WorkflowDefinition:
-        with self._lock:
+        with self._write("upsert_workflow"):
             self._conn.execute(
                 "INSERT INTO workflows(workflow_id, version, dag_json, metadata_json, created_at) VALUES(?,?,?,?,?) "
                 "ON CONFLICT(workflow_id, version) DO UPDATE SET dag_json=excluded.dag_json, metadata_json=excluded.metadata_json",
                 (wf.workflow_id, wf.version, Serializer.to_json(wf.dag), Serializer.to_json(wf.metadata), int(wf.created_at)),
             )
-            self._conn.commit()
+            self._commit()
         return wf
 
     def get_workflow(self, workflow_id: str, version: str) -> Optional[WorkflowDefinition]:
-        with self._lock:
-            row = self._conn.execute("SELECT * FROM workflows WHERE workflow_id = ? AND version = ?", (workflow_id, version)).fetchone()
+        with self._read("get_workflow") as conn:
+            row = conn.execute("SELECT * FROM workflows WHERE workflow_id = ? AND version = ?", (workflow_id, version)).fetchone()
         if not row:
             return None
         return WorkflowDefinition(
@@ -621,8 +913,8 @@ class StateDB:
         )
 
     def get_latest_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
-        with self._lock:
-            row = self._conn.execute(
+        with self._read("get_latest_workflow") as conn:
+            row = conn.execute(
                 "SELECT workflow_id, version, dag_json, metadata_json, created_at FROM workflows WHERE workflow_id = ? ORDER BY created_at DESC LIMIT 1",
                 (workflow_id,),
             ).fetchone()
@@ -649,31 +941,20 @@ class StateDB:
             expires_at=int(expires_at),
             created_at=int(now),
         )
-        with self._lock:
+        with self._write("create_approval"):
             self._conn.execute(
                 "INSERT INTO approvals(approval_id, task_id, status, risk_score, risk_factors_json, requester_json, expires_at, decision_json, created_at, updated_at) VALUES(?,?,?,?,?,?,?,?,?,?)",
                 (req.approval_id, req.task_id, req.status.value, float(req.risk_score), Serializer.to_json(req.risk_factors), Serializer.to_json(req.requester), int(req.expires_at), Serializer.to_json({}), int(req.created_at), int(now)),
             )
-            self._conn.commit()
+            self._commit()
         return req
 
     def get_approval(self, approval_id: str) -> Optional[Dict[str, Any]]:
-        with self._lock:
-            row = self._conn.execute("SELECT * FROM approvals WHERE approval_id = ?", (approval_id,)).fetchone()
+        with self._read("get_approval") as conn:
+            row = conn.execute("SELECT * FROM approvals WHERE approval_id = ?", (approval_id,)).fetchone()
         if not row:
             return None
-        return {
-            "approval_id": str(row["approval_id"]),
-            "task_id": str(row["task_id"]),
-            "status": str(row["status"]),
-            "risk_score": _normalize_risk_score(row["risk_score"]),
-            "risk_factors": _normalize_risk_factors(Serializer.from_json(str(row["risk_factors_json"]))),
-            "requester": Serializer.from_json(str(row["requester_json"])),
-            "expires_at": int(row["expires_at"]),
-            "decision": Serializer.from_json(str(row["decision_json"])),
-            "created_at": int(row["created_at"]),
-            "updated_at": int(row["updated_at"]),
-        }
+        return _approval_from_row(row)
 
     def list_approvals(self, status: str = "", limit: int = 50) -> List[Dict[str, Any]]:
         where = ""
@@ -683,41 +964,27 @@ class StateDB:
             params.append(str(status))
         sql = f"SELECT * FROM approvals {where} ORDER BY created_at DESC LIMIT ?"
         params.append(int(limit))
-        with self._lock:
-            rows = self._conn.execute(sql, tuple(params)).fetchall()
-        return [
-            {
-                "approval_id": str(r["approval_id"]),
-                "task_id": str(r["task_id"]),
-                "status": str(r["status"]),
-                "risk_score": _normalize_risk_score(r["risk_score"]),
-                "risk_factors": _normalize_risk_factors(Serializer.from_json(str(r["risk_factors_json"]))),
-                "requester": Serializer.from_json(str(r["requester_json"])),
-                "expires_at": int(r["expires_at"]),
-                "decision": Serializer.from_json(str(r["decision_json"])),
-                "created_at": int(r["created_at"]),
-                "updated_at": int(r["updated_at"]),
-            }
-            for r in rows
-        ]
+        with self._read("list_approvals") as conn:
+            rows = conn.execute(sql, tuple(params)).fetchall()
+        return [_approval_from_row(r) for r in rows]
 
     def decide_approval(self, approval_id: str, decision: ApprovalDecision, new_status: ApprovalStatus) -> bool:
         now = now_unix()
-        with self._lock:
+        with self._write("decide_approval"):
             cur = self._conn.execute(
                 "UPDATE approvals SET status=?, decision_json=?, updated_at=? WHERE approval_id=? AND status=?",
                 (new_status.value, Serializer.to_json(decision.__dict__), int(now), approval_id, ApprovalStatus.PENDING.value),
             )
-            self._conn.commit()
+            self._commit()
             return cur.rowcount > 0
 
     def write_learning_report(self, report: LearningReport) -> bool:
-        with self._lock:
+        with self._write("write_learning_report"):
             self._conn.execute(
                 "INSERT INTO learning_reports(report_id, agent_id, content_json, created_at) VALUES(?,?,?,?)",
                 (report.report_id, report.agent_id, Serializer.to_json(report.__dict__), int(report.created_at)),
             )
-            self._conn.commit()
+            self._commit()
         return True
 
     def list_learning_reports(self, agent_id: str = "", limit: int = 50) -> List[Dict[str, Any]]:
@@ -728,101 +995,107 @@ class StateDB:
             params.append(agent_id)
         sql = f"SELECT report_id, agent_id, content_json, created_at FROM learning_reports {where} ORDER BY created_at DESC LIMIT ?"
         params.append(int(limit))
-        with self._lock:
-            rows = self._conn.execute(sql, tuple(params)).fetchall()
-        items = [{"report_id": str(r["report_id"]), "agent_id": str(r["agent_id"]), "content": Serializer.from_json(str(r["content_json"])), "created_at": int(r["created_at"])} for r in rows]
-        return [_flatten_learning_content(it) for it in items]
+        with self._read("list_learning_reports") as conn:
+            rows = conn.execute(sql, tuple(params)).fetchall()
+        return [_learning_report_from_row(r) for r in rows]
 
     def get_event_offset(self, subscriber_id: str, topic: str) -> int:
-        with self._lock:
-            row = self._conn.execute("SELECT offset FROM event_offsets WHERE subscriber_id=? AND topic=?", (subscriber_id, topic)).fetchone()
+        with self._read("get_event_offset") as conn:
+            row = conn.execute("SELECT offset FROM event_offsets WHERE subscriber_id=? AND topic=?", (subscriber_id, topic)).fetchone()
         if not row:
             return 0
         return int(row["offset"])
 
+    def list_event_offsets(self) -> List[Dict[str, Any]]:
+        with self._read("list_event_offsets") as conn:
+            rows = conn.execute("SELECT subscriber_id, topic, offset, updated_at FROM event_offsets ORDER BY subscriber_id, topic").fetchall()
+        return [{"subscriber_id": str(r["subscriber_id"]), "topic": str(r["topic"]), "offset": int(r["offset"]), "updated_at": int(r["updated_at"])} for r in rows]
+
     def set_event_offset(self, subscriber_id: str, topic: str, offset: int) -> bool:
         now = now_unix()
-        with self._lock:
+        with self._write("set_event_offset"):
             self._conn.execute(
                 "INSERT INTO event_offsets(subscriber_id, topic, offset, updated_at) VALUES(?,?,?,?) "
                 "ON CONFLICT(subscriber_id, topic) DO UPDATE SET offset=excluded.offset, updated_at=excluded.updated_at",
                 (subscriber_id, topic, int(offset), int(now)),
             )
-            self._conn.commit()
+            self._commit()
         return True
 
     def add_evidence(self, trace_id: str, evidence_type: str, content: Dict[str, Any], content_hash: str) -> str:
         evidence_id = f"ev-{uuid.uuid4().hex}"
         created_at = now_unix()
-        with self._lock:
+        with self._write("add_evidence"):
             self._conn.execute(
                 "INSERT INTO evidence(evidence_id, trace_id, type, content, hash, created_at) VALUES(?,?,?,?,?,?)",
                 (evidence_id, trace_id, str(evidence_type), Serializer.to_json(content), str(content_hash), int(created_at)),
             )
-            self._conn.commit()
+            self._commit()
         return evidence_id
 
-    def list_evidence(self, trace_id: str, limit: int = 100) -> List[Dict[str, Any]]:
-        with self._lock:
-            rows = self._conn.execute(
-                "SELECT evidence_id, trace_id, type, content, hash, created_at FROM evidence WHERE trace_id = ? ORDER BY created_at DESC LIMIT ?",
-                (trace_id, int(limit)),
-            ).fetchall()
-        out: List[Dict[str, Any]] = []
-        for r in rows:
-            out.append(
-                {
-                    "evidence_id": str(r["evidence_id"]),
-                    "trace_id": str(r["trace_id"]),
-                    "type": str(r["type"]),
-                    "content": Serializer.from_json(str(r["content"])),
-                    "hash": str(r["hash"]),
-                    "created_at": int(r["created_at"]),
-                }
-            )
-        return out
+    def list_evidence(self, trace_id: str, limit: int = 100, include_archive: bool = False) -> List[Dict[str, Any]]:
+        rows = self._select(
+            "list_evidence",
+            "SELECT evidence_id, trace_id, type, content, hash, created_at FROM {db}evidence WHERE trace_id = ? ORDER BY created_at DESC LIMIT ?",
+            (trace_id, int(limit)),
+            include_archive,
+            order=lambda r: int(r["created_at"]),
+            descending=True,
+            limit=int(limit),
+        )
+        return [_evidence_from_row(r) for r in rows]
 
     def add_audit_log(self, trace_id: str, actor: str, action: str, resource: str, result: Dict[str, Any], timestamp: Optional[int] = None) -> str:
         audit_id = f"au-{uuid.uuid4().hex}"
         ts = int(timestamp if timestamp is not None else now_unix())
-        with self._lock:
+        with self._write("add_audit_log"):
             self._conn.execute(
                 "INSERT INTO audit_logs(audit_id, trace_id, actor, action, resource, result, timestamp) VALUES(?,?,?,?,?,?,?)",
                 (audit_id, trace_id, str(actor), str(action), str(resource), Serializer.to_json(result), int(ts)),
             )
-            self._conn.commit()
+            self._commit()
         return audit_id
 
-    def list_audit_logs(self, trace_id: str = "", limit: int = 200) -> List[Dict[str, Any]]:
-        with self._lock:
-            if trace_id:
-                rows = self._conn.execute(
-                    "SELECT audit_id, trace_id, actor, action, resource, result, timestamp FROM audit_logs WHERE trace_id = ? ORDER BY timestamp DESC LIMIT ?",
-                    (trace_id, int(limit)),
-                ).fetchall()
-            else:
-                rows = self._conn.execute(
-                    "SELECT audit_id, trace_id, actor, action, resource, result, timestamp FROM audit_logs ORDER BY timestamp DESC LIMIT ?",
-                    (int(limit),),
-                ).fetchall()
-        out: List[Dict[str, Any]] = []
-        for r in rows:
-            out.append(
-                {
-                    "audit_id": str(r["audit_id"]),
-                    "trace_id": str(r["trace_id"]),
-                    "actor": str(r["actor"]),
-                    "action": str(r["action"]),
-                    "resource": str(r["resource"]),
-                    "result": Serializer.from_json(str(r["result"])),
-                    "timestamp": int(r["timestamp"]),
-                }
+    def add_audit_logs(self, rows: List[Dict[str, Any]]) -> int:
+        params = [
+            (
+                str(r.get("audit_id") or f"au-{uuid.uuid4().hex}"),
+                str(r.get("trace_id", "")),
+                str(r.get("actor", "")),
+                str(r.get("action", "")),
+                str(r.get("resource", "")),
+                Serializer.to_json(r.get("result") or {}),
+                int(r.get("timestamp") or now_unix()),
             )
-        return out
+            for r in rows
+        ]
+        if not params:
+            return 0
+        with self._write("add_audit_logs"):
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO audit_logs(audit_id, trace_id, actor, action, resource, result, timestamp) VALUES(?,?,?,?,?,?,?)",
+                params,
+            )
+            self._commit()
+        return len(params)
+
+    def list_audit_logs(self, trace_id: str = "", limit: int = 200, include_archive: bool = False) -> List[Dict[str, Any]]:
+        where = "WHERE trace_id = ?" if trace_id else ""
+        params: Tuple[Any, ...] = (trace_id, int(limit)) if trace_id else (int(limit),)
+        rows = self._select(
+            "list_audit_logs",
+            f"SELECT audit_id, trace_id, actor, action, resource, result, timestamp FROM {{db}}audit_logs {where} ORDER BY timestamp DESC LIMIT ?",
+            params,
+            include_archive,
+            order=lambda r: int(r["timestamp"]),
+            descending=True,
+            limit=int(limit),
+        )
+        return [_audit_log_from_row(r) for r in rows]
 
     def list_workflows(self, limit: int = 50) -> List[Dict[str, Any]]:
-        with self._lock:
-            rows = self._conn.execute(
+        with self._read("list_workflows") as conn:
+            rows = conn.execute(
                 "SELECT workflow_id, version, created_at FROM workflows ORDER BY created_at DESC LIMIT ?",
                 (int(limit),),
             ).fetchall()
@@ -832,11 +1105,219 @@ class StateDB:
         mem_id = memory_id or f"mem-{uuid.uuid4().hex}"
         updated_at = now_unix()
         payload_keywords = Serializer.to_json(list(keywords))
-        with self._lock:
+        with self._write("upsert_memory_unit"):
             self._conn.execute(
                 "INSERT INTO memory_units(memory_id, content, keywords, category, scope, confidence, updated_at) VALUES(?,?,?,?,?,?,?) "
                 "ON CONFLICT(memory_id) DO UPDATE SET content=excluded.content, keywords=excluded.keywords, category=excluded.category, scope=excluded.scope, confidence=excluded.confidence, updated_at=excluded.updated_at",
                 (mem_id, str(content), payload_keywords, str(category), str(scope), float(confidence), int(updated_at)),
             )
-            self._conn.commit()
+            self._commit()
         return mem_id
+
+    def current_seq(self) -> int:
+        with self._read("current_seq") as conn:
+            row = conn.execute("SELECT MAX(seq) AS seq FROM change_log").fetchone()
+        return int(row["seq"] or 0) if row else 0
+
+    def changes_since(self, seq: int, tables: Optional[List[str]] = None, limit: int = 500) -> List[Dict[str, Any]]:
+        where = "WHERE seq > ?"
+        params: List[Any] = [int(seq)]
+        wanted = [str(t) for t in (tables or []) if str(t) in CHANGE_TABLES]
+        if tables and not wanted:
+            return []
+        if wanted:
+            where += " AND tbl IN (" + ",".join(["?"] * len(wanted)) + ")"
+            params.extend(wanted)
+        params.append(int(limit))
+        with self._read("changes_since") as conn:
+            rows = conn.execute(f"SELECT seq, tbl, row_key, op, changed_at FROM change_log {where} ORDER BY seq ASC LIMIT ?", tuple(params)).fetchall()
+        return [{"seq": int(r["seq"]), "table": str(r["tbl"]), "key": str(r["row_key"]), "op": str(r["op"]), "changed_at": int(r["changed_at"])} for r in rows]
+
+    def get_counters(self) -> Dict[str, Any]:
+        with self._read("get_counters") as conn:
+            rows = conn.execute("SELECT name, value FROM counters").fetchall()
+        hot = [(str(r["name"]), int(r["value"])) for r in rows if not str(r["name"]).startswith(ARCHIVED_PREFIX)]
+        archived = [(str(r["name"])[len(ARCHIVED_PREFIX):], int(r["value"])) for r in rows if str(r["name"]).startswith(ARCHIVED_PREFIX)]
+        out = _counter_sections(hot)
+        out["pending_approvals"] = int(out["approvals"].get(ApprovalStatus.PENDING.value, 0))
+        out["archived"] = _counter_sections(archived)
+        return out
+
+    def iter_audit_logs(self, trace_id: str = "", since: int = 0, until: int = 0, after: Optional[Tuple[int, str]] = None, page_size: int = 500, include_archive: bool = False) -> Iterator[Dict[str, Any]]:
+        filters = [("trace_id = ?", trace_id)] if trace_id else []
+        return self._iter_keyset("iter_audit_logs", "SELECT audit_id, trace_id, actor, action, resource, result, timestamp FROM {db}audit_logs", "timestamp", "audit_id", filters, since, until, after, page_size, _audit_log_from_row, include_archive)
+
+    def iter_evidence(self, trace_id: str = "", since: int = 0, until: int = 0, after: Optional[Tuple[int, str]] = None, page_size: int = 500, include_archive: bool = False) -> Iterator[Dict[str, Any]]:
+        filters = [("trace_id = ?", trace_id)] if trace_id else []
+        return self._iter_keyset("iter_evidence", "SELECT evidence_id, trace_id, type, content, hash, created_at FROM {db}evidence", "created_at", "evidence_id", filters, since, until, after, page_size, _evidence_from_row, include_archive)
+
+    def iter_work_items(self, status: str = "", since: int = 0, until: int = 0, after: Optional[Tuple[int, str]] = None, page_size: int = 500, include_archive: bool = False) -> Iterator[Dict[str, Any]]:
+        filters = [("status = ?", status)] if status else []
+        return self._iter_keyset("iter_work_items", "SELECT * FROM {db}work_items", "created_at", "task_id", filters, since, until, after, page_size, _work_item_dict_from_row, include_archive)
+
+    def iter_approvals(self, status: str = "", since: int = 0, until: int = 0, after: Optional[Tuple[int, str]] = None, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        filters = [("status = ?", status)] if status else []
+        return self._iter_keyset("iter_approvals", "SELECT * FROM {db}approvals", "created_at", "approval_id", filters, since, until, after, page_size, _approval_from_row)
+
+    def iter_learning_reports(self, agent_id: str = "", since: int = 0, until: int = 0, after: Optional[Tuple[int, str]] = None, page_size: int = 500) -> Iterator[Dict[str, Any]]:
+        filters = [("agent_id = ?", agent_id)] if agent_id else []
+        return self._iter_keyset("iter_learning_reports", "SELECT report_id, agent_id, content_json, created_at FROM {db}learning_reports", "created_at", "report_id", filters, since, until, after, page_size, _learning_report_from_row)
+
+    def _iter_keyset(
+        self,
+        method: str,
+        select_sql: str,
+        ts_col: str,
+        id_col: str,
+        filters: List[Tuple[str, Any]],
+        since: int,
+        until: int,
+        after: Optional[Tuple[int, str]],
+        page_size: int,
+        decode,
+        include_archive: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        size = max(1, min(int(page_size), _MAX_PAGE_SIZE))
+        clauses = [c for c, _ in filters]
+        base_params: List[Any] = [v for _, v in filters]
+        if since:
+            clauses.append(f"{ts_col} >= ?")
+            base_params.append(int(since))
+        if until:
+            clauses.append(f"{ts_col} < ?")
+            base_params.append(int(until))
+        position = (int(after[0]), str(after[1])) if after else None
+        while True:
+            where = list(clauses)
+            params = list(base_params)
+            if position is not None:
+                where.append(f"({ts_col}, {id_col}) > (?, ?)")
+                params.extend(position)
+            where_sql = ("WHERE " + " AND ".join(where)) if where else ""
+            params.append(size)
+            rows = self._select(
+                method,
+                f"{select_sql} {where_sql} ORDER BY {ts_col} ASC, {id_col} ASC LIMIT ?",
+                tuple(params),
+                include_archive,
+                order=lambda r: (int(r[ts_col]), str(r[id_col])),
+                limit=size,
+            )
+            for r in rows:
+                yield decode(r)
+            if len(rows) < size:
+                return
+            position = (int(rows[-1][ts_col]), str(rows[-1][id_col]))
+
+    def list_archives(self) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        prefix = f"{self._path.stem}-"
+        for path in self._archive_paths():
+            out.append({"path": str(path), "month": path.stem[len(prefix):], "size_bytes": int(path.stat().st_size)})
+        return out
+
+    def archive_rows(self, table: str, before: int, batch_size: int = 500, max_rows: int = 0) -> Dict[str, int]:
+        if table not in ARCHIVE_TABLES:
+            raise ValueError("invalid_table")
+        ts_expr, where = ARCHIVE_TABLES[table]
+        with self._read("archive_rows") as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT strftime('%Y-%m', {ts_expr}, 'unixepoch') AS month FROM {table} WHERE {where} AND {ts_expr} < ? ORDER BY month ASC",
+                (int(before),),
+            ).fetchall()
+        size = max(1, int(batch_size))
+        budget = int(max_rows) if max_rows > 0 else -1
+        select = f"SELECT rowid FROM main.{table} WHERE {where} AND {ts_expr} >= ? AND {ts_expr} < ? ORDER BY rowid LIMIT ?"
+        moved: Dict[str, int] = {}
+        for month in [str(r["month"]) for r in rows if r["month"]]:
+            start, end = _month_bounds(month)
+            path = self._ensure_archive(month)
+            while budget != 0:
+                n_batch = size if budget < 0 else min(size, budget)
+                with self._write("archive_rows"):
+                    n = self._move_batch_locked(table, path, select, (start, min(end, int(before)), n_batch))
+                if n:
+                    moved[month] = moved.get(month, 0) + n
+                if budget > 0:
+                    budget -= n
+                if n < n_batch:
+                    break
+        return moved
+
+    def prune_change_log(self, before: int, batch_size: int = 5000) -> int:
+        pruned = 0
+        batch = max(1, int(batch_size))
+        while True:
+            with self._write("prune_change_log"):
+                cur = self._conn.execute(
+                    "DELETE FROM change_log WHERE seq IN (SELECT seq FROM change_log WHERE changed_at < ? AND seq < (SELECT MAX(seq) FROM change_log) ORDER BY seq ASC LIMIT ?)",
+                    (int(before), batch),
+                )
+                self._commit()
+            pruned += int(cur.rowcount)
+            if cur.rowcount < batch:
+                return pruned
+
+    def get_vacuum_status(self) -> Dict[str, int]:
+        with self._read("get_vacuum_status") as conn:
+            out = {name: int(conn.execute(f"PRAGMA {name}").fetchone()[0]) for name in ("auto_vacuum", "page_size", "page_count", "freelist_count")}
+        return out
+
+    def incremental_vacuum(self, max_pages: int = 0) -> int:
+        with self._write("incremental_vacuum"):
+            if int(self._conn.execute("PRAGMA auto_vacuum").fetchone()[0]) != 2:
+                return 0
+            self._flush_locked()
+            before = int(self._conn.execute("PRAGMA freelist_count").fetchone()[0])
+            self._conn.executescript(f"PRAGMA incremental_vacuum({max(0, int(max_pages))});")
+            after = int(self._conn.execute("PRAGMA freelist_count").fetchone()[0])
+        return before - after
+
+    def enable_incremental_vacuum(self) -> bool:
+        with self._write("enable_incremental_vacuum"):
+            if int(self._conn.execute("PRAGMA auto_vacuum").fetchone()[0]) == 2:
+                return False
+            if self._tx_depth() > 0:
+                raise RuntimeError("vacuum_in_transaction")
+            self._flush_locked()
+            self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self._conn.execute("VACUUM")
+        return True
+
+    def _archive_paths(self) -> List[Path]:
+        if not self._archive_dir.exists():
+            return []
+        return sorted(self._archive_dir.glob(f"{self._path.stem}-*.db"), reverse=True)
+
+    def _ensure_archive(self, month: str) -> Path:
+        self._archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self._archive_dir / f"{self._path.stem}-{month}.db"
+        conn = sqlite3.connect(str(path))
+        try:
+            for stmt in archive_ddl():
+                conn.execute(stmt)
+            conn.commit()
+        finally:
+            conn.close()
+        return path
+
+    def _move_batch_locked(self, table: str, path: Path, select: str, params: Tuple[Any, ...]) -> int:
+        if self._tx_depth() > 0:
+            raise RuntimeError("archive_in_transaction")
+        self._flush_locked()
+        self._conn.execute("ATTACH DATABASE ? AS arc", (str(path),))
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(f"INSERT OR REPLACE INTO arc.{table} SELECT * FROM main.{table} WHERE rowid IN ({select})", params)
+                # The guard moves the deleted rows' counts to archived:* instead of dropping them.
+                self._conn.execute("INSERT OR IGNORE INTO main.trigger_guards(name) VALUES(?)", (ARCHIVE_GUARD,))
+                cur = self._conn.execute(f"DELETE FROM main.{table} WHERE rowid IN ({select})", params)
+                self._conn.execute("DELETE FROM main.trigger_guards WHERE name = ?", (ARCHIVE_GUARD,))
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            return int(cur.rowcount)
+        finally:
+            self._conn.execute("DETACH DATABASE arc")
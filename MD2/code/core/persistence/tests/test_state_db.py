@@ -0,0 +1,215 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+code_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.persistence import DbConfig, StateDB
+
+
+class _DbCase(unittest.TestCase):
+    config = {}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "state.db")
+        self.db = StateDB(DbConfig(path=self.path, **self.config))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def _visible(self, task_id):
+        # A separate connection only sees committed rows.
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute("SELECT 1 FROM work_items WHERE task_id = ?", (task_id,)).fetchone() is not None
+        finally:
+            conn.close()
+
+
+class TestTransactions(_DbCase):
+    def test_nested_transaction_commits_at_outermost_exit(self):
+        with self.db.transaction():
+            self.db.enqueue_work_item(task_id="a", priority=1, payload={})
+            with self.db.transaction():
+                self.db.enqueue_work_item(task_id="b", priority=1, payload={})
+            self.assertFalse(self._visible("b"))
+        self.assertTrue(self._visible("a"))
+        self.assertTrue(self._visible("b"))
+
+    def test_error_in_nested_transaction_rolls_back_everything(self):
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.enqueue_work_item(task_id="a", priority=1, payload={})
+                with self.db.transaction():
+                    self.db.enqueue_work_item(task_id="b", priority=1, payload={})
+                    raise RuntimeError("boom")
+        self.assertIsNone(self.db.get_work_item("a"))
+        self.assertIsNone(self.db.get_work_item("b"))
+        self.db.enqueue_work_item(task_id="c", priority=1, payload={})
+        self.assertTrue(self._visible("c"))
+
+
+class TestGroupCommit(_DbCase):
+    config = {"group_commit_window_ms": 100.0}
+
+    def test_followers_return_only_after_the_leader_commits(self):
+        n = 8
+        errors = []
+        barrier = threading.Barrier(n)
+
+        def _enqueue(i):
+            try:
+                barrier.wait()
+                self.db.enqueue_work_item(task_id=f"t{i}", priority=1, payload={})
+                if not self._visible(f"t{i}"):
+                    errors.append(f"t{i}")
+            except Exception as e:
+                errors.append(repr(e))
+
+        threads = [threading.Thread(target=_enqueue, args=(i,)) for i in range(n)]
+        t0 = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - t0
+        self.assertEqual(errors, [])
+        # One commit per window rather than one per writer.
+        self.assertLess(elapsed, n * 0.1 / 2)
+        self.assertEqual(len(self.db.list_work_items(limit=100)), n)
+
+    def test_transaction_flushes_pending_group_writes(self):
+        with self.db.transaction():
+            self.db.enqueue_work_item(task_id="a", priority=1, payload={})
+        self.assertTrue(self._visible("a"))
+
+
+class TestClaims(_DbCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(6):
+            self.db.enqueue_work_item(task_id=f"t{i}", priority=i % 3, payload={"i": i})
+
+    def test_batched_claim_takes_highest_priority_first(self):
+        items = self.db.claim_work_items(agent_id="a1", n=3, max_priority=10, lease_ttl_sec=30)
+        self.assertEqual([w.priority for w in items], [2, 2, 1])
+        self.assertTrue(all(w.lease_owner == "a1" for w in items))
+        rest = self.db.claim_work_items(agent_id="a2", n=10)
+        self.assertEqual(len(rest), 3)
+        self.assertEqual(set(w.task_id for w in items) & set(w.task_id for w in rest), set())
+        self.assertEqual(self.db.claim_work_items(agent_id="a3", n=1), [])
+
+    def test_max_priority_limits_claims(self):
+        items = self.db.claim_work_items(agent_id="a1", n=10, max_priority=0)
+        self.assertEqual(sorted(w.task_id for w in items), ["t0", "t3"])
+
+    def test_renew_leases_only_for_owned_items(self):
+        mine = [w.task_id for w in self.db.claim_work_items(agent_id="a1", n=2, lease_ttl_sec=5)]
+        other = [w.task_id for w in self.db.claim_work_items(agent_id="a2", n=1)]
+        renewed = self.db.renew_leases("a1", mine + other + ["missing"], ttl=600)
+        self.assertEqual(sorted(renewed), sorted(mine))
+        for task_id in mine:
+            self.assertGreater(self.db.get_work_item(task_id).lease_expires_at, time.time() + 300)
+
+    def test_expired_leases_are_reclaimed(self):
+        claimed = self.db.claim_work_items(agent_id="a1", n=2, lease_ttl_sec=5)
+        self.assertEqual(self.db.reclaim_expired_leases(now=int(time.time()) + 10), 2)
+        for w in claimed:
+            self.assertEqual(self.db.get_work_item_status(w.task_id).value, "created")
+        self.assertEqual(self.db.renew_leases("a1", [w.task_id for w in claimed]), [])
+
+
+class TestTriggers(_DbCase):
+    def test_change_log_records_each_write(self):
+        seq = self.db.current_seq()
+        self.db.enqueue_work_item(task_id="a", priority=1, payload={})
+        self.db.claim_work_items(agent_id="a1", n=1)
+        changes = self.db.changes_since(seq)
+        self.assertEqual([(c["table"], c["op"]) for c in changes], [("work_items", "insert"), ("work_items", "update")])
+        self.assertEqual(self.db.current_seq(), changes[-1]["seq"])
+        self.assertEqual(self.db.changes_since(seq, tables=["runs"]), [])
+
+    def test_counters_follow_status_changes(self):
+        for i in range(3):
+            self.db.enqueue_work_item(task_id=f"t{i}", priority=1, payload={})
+        self.db.claim_work_items(agent_id="a1", n=2)
+        counters = self.db.get_counters()["work_items"]
+        self.assertEqual(counters["by_status"], {"created": 1, "claimed": 2})
+        self.assertEqual(counters["by_status_priority"]["claimed"], {"1": 2})
+
+    def _ack(self, task_id):
+        self.db.enqueue_work_item(task_id=task_id, priority=1, payload={})
+        self.db.claim_work_items(agent_id="a1", n=1)
+        self.db.mark_work_item_running(task_id, "a1")
+        self.db.ack_work_item(task_id, "a1", True)
+
+    def test_archive_moves_counts_to_archived_section(self):
+        self._ack("a")
+        self._ack("b")
+        self.db.enqueue_work_item(task_id="c", priority=1, payload={})
+        self.assertEqual(self.db.get_counters()["work_items"]["by_status"], {"acked": 2, "created": 1})
+        moved = self.db.archive_rows("work_items", before=int(time.time()) + 1)
+        self.assertEqual(sum(moved.values()), 2)
+        self.assertIsNone(self.db.get_work_item("a"))
+        counters = self.db.get_counters()
+        self.assertEqual(counters["work_items"]["by_status"], {"created": 1})
+        self.assertEqual(counters["archived"]["work_items"]["by_status"], {"acked": 2})
+        conn = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM trigger_guards").fetchone()[0], 0)
+        finally:
+            conn.close()
+
+    def test_upgrade_splits_lifetime_counters(self):
+        self._ack("a")
+        self.db.close()
+        # Rebuild the pre-V10 state: archived rows still counted under the hot key.
+        conn = sqlite3.connect(self.path)
+        conn.execute("DROP TRIGGER trg_work_items_cnt_archive")
+        conn.execute("UPDATE counters SET value = 3 WHERE name = 'work_items:acked:1'")
+        conn.execute("DELETE FROM schema_migrations WHERE version = 10")
+        conn.commit()
+        conn.close()
+
+        self.db = StateDB(DbConfig(path=self.path))
+        counters = self.db.get_counters()
+        self.assertEqual(counters["work_items"]["by_status"], {"acked": 1})
+        self.assertEqual(counters["archived"]["work_items"]["by_status"], {"acked": 2})
+        self.db.archive_rows("work_items", before=int(time.time()) + 1)
+        self.assertEqual(self.db.get_counters()["archived"]["work_items"]["by_status"], {"acked": 3})
+
+
+class TestArchive(_DbCase):
+    def test_archived_rows_are_read_back_with_include_archive(self):
+        old = int(time.time()) - 90 * 86400
+        self.db.add_audit_log("tr-1", "u", "read", "doc", {"ok": True}, timestamp=old)
+        self.db.add_audit_log("tr-1", "u", "write", "doc", {"ok": True})
+        moved = self.db.archive_rows("audit_logs", before=int(time.time()) - 86400)
+        self.assertEqual(sum(moved.values()), 1)
+        self.assertEqual(len(self.db.list_archives()), 1)
+
+        hot = self.db.list_audit_logs(trace_id="tr-1")
+        self.assertEqual([r["action"] for r in hot], ["write"])
+        both = self.db.list_audit_logs(trace_id="tr-1", include_archive=True)
+        self.assertEqual(sorted(r["action"] for r in both), ["read", "write"])
+        exported = list(self.db.iter_audit_logs(trace_id="tr-1", include_archive=True))
+        self.assertEqual([r["action"] for r in exported], ["read", "write"])
+
+    def test_archive_is_idempotent(self):
+        self.db.add_audit_log("tr-1", "u", "read", "doc", {}, timestamp=int(time.time()) - 90 * 86400)
+        before = int(time.time()) - 86400
+        self.assertEqual(sum(self.db.archive_rows("audit_logs", before=before).values()), 1)
+        self.assertEqual(self.db.archive_rows("audit_logs", before=before), {})
+        self.assertEqual(len(self.db.list_audit_logs(trace_id="tr-1", include_archive=True)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
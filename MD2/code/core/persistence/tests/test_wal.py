@@ -0,0 +1,166 @@
+import os
+import sys
+import tempfile
+import unittest
+
+code_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.persistence import DbConfig, JsonlWAL, StateDB, WalCompactionPolicy, WalCompactor
+from core.persistence.wal_format import FRAME_RECORD, encode_frame, read_frame
+
+
+class _WalCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.wal_path = os.path.join(self.tmp.name, "wal", "events.jsonl")
+        self.wals = []
+
+    def tearDown(self):
+        for wal in self.wals:
+            wal.close()
+        self.tmp.cleanup()
+
+    def _open(self, **kwargs):
+        wal = JsonlWAL(self.wal_path, **kwargs)
+        self.wals.append(wal)
+        return wal
+
+    def _seg_path(self, seg):
+        return os.path.join(os.path.dirname(self.wal_path), seg["name"])
+
+
+class TestSegments(_WalCase):
+    def test_segments_rotate_and_seal_by_size(self):
+        wal = self._open(segment_max_bytes=1024)
+        for i in range(60):
+            wal.append("t", {"i": i, "pad": "x" * 40})
+        segs = wal.segments()
+        self.assertGreater(len(segs), 2)
+        self.assertTrue(all(s["sealed"] for s in segs[:-1]))
+        self.assertFalse(segs[-1]["sealed"])
+        for prev, cur in zip(segs, segs[1:]):
+            self.assertEqual(cur["first_seq"], prev["last_seq"] + 1)
+        self.assertEqual([r.data["i"] for r in wal.iter_records()], list(range(60)))
+        self.assertEqual([seq for seq, _ in wal.iter_entries(start=41)], list(range(41, 60)))
+
+    def test_reopen_continues_sequence(self):
+        wal = self._open(segment_max_bytes=1024)
+        for i in range(30):
+            wal.append("t", {"i": i})
+        wal.close()
+        wal = self._open(segment_max_bytes=1024)
+        self.assertEqual(wal.next_seq, 30)
+        self.assertEqual(wal.append_record("t", {"i": 30}), 30)
+
+    def test_torn_tail_is_truncated_on_open(self):
+        wal = self._open()
+        for i in range(3):
+            wal.append("t", {"i": i})
+        seg = wal.segments()[-1]
+        wal.close()
+        size = os.path.getsize(self._seg_path(seg))
+        with open(self._seg_path(seg), "ab") as fh:
+            fh.write(b'{"seq": 3, "ts": "2')
+
+        wal = self._open()
+        self.assertEqual(wal.next_seq, 3)
+        self.assertEqual(os.path.getsize(self._seg_path(seg)), size)
+        wal.append("t", {"i": 3})
+        self.assertEqual([r.data["i"] for r in wal.iter_records()], [0, 1, 2, 3])
+
+
+class TestBinaryFormat(_WalCase):
+    def test_frame_crc_detects_corruption(self):
+        frame = bytearray(encode_frame(FRAME_RECORD, 7, 123, b"t", b'{"i":1}'))
+        parsed = read_frame(frame, 0)
+        self.assertTrue(parsed.valid)
+        self.assertEqual((parsed.seq, parsed.ts_us, parsed.type), (7, 123, "t"))
+        self.assertEqual(bytes(frame[parsed.payload_start:parsed.payload_end]), b'{"i":1}')
+        frame[-2] ^= 0xFF
+        self.assertFalse(read_frame(frame, 0).valid)
+        self.assertIsNone(read_frame(frame[:-1], 0))
+
+    def test_binary_round_trip_and_corrupt_record_is_skipped(self):
+        wal = self._open(format="binary")
+        for i in range(5):
+            wal.append("t", {"i": i})
+        wal.roll()
+        wal.append("t", {"i": 5})
+        segs = wal.segments()
+        self.assertTrue(segs[0]["name"].endswith(".wal"))
+        self.assertEqual([r.data["i"] for r in wal.iter_records()], list(range(6)))
+        wal.close()
+
+        path = self._seg_path(segs[0])
+        with open(path, "rb") as fh:
+            raw = bytearray(fh.read())
+        second = read_frame(raw, read_frame(raw, 0).size)
+        raw[second.payload_start] ^= 0xFF
+        with open(path, "wb") as fh:
+            fh.write(raw)
+
+        wal = self._open(format="binary")
+        self.assertEqual([r.data["i"] for r in wal.iter_records()], [0, 2, 3, 4, 5])
+        self.assertEqual(wal.corrupt_records, 1)
+
+    def test_convert_sealed_segments_keeps_records(self):
+        wal = self._open(segment_max_bytes=1024)
+        for i in range(40):
+            wal.append("t", {"i": i, "pad": "x" * 40})
+        before = wal.segments()
+        converted = wal.convert("binary")
+        after = wal.segments()
+        self.assertEqual(converted, len(before) - 1)
+        self.assertTrue(all(s["name"].endswith(".wal") for s in after[:-1]))
+        self.assertTrue(after[-1]["name"].endswith(".jsonl"))
+        self.assertEqual([(s["first_seq"], s["last_seq"]) for s in after], [(s["first_seq"], s["last_seq"]) for s in before])
+        self.assertEqual([r.data["i"] for r in wal.iter_records()], list(range(40)))
+        self.assertEqual([seq for seq, _ in wal.iter_entries(start=25)], list(range(25, 40)))
+        self.assertEqual(wal.convert("binary"), 0)
+
+
+class TestCompaction(_WalCase):
+    def setUp(self):
+        super().setUp()
+        self.db = StateDB(DbConfig(path=os.path.join(self.tmp.name, "state.db")))
+
+    def tearDown(self):
+        self.db.close()
+        super().tearDown()
+
+    def test_superseded_ticks_are_compacted(self):
+        wal = self._open(segment_max_bytes=1024)
+        for i in range(40):
+            wal.append("scheduler_tick", {"component": "scheduler", "i": i})
+            wal.append("runner_task_done", {"i": i})
+        compactor = WalCompactor(wal, self.db, WalCompactionPolicy(interval_sec=0))
+        health = compactor.run_once()
+        self.assertGreater(health.segments_compacted, 0)
+        self.assertLess(health.bytes_after, health.bytes_before)
+
+        records = list(wal.iter_entries())
+        self.assertEqual([r.data["i"] for _, r in records if r.type == "runner_task_done"], list(range(40)))
+        ticks = [r.data["i"] for _, r in records if r.type == "scheduler_tick"]
+        self.assertIn(39, ticks)
+        self.assertLess(len(ticks), 40)
+        seqs = [seq for seq, _ in records]
+        self.assertEqual(seqs, sorted(seqs))
+
+    def test_segments_behind_every_subscriber_are_dropped(self):
+        wal = self._open(segment_max_bytes=1024)
+        for i in range(40):
+            wal.append("runner_task_done", {"i": i, "pad": "x" * 40})
+        self.db.set_event_offset(subscriber_id="s", topic="t", offset=30)
+        health = WalCompactor(wal, self.db, WalCompactionPolicy(interval_sec=0)).run_once()
+        self.assertEqual(health.min_offset, 30)
+        self.assertGreater(health.segments_dropped, 0)
+        first = wal.segments()[0]["first_seq"]
+        self.assertGreater(first, 0)
+        self.assertLessEqual(first, 30)
+        self.assertEqual([r.data["i"] for r in wal.iter_records()], list(range(first, 40)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+code_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.persistence import DbConfig, RetentionEngine, RetentionPolicy, ShardConfig, ShardedWorkQueue, StateDB
+
+
+class TestShardedWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = ShardedWorkQueue(ShardConfig(root_dir=os.path.join(self.tmp.name, "shards"), shards=4))
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp.cleanup()
+
+    def _fill(self, n=20):
+        for i in range(n):
+            self.queue.enqueue_work_item(task_id=f"t{i:02d}", priority=i % 3, payload={"i": i})
+
+    def test_items_spread_over_shards(self):
+        self._fill()
+        used = {self.queue.shard_index(f"t{i:02d}") for i in range(20)}
+        self.assertGreater(len(used), 1)
+
+    def test_counters_aggregate_all_shards(self):
+        self._fill()
+        claimed = self.queue.claim_work_items(agent_id="a1", n=5)
+        self.assertEqual(len(claimed), 5)
+        by_status = self.queue.get_counters()["work_items"]["by_status"]
+        self.assertEqual(by_status.get("created"), 15)
+        self.assertEqual(by_status.get("claimed"), 5)
+
+    def test_iter_merges_shards_in_keyset_order(self):
+        self._fill()
+        items = list(self.queue.iter_work_items(page_size=3))
+        self.assertEqual(len(items), 20)
+        keys = [(int(it["created_at"]), it["task_id"]) for it in items]
+        self.assertEqual(keys, sorted(keys))
+        rest = list(self.queue.iter_work_items(after=keys[9], page_size=3))
+        self.assertEqual([it["task_id"] for it in rest], [k[1] for k in keys[10:]])
+
+    def test_custom_idempotency_key_is_unique_across_shards(self):
+        first, second = "a", "b"
+        while self.queue.shard_index(first) == self.queue.shard_index(second):
+            second += "b"
+        self.queue.enqueue_work_item(task_id=first, priority=1, payload={}, idempotency_key="k1")
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.queue.enqueue_work_item(task_id=second, priority=1, payload={}, idempotency_key="k1")
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.queue.enqueue_work_item(task_id=first, priority=1, payload={})
+        self.assertIsNone(self.queue.get_work_item(second))
+
+    def test_tenant_sharding_rejects_task_id_on_another_shard(self):
+        queue = ShardedWorkQueue(ShardConfig(root_dir=os.path.join(self.tmp.name, "tenant"), shards=4, shard_by="tenant"))
+        try:
+            tenants = ["x", "y"]
+            while queue.shard_index("", tenants[0]) == queue.shard_index("", tenants[1]):
+                tenants[1] += "y"
+            queue.enqueue_work_item(task_id="t1", priority=1, payload={}, tenant_id=tenants[0])
+            with self.assertRaises(sqlite3.IntegrityError):
+                queue.enqueue_work_item(task_id="t1", priority=1, payload={}, tenant_id=tenants[1])
+        finally:
+            queue.close()
+
+    def test_current_seq_moves_on_any_shard_change(self):
+        seq = self.queue.current_seq()
+        self._fill(3)
+        self.assertGreater(self.queue.current_seq(), seq)
+        seq = self.queue.current_seq()
+        self.assertEqual(self.queue.current_seq(), seq)
+        self.queue.claim_work_items(agent_id="a1", n=1)
+        self.assertGreater(self.queue.current_seq(), seq)
+
+    def test_retention_archives_shard_rows(self):
+        self._fill(8)
+        for item in self.queue.claim_work_items(agent_id="a1", n=8):
+            self.assertTrue(self.queue.mark_work_item_running(item.task_id, "a1"))
+            self.assertTrue(self.queue.ack_work_item(item.task_id, "a1", True))
+        db = StateDB(DbConfig(path=os.path.join(self.tmp.name, "state.db")))
+        try:
+            engine = RetentionEngine(db, RetentionPolicy(max_age_sec=1, change_log_max_age_sec=0), shards=self.queue.shards)
+            health = engine.run_once(now=4102444800)
+            self.assertEqual(health.archived.get("work_items"), 8)
+            counters = self.queue.get_counters()
+            self.assertEqual(counters["work_items"]["by_status"], {})
+            self.assertEqual(counters["archived"]["work_items"]["by_status"], {"acked": 8})
+            self.assertEqual(self.queue.list_work_items(limit=100), [])
+            self.assertEqual(len(list(self.queue.iter_work_items(include_archive=True))), 8)
+            self.assertIsNotNone(self.queue.get_work_item("t03", include_archive=True))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
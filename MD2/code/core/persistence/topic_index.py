@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+import bisect
+import json
+import os
+import threading
+
+from .jsonl_wal import JsonlWAL, WalRecord
+
+
+@dataclass
+class TopicCursor:
+    next_seq: int = 0
+    last_wal_seq: int = -1
+    sparse: List[Tuple[int, int]] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"next_seq": self.next_seq, "last_wal_seq": self.last_wal_seq, "sparse": [list(e) for e in self.sparse]}
+
+    @classmethod
+    def from_dict(cls, obj: Dict[str, Any]) -> "TopicCursor":
+        return cls(
+            next_seq=int(obj.get("next_seq", 0)),
+            last_wal_seq=int(obj.get("last_wal_seq", -1)),
+            sparse=[(int(t), int(w)) for t, w in obj.get("sparse") or []],
+        )
+
+
+class WalTopicIndex:
+    def __init__(self, wal: JsonlWAL, index_path: str = "", record_type: str = "event_bus.publish", interval: int = 64, wal_gap: int = 256):
+        self._wal = wal
+        self._type = str(record_type)
+        self._interval = max(1, int(interval))
+        self._wal_gap = max(1, int(wal_gap))
+        self._path = Path(index_path) if index_path else None
+        self._lock = threading.Lock()
+        self._topics: Dict[str, TopicCursor] = {}
+        self._scanned = 0
+        self._load()
+        self._catch_up()
+
+    def append(self, topic: str, data: Dict[str, Any]) -> int:
+        topic = str(topic)
+        # Other processes append to the same WAL: pick up their records and allocate
+        # the topic_seq while holding the WAL lock, so no two writers hand out the same one.
+        with self._lock, self._wal.exclusive():
+            dirty = self._refresh_locked()
+            cur = self._topics.setdefault(topic, TopicCursor())
+            topic_seq = cur.next_seq
+            wal_seq = self._wal.append_record(self._type, {**data, "topic": topic, "topic_seq": topic_seq})
+            dirty = self._note_locked(cur, topic_seq, wal_seq) or dirty
+            if dirty:
+                self._save_locked()
+        return topic_seq
+
+    def next_seq(self, topic: str) -> int:
+        with self._lock:
+            self._catch_up_locked()
+            cur = self._topics.get(str(topic))
+            return cur.next_seq if cur else 0
+
+    def topics(self) -> Dict[str, int]:
+        with self._lock:
+            self._catch_up_locked()
+            return {t: c.next_seq for t, c in self._topics.items()}
+
+    def wal_position(self, topic: str, topic_seq: int) -> int:
+        with self._lock:
+            self._catch_up_locked()
+            cur = self._topics.get(str(topic))
+            if cur is None:
+                return self._scanned
+            if int(topic_seq) >= cur.next_seq:
+                return cur.last_wal_seq + 1
+            return self._floor_locked(cur, int(topic_seq))
+
+    def iter_topic(self, topic: str, start: int = 0) -> Iterator[Tuple[int, WalRecord]]:
+        topic = str(topic)
+        start = int(start)
+        with self._lock:
+            self._catch_up_locked()
+            cur = self._topics.get(topic)
+            if cur is None or start >= cur.next_seq:
+                return iter(())
+            i = max(0, bisect.bisect_right(cur.sparse, (start, float("inf"))) - 1)
+            anchors = cur.sparse[i:] or [(0, 0)]
+            last = cur.next_seq - 1
+        return self._scan(topic, start, last, anchors)
+
+    def save(self) -> None:
+        with self._lock, self._wal.exclusive():
+            self._save_locked()
+
+    def _scan(self, topic: str, start: int, last: int, anchors: List[Tuple[int, int]]) -> Iterator[Tuple[int, WalRecord]]:
+        for j, (_, wal_seq) in enumerate(anchors):
+            upto = anchors[j + 1][0] - 1 if j + 1 < len(anchors) else last
+            if upto < start:
+                continue
+            entries = self._wal.iter_entries(start=wal_seq)
+            try:
+                for _, rec in entries:
+                    if rec.type != self._type or str(rec.data.get("topic")) != topic:
+                        continue
+                    topic_seq = int(rec.data.get("topic_seq", -1))
+                    if topic_seq >= start:
+                        yield topic_seq, rec
+                    if topic_seq >= upto:
+                        break
+            finally:
+                entries.close()
+
+    def _floor_locked(self, cur: TopicCursor, topic_seq: int) -> int:
+        i = bisect.bisect_right(cur.sparse, (topic_seq, float("inf"))) - 1
+        return cur.sparse[i][1] if i >= 0 else 0
+
+    def _note_locked(self, cur: TopicCursor, topic_seq: int, wal_seq: int) -> bool:
+        cur.next_seq = max(cur.next_seq, topic_seq + 1)
+        cur.last_wal_seq = max(cur.last_wal_seq, wal_seq)
+        self._scanned = max(self._scanned, wal_seq + 1)
+        if cur.sparse and topic_seq - cur.sparse[-1][0] < self._interval and wal_seq - cur.sparse[-1][1] < self._wal_gap:
+            return False
+        cur.sparse.append((topic_seq, wal_seq))
+        return True
+
+    def _catch_up(self) -> None:
+        with self._lock:
+            self._catch_up_locked()
+
+    def _catch_up_locked(self) -> None:
+        with self._wal.exclusive():
+            if self._refresh_locked():
+                self._save_locked()
+
+    def _refresh_locked(self) -> bool:
+        dirty = False
+        if self._wal.next_seq <= self._scanned:
+            return dirty
+        for wal_seq, rec in self._wal.iter_entries(start=self._scanned):
+            if rec.type != self._type or "topic_seq" not in rec.data:
+                continue
+            cur = self._topics.setdefault(str(rec.data.get("topic")), TopicCursor())
+            topic_seq = int(rec.data["topic_seq"])
+            dirty = self._note_locked(cur, topic_seq, wal_seq) or dirty
+        self._scanned = max(self._scanned, self._wal.next_seq)
+        return dirty
+
+    def _load(self) -> None:
+        if self._path is None or not self._path.exists():
+            return
+        try:
+            obj = json.loads(self._path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if int(obj.get("scanned", 0)) > self._wal.next_seq:
+            return
+        self._scanned = int(obj.get("scanned", 0))
+        self._topics = {str(t): TopicCursor.from_dict(c) for t, c in (obj.get("topics") or {}).items()}
+
+    def _save_locked(self) -> None:
+        if self._path is None:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"scanned": self._scanned, "topics": {t: c.to_dict() for t, c in self._topics.items()}}), encoding="utf-8")
+        os.replace(tmp, self._path)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import bisect
+
+from protocols.workflow import now_unix
+
+from .jsonl_wal import JsonlWAL, WalRecord
+from .state_db import StateDB
+from .topic_index import WalTopicIndex
+
+
+LATEST_ONLY_TYPES: Dict[str, str] = {
+    "scheduler_tick": "component",
+    "orchestrator_tick": "component",
+    "growth_loop_tick": "component",
+}
+
+
+@dataclass
+class WalCompactionPolicy:
+    interval_sec: int = 300
+    archive_dir: str = ""
+    latest_only: Dict[str, str] = field(default_factory=lambda: dict(LATEST_ONLY_TYPES))
+    min_superseded_ratio: float = 0.25
+    subscriber_max_lag_sec: int = 0
+
+
+@dataclass
+class WalCompactionHealth:
+    state: str
+    min_offset: int = -1
+    segments_dropped: int = 0
+    segments_compacted: int = 0
+    records_dropped: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    segments: int = 0
+    last_run_at: int = 0
+
+
+class WalCompactor:
+    def __init__(self, wal: JsonlWAL, state_db: StateDB, policy: Optional[WalCompactionPolicy] = None, topics: Optional[WalTopicIndex] = None):
+        self._wal = wal
+        self._db = state_db
+        self._topics = topics
+        self._policy = policy or WalCompactionPolicy()
+        self._last_run_at = 0
+        self._scanned = 0
+        self._latest: Dict[Tuple[str, str], int] = {}
+        self._seen: List[int] = []
+
+    def tick(self, now: Optional[int] = None) -> WalCompactionHealth:
+        ts = int(now if now is not None else now_unix())
+        if self._policy.interval_sec < 0:
+            return WalCompactionHealth(state="disabled")
+        if self._last_run_at and ts - self._last_run_at < int(self._policy.interval_sec):
+            return WalCompactionHealth(state="idle", last_run_at=self._last_run_at)
+        return self.run_once(ts)
+
+    def min_committed_offset(self, now: Optional[int] = None) -> int:
+        ts = int(now if now is not None else now_unix())
+        max_lag = int(self._policy.subscriber_max_lag_sec)
+        offsets = [self._wal_offset(o) for o in self._db.list_event_offsets() if max_lag <= 0 or ts - o["updated_at"] <= max_lag]
+        return min(offsets) if offsets else -1
+
+    def run_once(self, now: Optional[int] = None) -> WalCompactionHealth:
+        ts = int(now if now is not None else now_unix())
+        p = self._policy
+        before = self._wal.segments()
+        min_offset = self.min_committed_offset(ts)
+
+        if p.latest_only:
+            self._catch_up()
+        keep_seqs = set(self._latest.values())
+
+        dropped_segments = 0
+        compacted = 0
+        records = 0
+        cleared: List[Tuple[int, int]] = []
+        for seg in before[:-1]:
+            if not seg["sealed"]:
+                continue
+            name = seg["name"]
+            first, last = int(seg["first_seq"]), int(seg["last_seq"])
+            if 0 <= min_offset and last < min_offset:
+                if any(first <= s <= last for s in keep_seqs):
+                    n = self._wal.compact_segment(name, lambda seq, rec: seq in keep_seqs, archive_dir=p.archive_dir)
+                    if n:
+                        compacted += 1
+                        records += n
+                elif self._wal.drop_segment(name, archive_dir=p.archive_dir):
+                    dropped_segments += 1
+                    records += int(seg["count"])
+                cleared.append((first, last))
+                continue
+            stale = bisect.bisect_right(self._seen, last) - bisect.bisect_left(self._seen, first) - sum(1 for s in keep_seqs if first <= s <= last)
+            if stale and stale >= float(p.min_superseded_ratio) * max(1, int(seg["count"])):
+                n = self._wal.compact_segment(name, lambda seq, rec: self._key(rec) is None or seq in keep_seqs)
+                if n:
+                    compacted += 1
+                    records += n
+                cleared.append((first, last))
+        self._forget(cleared, keep_seqs)
+
+        after = self._wal.segments()
+        self._last_run_at = ts
+        return WalCompactionHealth(
+            state="running",
+            min_offset=min_offset,
+            segments_dropped=dropped_segments,
+            segments_compacted=compacted,
+            records_dropped=records,
+            bytes_before=sum(int(s["size_bytes"]) for s in before),
+            bytes_after=sum(int(s["size_bytes"]) for s in after),
+            segments=len(after),
+            last_run_at=ts,
+        )
+
+    def _catch_up(self) -> None:
+        # Only records appended since the last run are read; superseded seqs stay tracked
+        # until the segment holding them is compacted or dropped.
+        for seq, rec in self._wal.iter_entries(start=self._scanned):
+            key = self._key(rec)
+            if key is not None:
+                self._latest[key] = seq
+                self._seen.append(seq)
+            self._scanned = seq + 1
+
+    def _forget(self, cleared: List[Tuple[int, int]], keep_seqs: Set[int]) -> None:
+        if not cleared:
+            return
+        self._seen = [s for s in self._seen if s in keep_seqs or not any(first <= s <= last for first, last in cleared)]
+
+    def _wal_offset(self, row: Dict[str, Any]) -> int:
+        if self._topics is None:
+            return int(row["offset"])
+        return self._topics.wal_position(row["topic"], int(row["offset"]))
+
+    def _key(self, rec: WalRecord) -> Optional[Tuple[str, str]]:
+        field_name = self._policy.latest_only.get(rec.type)
+        if field_name is None:
+            return None
+        return rec.type, str((rec.data or {}).get(field_name, "")) if field_name else ""
+
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterator, NamedTuple, Optional
+
+import struct
+import zlib
+
+
+WAL_FORMATS = ("jsonl", "binary")
+BINARY_SUFFIX = ".wal"
+
+FRAME_RECORD = 0
+FRAME_FOOTER = 1
+
+_HEAD = struct.Struct("<II")
+_BODY = struct.Struct("<BQqH")
+_FRAME = struct.Struct("<IIBQqH")
+_EPOCH = datetime(1970, 1, 1)
+
+
+class Frame(NamedTuple):
+    offset: int
+    size: int
+    kind: int
+    seq: int
+    ts_us: int
+    type: str
+    payload_start: int
+    payload_end: int
+    valid: bool
+
+
+def encode_frame(kind: int, seq: int, ts_us: int, record_type: bytes, payload: bytes) -> bytes:
+    body = _BODY.pack(kind, seq, ts_us, len(record_type)) + record_type + payload
+    return _HEAD.pack(len(body), zlib.crc32(body)) + body
+
+
+def iter_frames(buf, offset: int, end: int) -> Iterator[Frame]:
+    pos = offset
+    head = _HEAD.size
+    while pos + _FRAME.size <= end:
+        length, crc, kind, seq, ts_us, type_len = _FRAME.unpack_from(buf, pos)
+        body_at = pos + head
+        stop = body_at + length
+        if length < _BODY.size or stop > end:
+            return
+        type_at = pos + _FRAME.size
+        valid = zlib.crc32(buf[body_at:stop]) == crc and type_at + type_len <= stop
+        record_type = buf[type_at:type_at + type_len].decode("utf-8", "replace") if valid else ""
+        yield Frame(pos, stop - pos, kind, seq, ts_us, record_type, type_at + type_len, stop, valid)
+        pos = stop
+
+
+def read_frame(buf, offset: int) -> Optional[Frame]:
+    for frame in iter_frames(buf, offset, len(buf)):
+        return frame
+    return None
+
+
+def us_to_iso(ts_us: int) -> str:
+    return (_EPOCH + timedelta(microseconds=int(ts_us))).isoformat()
+
+
+def iso_to_us(ts: str) -> int:
+    try:
+        delta = datetime.fromisoformat(str(ts)) - _EPOCH
+    except ValueError:
+        return 0
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
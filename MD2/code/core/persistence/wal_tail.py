@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Tuple
+
+import os
+
+from .jsonl_wal import LazyWalRecord, WalRecord, _decode_line, _format_of
+from .wal_format import BINARY_SUFFIX, FRAME_FOOTER, FRAME_RECORD, iter_frames
+
+
+class WalTail:
+    def __init__(self, wal_path: str, start_seq: int = 0):
+        path = Path(wal_path)
+        self._dir = path.parent
+        self._stem = path.stem
+        self._suffixes = tuple(dict.fromkeys((path.suffix or ".jsonl", BINARY_SUFFIX)))
+        self._next_seq = max(0, int(start_seq))
+        self._fh: Optional[BinaryIO] = None
+        self._number = -1
+        self._name = ""
+        self._offset = 0
+        self._sealed = False
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    @property
+    def position(self) -> Tuple[str, int]:
+        return self._name, self._offset
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def poll(self, max_records: int = 1000) -> List[Tuple[int, WalRecord]]:
+        out: List[Tuple[int, WalRecord]] = []
+        while len(out) < int(max_records):
+            if self._fh is None and not self._open_next():
+                break
+            got = self._read_available(int(max_records) - len(out))
+            out.extend(got)
+            if got and not self._sealed:
+                continue
+            if self._sealed or (not got and self._has_newer()):
+                self.close()
+                continue
+            break
+        return out
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        prefix = f"{self._stem}-"
+        found = {}
+        for suffix in self._suffixes:
+            for p in self._dir.glob(f"{prefix}*{suffix}"):
+                num = p.name[len(prefix):-len(suffix)]
+                if num.isdigit():
+                    found[int(num)] = p.name
+        return sorted(found.items())
+
+    def _has_newer(self) -> bool:
+        return any(num > self._number for num, _ in self._segments())
+
+    def _open_next(self) -> bool:
+        segments = self._segments()
+        if not segments:
+            return False
+        if self._number < 0:
+            candidates = [s for s in segments if s[0] <= self._next_seq] or segments[:1]
+            number, name = candidates[-1]
+        else:
+            later = [s for s in segments if s[0] > self._number]
+            if not later:
+                return False
+            number, name = later[0]
+        try:
+            self._fh = (self._dir / name).open("rb")
+        except FileNotFoundError:
+            return False
+        self._number, self._name, self._offset, self._sealed = number, name, 0, False
+        return True
+
+    def _read_available(self, limit: int) -> List[Tuple[int, WalRecord]]:
+        size = os.fstat(self._fh.fileno()).st_size
+        if size <= self._offset:
+            return []
+        self._fh.seek(self._offset)
+        chunk = self._fh.read(size - self._offset)
+        out: List[Tuple[int, WalRecord]] = []
+        consumed = 0
+        if _format_of(self._name) == "binary":
+            for frame in iter_frames(chunk, 0, len(chunk)):
+                consumed = frame.offset + frame.size
+                if frame.valid and frame.kind == FRAME_FOOTER:
+                    self._sealed = True
+                    break
+                if frame.valid and frame.kind == FRAME_RECORD and frame.seq >= self._next_seq:
+                    out.append((frame.seq, LazyWalRecord(frame.ts_us, frame.type, chunk[frame.payload_start:frame.payload_end])))
+                    self._next_seq = frame.seq + 1
+                    if len(out) >= limit:
+                        break
+        else:
+            pos = 0
+            while len(out) < limit:
+                nl = chunk.find(b"\n", pos)
+                if nl < 0:
+                    break
+                raw = chunk[pos:nl + 1]
+                pos = consumed = nl + 1
+                obj = _decode_line(raw)
+                if obj is None:
+                    continue
+                if "footer" in obj:
+                    self._sealed = True
+                    break
+                seq = int(obj.get("seq", self._next_seq))
+                if seq < self._next_seq:
+                    continue
+                out.append((seq, WalRecord(ts=str(obj.get("ts", "")), type=str(obj.get("type", "")), data=dict(obj.get("data") or {}))))
+                self._next_seq = seq + 1
+        self._offset += consumed
+        return out
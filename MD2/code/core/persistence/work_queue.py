@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import heapq
+import itertools
+import sqlite3
+import threading
+import zlib
+
+from protocols.workflow import WorkItemRecord, WorkItemStatus
+
+from .file_lock import FileLock
+from .state_db import StateDB, DbConfig
+
+
+@dataclass
+class ShardConfig:
+    root_dir: str
+    shards: int = 4
+    shard_by: str = "task_id"
+    read_pool_size: int = 2
+    group_commit_window_ms: float = 0.0
+
+
+class ShardedWorkQueue:
+    def __init__(self, config: ShardConfig):
+        if config.shard_by not in {"task_id", "tenant"}:
+            raise ValueError("invalid_shard_by")
+        root = Path(config.root_dir)
+        root.mkdir(parents=True, exist_ok=True)
+        self._shard_by = config.shard_by
+        self._shards = [
+            StateDB(DbConfig(path=str(root / f"work-queue-{i:02d}.db"), read_pool_size=config.read_pool_size, group_commit_window_ms=config.group_commit_window_ms))
+            for i in range(max(1, int(config.shards)))
+        ]
+        self._rr = itertools.count()
+        self._rr_lock = threading.Lock()
+        self._enqueue_lock = FileLock(str(root / "enqueue.lock"))
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    @property
+    def shards(self) -> List[StateDB]:
+        return list(self._shards)
+
+    def shard_index(self, task_id: str, tenant_id: str = "") -> int:
+        key = tenant_id if self._shard_by == "tenant" else task_id
+        return zlib.crc32(str(key).encode("utf-8")) % len(self._shards)
+
+    def close(self) -> None:
+        for shard in self._shards:
+            shard.close()
+
+    def enqueue_work_item(self, task_id: str, priority: int, payload: Dict[str, Any], idempotency_key: str = "", tenant_id: str = "") -> WorkItemRecord:
+        tenant = tenant_id or str((payload.get("context") or {}).get("tenant_id") or payload.get("tenant_id") or "")
+        owner = self._shards[self.shard_index(task_id, tenant)]
+        if self._shard_by == "task_id" and not idempotency_key:
+            # The default key derives from task_id, which always hashes to the same shard.
+            return owner.enqueue_work_item(task_id=task_id, priority=priority, payload=payload)
+        idem = idempotency_key or f"wi:{task_id}"
+        with self._enqueue_lock:
+            if any(shard.has_work_item(task_id, idem) for shard in self._shards if shard is not owner):
+                raise sqlite3.IntegrityError("UNIQUE constraint failed: work_items.idempotency_key")
+            return owner.enqueue_work_item(task_id=task_id, priority=priority, payload=payload, idempotency_key=idempotency_key)
+
+    def get_work_item(self, task_id: str, tenant_id: str = "", include_archive: bool = False) -> Optional[WorkItemRecord]:
+        for shard in self._owners(task_id, tenant_id):
+            item = shard.get_work_item(task_id, include_archive=include_archive)
+            if item:
+                return item
+        return None
+
+    def get_work_item_status(self, task_id: str, tenant_id: str = "") -> Optional[WorkItemStatus]:
+        for shard in self._owners(task_id, tenant_id):
+            status = shard.get_work_item_status(task_id)
+            if status is not None:
+                return status
+        return None
+
+    def mark_work_item_running(self, task_id: str, agent_id: str, tenant_id: str = "") -> bool:
+        return any(shard.mark_work_item_running(task_id, agent_id) for shard in self._owners(task_id, tenant_id))
+
+    def ack_work_item(self, task_id: str, agent_id: str, ok: bool, tenant_id: str = "") -> bool:
+        return any(shard.ack_work_item(task_id, agent_id, ok) for shard in self._owners(task_id, tenant_id))
+
+    def claim_work_item(self, agent_id: str, max_priority: int = 10, lease_ttl_sec: int = 60) -> Optional[WorkItemRecord]:
+        items = self.claim_work_items(agent_id=agent_id, n=1, max_priority=max_priority, lease_ttl_sec=lease_ttl_sec)
+        return items[0] if items else None
+
+    def claim_work_items(self, agent_id: str, n: int = 1, max_priority: int = 10, lease_ttl_sec: int = 60) -> List[WorkItemRecord]:
+        want = int(n)
+        if want <= 0:
+            return []
+        with self._rr_lock:
+            start = next(self._rr) % len(self._shards)
+        out: List[WorkItemRecord] = []
+        for i in range(len(self._shards)):
+            shard = self._shards[(start + i) % len(self._shards)]
+            out.extend(shard.claim_work_items(agent_id=agent_id, n=want - len(out), max_priority=max_priority, lease_ttl_sec=lease_ttl_sec))
+            if len(out) >= want:
+                break
+        out.sort(key=lambda w: (-w.priority, w.created_at, w.task_id))
+        return out
+
+    def renew_leases(self, agent_id: str, task_ids: List[str], ttl: int = 60) -> List[str]:
+        by_shard: Dict[int, List[str]] = {}
+        for task_id in task_ids or []:
+            for idx in self._owner_indexes(str(task_id), ""):
+                by_shard.setdefault(idx, []).append(str(task_id))
+        renewed: List[str] = []
+        for idx, ids in sorted(by_shard.items()):
+            renewed.extend(self._shards[idx].renew_leases(agent_id, ids, ttl=ttl))
+        return renewed
+
+    def reclaim_expired_leases(self, now: Optional[int] = None, limit: int = 100) -> int:
+        return sum(shard.reclaim_expired_leases(now=now, limit=limit) for shard in self._shards)
+
+    def list_work_items(self, status: str = "", limit: int = 50, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        wanted = list(fields) if fields else None
+        if wanted and "created_at" not in wanted:
+            wanted.append("created_at")
+        items: List[Dict[str, Any]] = []
+        for shard in self._shards:
+            items.extend(shard.list_work_items(status=status, limit=limit, fields=wanted))
+        items.sort(key=lambda it: int(it["created_at"]), reverse=True)
+        if fields and "created_at" not in fields:
+            for it in items:
+                it.pop("created_at", None)
+        return items[: int(limit)]
+
+    def iter_work_items(self, status: str = "", since: int = 0, until: int = 0, after: Optional[Tuple[int, str]] = None, page_size: int = 500, include_archive: bool = False) -> Iterator[Dict[str, Any]]:
+        iters = [shard.iter_work_items(status=status, since=since, until=until, after=after, page_size=page_size, include_archive=include_archive) for shard in self._shards]
+        return heapq.merge(*iters, key=lambda it: (int(it["created_at"]), str(it["task_id"])))
+
+    def get_counters(self) -> Dict[str, Any]:
+        hot: Dict[str, Any] = {}
+        archived: Dict[str, Any] = {}
+        for shard in self._shards:
+            counters = shard.get_counters()
+            _add_counts(hot, counters["work_items"])
+            _add_counts(archived, counters["archived"]["work_items"])
+        return {"work_items": hot, "archived": {"work_items": archived}}
+
+    def current_seq(self) -> int:
+        # Shard change seqs only grow, so the sum moves whenever any shard changes.
+        return sum(shard.current_seq() for shard in self._shards)
+
+    def _owner_indexes(self, task_id: str, tenant_id: str) -> List[int]:
+        if self._shard_by == "tenant" and not tenant_id:
+            return list(range(len(self._shards)))
+        return [self.shard_index(task_id, tenant_id)]
+
+    def _owners(self, task_id: str, tenant_id: str) -> List[StateDB]:
+        return [self._shards[i] for i in self._owner_indexes(task_id, tenant_id)]
+
+
+def _add_counts(dst: Dict[str, Any], src: Dict[str, Any]) -> None:
+    for key, value in src.items():
+        if isinstance(value, dict):
+            _add_counts(dst.setdefault(key, {}), value)
+        else:
+            dst[key] = int(dst.get(key, 0)) + int(value)
@@ -1,5 +1,5 @@
-from .replay import WalReplayer
+from .replay import WalReplayer, ReplayStats, TypeTiming
 from .idempotency import IdempotencyStore, LeaseStore
 
-__all__ = ["WalReplayer", "IdempotencyStore", "LeaseStore"]
+__all__ = ["WalReplayer", "ReplayStats", "TypeTiming", "IdempotencyStore", "LeaseStore"]
 
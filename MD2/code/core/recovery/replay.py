@@ -1,41 +1,153 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import queue
+import threading
+import time
+import zlib
 
 from core.persistence.jsonl_wal import JsonlWAL, WalRecord
 
 
+PartitionKey = Union[str, Callable[[WalRecord], Any], None]
+
+
+@dataclass
+class TypeTiming:
+    count: int = 0
+    applied: int = 0
+    seconds: float = 0.0
+
+    def merge(self, other: "TypeTiming") -> None:
+        self.count += other.count
+        self.applied += other.applied
+        self.seconds += other.seconds
+
+
 @dataclass
 class ReplayStats:
     total: int
     applied: int
     skipped: int
+    duration_sec: float = 0.0
+    records_per_sec: float = 0.0
+    workers: int = 1
+    partitions: int = 0
+    per_type: Dict[str, TypeTiming] = field(default_factory=dict)
 
 
 class WalReplayer:
     def __init__(self, wal: JsonlWAL):
         self._wal = wal
         self._handlers: Dict[str, Callable[[WalRecord], bool]] = {}
+        self._keys: Dict[str, PartitionKey] = {}
 
-    def register(self, record_type: str, handler: Callable[[WalRecord], bool]) -> bool:
+    def register(self, record_type: str, handler: Callable[[WalRecord], bool], partition_key: PartitionKey = None) -> bool:
         self._handlers[str(record_type)] = handler
+        self._keys[str(record_type)] = partition_key
         return True
 
-    def replay(self) -> ReplayStats:
+    def replay(self, workers: int = 1, queue_size: int = 1024) -> ReplayStats:
+        if int(workers) <= 1:
+            return self._replay_serial()
+        return self._replay_parallel(int(workers), max(1, int(queue_size)))
+
+    def _replay_serial(self) -> ReplayStats:
+        t0 = time.perf_counter()
         total = 0
-        applied = 0
         skipped = 0
+        per_type: Dict[str, TypeTiming] = {}
         for rec in self._wal.iter_records():
             total += 1
             handler = self._handlers.get(rec.type)
             if not handler:
                 skipped += 1
                 continue
-            ok = handler(rec)
-            if ok:
-                applied += 1
-            else:
-                skipped += 1
-        return ReplayStats(total=total, applied=applied, skipped=skipped)
+            _apply(handler, rec, per_type)
+        return self._stats(t0, total, skipped, per_type, workers=1, partitions=0)
+
+    def _replay_parallel(self, workers: int, queue_size: int) -> ReplayStats:
+        t0 = time.perf_counter()
+        queues: List["queue.Queue[Optional[Tuple[Callable[[WalRecord], bool], WalRecord]]]"] = [queue.Queue(maxsize=queue_size) for _ in range(workers)]
+        timings: List[Dict[str, TypeTiming]] = [{} for _ in range(workers)]
+        errors: List[BaseException] = []
+
+        def _worker(idx: int) -> None:
+            q = queues[idx]
+            while True:
+                item = q.get()
+                try:
+                    if item is None:
+                        return
+                    if not errors:
+                        _apply(item[0], item[1], timings[idx])
+                except BaseException as e:
+                    errors.append(e)
+                finally:
+                    q.task_done()
+
+        threads = [threading.Thread(target=_worker, args=(i,), name=f"wal-replay-{i}", daemon=True) for i in range(workers)]
+        for t in threads:
+            t.start()
+        total = 0
+        skipped = 0
+        partitions = set()
+        inline: Dict[str, TypeTiming] = {}
+        try:
+            for rec in self._wal.iter_records():
+                if errors:
+                    break
+                total += 1
+                handler = self._handlers.get(rec.type)
+                if not handler:
+                    skipped += 1
+                    continue
+                key = self._keys.get(rec.type)
+                if key is None:
+                    for q in queues:
+                        q.join()
+                    _apply(handler, rec, inline)
+                    continue
+                part = str(key(rec) if callable(key) else (rec.data or {}).get(key, ""))
+                partitions.add(part)
+                queues[zlib.crc32(part.encode("utf-8")) % workers].put((handler, rec))
+        finally:
+            for q in queues:
+                q.put(None)
+            for t in threads:
+                t.join()
+        if errors:
+            raise errors[0]
+        for part in timings:
+            for rtype, timing in part.items():
+                inline.setdefault(rtype, TypeTiming()).merge(timing)
+        return self._stats(t0, total, skipped, inline, workers=workers, partitions=len(partitions))
+
+    def _stats(self, t0: float, total: int, skipped: int, per_type: Dict[str, TypeTiming], workers: int, partitions: int) -> ReplayStats:
+        duration = time.perf_counter() - t0
+        applied = sum(t.applied for t in per_type.values())
+        handled = sum(t.count for t in per_type.values())
+        return ReplayStats(
+            total=total,
+            applied=applied,
+            skipped=skipped + handled - applied,
+            duration_sec=duration,
+            records_per_sec=total / duration if duration > 0 else 0.0,
+            workers=workers,
+            partitions=partitions,
+            per_type=per_type,
+        )
+
 
+def _apply(handler: Callable[[WalRecord], bool], rec: WalRecord, per_type: Dict[str, TypeTiming]) -> None:
+    timing = per_type.get(rec.type)
+    if timing is None:
+        timing = per_type[rec.type] = TypeTiming()
+    t0 = time.perf_counter()
+    ok = handler(rec)
+    timing.seconds += time.perf_counter() - t0
+    timing.count += 1
+    if ok:
+        timing.applied += 1
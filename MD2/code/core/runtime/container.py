@@ -3,9 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
-from core.observability import InMemoryEventBus, InMemoryTracer, InMemoryMetricsCollector, EvidenceStore
+import os
+
+from core.observability import PersistentEventBus, InMemoryTracer, InMemoryMetricsCollector, EvidenceStore
 from core.governance import InMemoryAuditSink, SimpleRedactor, EntropyControlCenter
-from core.persistence import JsonlWAL, SnapshotStore, SqliteStateStore, StateDB, DbConfig
+from core.persistence import JsonlWAL, SnapshotStore, SqliteStateStore, StateDB, DbConfig, RetentionEngine, RetentionPolicy, HeartbeatCoalescer, ShardedWorkQueue, ShardConfig, WalCompactor, WalCompactionPolicy, WalTopicIndex, AuditWriter
 from core.recovery import LeaseStore, IdempotencyStore
 from core.config import ConfigStore
 from .paths import RuntimePaths, get_runtime_paths
@@ -14,17 +16,23 @@ from .paths import RuntimePaths, get_runtime_paths
 @dataclass
 class RuntimeContainer:
     paths: RuntimePaths
-    event_bus: InMemoryEventBus
+    event_bus: PersistentEventBus
     tracer: InMemoryTracer
     metrics: InMemoryMetricsCollector
     evidence: EvidenceStore
     audit: InMemoryAuditSink
+    audit_writer: AuditWriter
     redactor: SimpleRedactor
     entropy: EntropyControlCenter
     wal: JsonlWAL
+    wal_topics: WalTopicIndex
+    wal_compactor: WalCompactor
     snapshots: SnapshotStore
     state_store: SqliteStateStore
     state_db: StateDB
+    work_queue: StateDB | ShardedWorkQueue
+    retention: RetentionEngine
+    heartbeats: HeartbeatCoalescer
     leases: LeaseStore
     idempotency: IdempotencyStore
     config_store: ConfigStore
@@ -36,20 +44,42 @@ def build_runtime_container(paths: RuntimePaths | None = None) -> RuntimeContain
     wal_path = str(p.state_dir / "wal" / "events.jsonl")
     sqlite_path = str(p.state_dir / "db" / "state.sqlite3")
     db_path = str(p.state_dir / "db" / "openclaw.db")
+    state_db = StateDB(DbConfig(path=db_path, group_commit_window_ms=float(os.environ.get("OPENCLAW_DB_GROUP_COMMIT_MS", "0") or 0)))
+    retention_days = int(os.environ.get("OPENCLAW_DB_RETENTION_DAYS", "30") or 0)
+    shards = int(os.environ.get("OPENCLAW_WORK_QUEUE_SHARDS", "0") or 0)
+    work_queue: StateDB | ShardedWorkQueue = state_db
+    if shards > 1:
+        work_queue = ShardedWorkQueue(ShardConfig(root_dir=str(p.state_dir / "db" / "shards"), shards=shards, shard_by=os.environ.get("OPENCLAW_WORK_QUEUE_SHARD_BY", "task_id") or "task_id"))
+
+    wal = JsonlWAL(wal_path=wal_path, durability=os.environ.get("OPENCLAW_WAL_DURABILITY", "sync") or "sync", segment_max_bytes=int(os.environ.get("OPENCLAW_WAL_SEGMENT_MB", "64") or 64) * 1024 * 1024, format=os.environ.get("OPENCLAW_WAL_FORMAT", "jsonl") or "jsonl")
+    wal_topics = WalTopicIndex(wal, index_path=str(p.state_dir / "wal" / "events.topics.json"))
+    audit_writer = AuditWriter(
+        state_db,
+        jsonl_path=str(p.log_dir / "audit" / "audit.jsonl"),
+        queue_size=int(os.environ.get("OPENCLAW_AUDIT_QUEUE_SIZE", "10000") or 10000),
+        max_jsonl_bytes=int(os.environ.get("OPENCLAW_AUDIT_JSONL_MB", "64") or 0) * 1024 * 1024,
+    )
+    wal_compaction = WalCompactionPolicy(interval_sec=int(os.environ.get("OPENCLAW_WAL_COMPACT_SEC", "300") or 0), archive_dir=os.environ.get("OPENCLAW_WAL_ARCHIVE_DIR", "") or "")
 
     return RuntimeContainer(
         paths=p,
-        event_bus=InMemoryEventBus(),
+        event_bus=PersistentEventBus(wal, state_db, index=wal_topics),
         tracer=InMemoryTracer(),
         metrics=InMemoryMetricsCollector(),
         evidence=EvidenceStore(),
-        audit=InMemoryAuditSink(jsonl_path=str(p.log_dir / "audit" / "audit.jsonl")),
+        audit=InMemoryAuditSink(writer=audit_writer),
+        audit_writer=audit_writer,
         redactor=SimpleRedactor(),
         entropy=EntropyControlCenter(),
-        wal=JsonlWAL(wal_path=wal_path),
+        wal=wal,
+        wal_topics=wal_topics,
+        wal_compactor=WalCompactor(wal, state_db, wal_compaction, topics=wal_topics),
         snapshots=SnapshotStore(root_dir=str(p.state_dir)),
         state_store=SqliteStateStore(db_path=sqlite_path),
-        state_db=StateDB(DbConfig(path=db_path)),
+        state_db=state_db,
+        work_queue=work_queue,
+        retention=RetentionEngine(state_db, RetentionPolicy(max_age_sec=retention_days * 86400), shards=work_queue.shards if isinstance(work_queue, ShardedWorkQueue) else None),
+        heartbeats=HeartbeatCoalescer(state_db, flush_interval_sec=int(os.environ.get("OPENCLAW_HEARTBEAT_FLUSH_SEC", "5") or 0)),
         leases=LeaseStore(root_dir=str(p.state_dir)),
         idempotency=IdempotencyStore(root_dir=str(p.state_dir)),
         config_store=ConfigStore(root_dir=str(p.state_dir)),
@@ -49,9 +49,10 @@ class ScheduleOnlyScheduler:
                 started_at=ts,
                 ended_at=0,
             )
-            self._db.upsert_run(run)
-            self._db.add_schedule_trigger(schedule_id=str(sch["id"]), fire_at=int(decision.fire_at), run_id=run_id, status="triggered")
-            self._db.set_schedule_next_fire_at(str(sch["id"]), int(decision.next_fire_at))
+            with self._db.transaction():
+                self._db.upsert_run(run)
+                self._db.add_schedule_trigger(schedule_id=str(sch["id"]), fire_at=int(decision.fire_at), run_id=run_id, status="triggered")
+                self._db.set_schedule_next_fire_at(str(sch["id"]), int(decision.next_fire_at))
             self._wal.append("schedule_triggered", {"schedule_id": sch["id"], "run_id": run_id, "fire_at": int(decision.fire_at)})
             triggered += 1
         return SchedulerHealth(state="running", due_checked=len(schedules), triggered=triggered)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 from dataclasses import dataclass
+from datetime import datetime
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from socketserver import ThreadingMixIn
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import collections
+import dataclasses
+import io
 import json
 import mimetypes
 import os
@@ -14,7 +18,10 @@ import subprocess
 import sys
 import threading
 import time
+import traceback
+import urllib.parse
 import uuid
+import zlib
 
 from core.runtime import build_runtime_container
 from core.skills.registry import SkillsRegistry
@@ -23,7 +30,9 @@ from protocols.trace import TraceContext
 from core.governance.auth import InMemoryAuthProvider
 from core.governance.rbac import InMemoryAuthorizer
 from core.governance.policy_engine import SimplePolicyEngine, PolicyRule
+from core.governance.decision_cache import AuthzDecision, AuthzDecisionCache
 from core.governance.redaction import SimpleRedactor
+from core.observability import InMemoryEventBus, WalEventFollower
 from core.risk.scorer import RiskScorer
 from protocols.approvals import ApprovalDecision, ApprovalStatus
 from protocols.workflows import WorkflowDefinition
@@ -45,10 +54,165 @@ class _ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
     daemon_threads = True
 
 
+class _AsyncWFile:
+    def __init__(self, loop: asyncio.AbstractEventLoop, writer: asyncio.StreamWriter):
+        self._loop = loop
+        self._writer = writer
+        self._buf = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self._buf += data
+        return len(data)
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+        data = bytes(self._buf)
+        self._buf.clear()
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._writer.write(data)
+            return
+        asyncio.run_coroutine_threadsafe(_send(self._writer, data), self._loop).result()
+
+
+async def _send(writer: asyncio.StreamWriter, data: bytes) -> None:
+    if writer.transport.is_closing():
+        raise ConnectionResetError("client_disconnected")
+    writer.write(data)
+    await writer.drain()
+
+
+class _AsyncHTTPServer:
+    def __init__(self, server_address: tuple[str, int], handler_cls, workers: int = 16, keepalive_sec: float = 15.0):
+        self.server_address = server_address
+        self._handler_cls = handler_cls
+        self._workers = max(1, int(workers))
+        self._keepalive = max(0.1, float(keepalive_sec))
+        self._pool: ThreadPoolExecutor | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopping: asyncio.Event | None = None
+        self._ready = threading.Event()
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="bff-worker")
+        self._thread = threading.Thread(target=asyncio.run, args=(self._serve(),), name="bff-asyncio", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def shutdown(self) -> None:
+        if self._loop is not None and self._stopping is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._stopping.set)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def server_close(self) -> None:
+        return None
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            server = await asyncio.start_server(self._connection, *self.server_address)
+        except BaseException as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        async with server:
+            await self._stopping.wait()
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self._keepalive)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+                    break
+                handler = self._handler(head, writer)
+                if not handler.parse_request():
+                    handler.wfile.flush()
+                    break
+                length = int(handler.headers.get("Content-Length", "0") or "0")
+                handler.rfile = io.BytesIO(await reader.readexactly(length) if length > 0 else b"")
+                if handler.command == "GET" and handler.path == "/v1/events/stream":
+                    await self._events_stream(handler, reader, writer)
+                    break
+                method = getattr(handler, "do_" + handler.command, None)
+                if method is None:
+                    handler.send_error(501, "Unsupported method (%r)" % handler.command)
+                else:
+                    await self._loop.run_in_executor(self._pool, method)
+                handler.wfile.flush()
+                await writer.drain()
+                if handler.close_connection:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+            pass
+        except Exception:
+            traceback.print_exc()
+        finally:
+            writer.close()
+
+    def _handler(self, head: bytes, writer: asyncio.StreamWriter):
+        handler = self._handler_cls.__new__(self._handler_cls)
+        handler.server = self
+        handler.request = None
+        handler.client_address = writer.get_extra_info("peername")
+        handler.protocol_version = "HTTP/1.1"
+        handler.close_connection = True
+        handler.loop = self._loop
+        handler.rfile = io.BytesIO(head)
+        handler.wfile = _AsyncWFile(self._loop, writer)
+        handler.raw_requestline = handler.rfile.readline(65537)
+        return handler
+
+    async def _events_stream(self, handler, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        events = handler.deps.events
+        wake = asyncio.Event()
+        handler._events_headers()
+        handler.wfile.flush()
+        client = events.subscribe(notify=lambda: self._loop.call_soon_threadsafe(wake.set))
+        try:
+            while not reader.at_eof() and not writer.transport.is_closing():
+                frames = client.take(timeout=0)
+                if frames is None:
+                    break
+                if frames:
+                    writer.write(b"".join(frames))
+                    await writer.drain()
+                try:
+                    await asyncio.wait_for(wake.wait(), events.interval_sec * 2)
+                except asyncio.TimeoutError:
+                    pass
+                wake.clear()
+        except ConnectionError:
+            pass
+        finally:
+            events.unsubscribe(client)
+
+
+BFF_SERVER_MODES = ("threaded", "asyncio")
+
+
 @dataclass
 class _BffConfig:
     host: str
     port: int
+    server: str = "threaded"
+    workers: int = 16
 
 
 @dataclass
@@ -59,6 +223,10 @@ class _Deps:
     redactor: SimpleRedactor
     risk: RiskScorer
     system: SystemManager
+    events: _SseBroadcaster
+    authz: AuthzDecisionCache
+    etags: _EtagCache
+    follower: WalEventFollower | None = None
 
 
 class SystemManager:
@@ -142,13 +310,386 @@ class SystemManager:
         self._logs.append(f"[BFF] {msg}\n")
 
 
-def _run_async(coro):
+_SSE_TABLE_EVENTS = {
+    "runs": "update:runs",
+    "node_runs": "update:runs",
+    "work_items": "update:queue",
+    "approvals": "update:approvals",
+    "schedules": "update:schedules",
+    "agent_heartbeats": "update:agents",
+    "workflows": "update:workflows",
+}
+
+
+_SSE_REFRESH_EVENTS = (
+    "update:agents",
+    "update:approvals",
+    "update:system",
+    "update:runs",
+    "update:queue",
+    "update:dashboard",
+    "update:schedules",
+    "update:workflows",
+    "update:skills",
+    "update:learning",
+    "update:evidence",
+    "update:audit",
+)
+
+
+def _sse_frame(event: str, data: Any) -> bytes:
+    return f"event: {event}\ndata: {data}\n\n".encode("utf-8")
+
+
+class _SseClient:
+    def __init__(self, notify: Callable[[], None] | None = None):
+        self._cond = threading.Condition()
+        self._notify = notify
+        self._pending: Dict[str, bytes] = {}
+        self.closed = False
+        self.lag = 0
+        self.coalesced = 0
+
+    def offer(self, frames: Dict[str, bytes], max_lag: int, tick: bool = True) -> bool:
+        with self._cond:
+            if self.closed:
+                return False
+            if self._pending and not tick:
+                self.coalesced += sum(1 for event in frames if event in self._pending)
+            elif self._pending:
+                self.lag += 1
+                self.coalesced += sum(1 for event in frames if event in self._pending)
+                if self.lag > max_lag:
+                    self.closed = True
+                    self._pending.clear()
+                    self._cond.notify_all()
+                    self._wake()
+                    return False
+            self._pending.update(frames)
+            self._cond.notify_all()
+        self._wake()
+        return True
+
+    def take(self, timeout: float) -> list[bytes] | None:
+        with self._cond:
+            if not self._pending and not self.closed:
+                self._cond.wait(timeout)
+            if self.closed:
+                return None
+            frames = list(self._pending.values())
+            self._pending.clear()
+            self.lag = 0
+            return frames
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._notify is not None:
+            try:
+                self._notify()
+            except RuntimeError:
+                pass
+
+
+class _SseBroadcaster:
+    def __init__(self, state_db, interval_sec: float = 2.0, max_lag: int = 30, work_queue=None):
+        self._db = state_db
+        self._queue = work_queue if work_queue is not None and work_queue is not state_db else None
+        self._queue_seq: int | None = None
+        self.interval_sec = max(0.05, float(interval_sec))
+        self._max_lag = max(1, int(max_lag))
+        self._clients: set[_SseClient] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._last_seq: int | None = None
+        self._snapshot: Dict[str, bytes] = {}
+        self._polls = 0
+        self._dropped = 0
+        self._errors = 0
+
+    def subscribe(self, notify: Callable[[], None] | None = None) -> _SseClient:
+        client = _SseClient(notify)
+        with self._lock:
+            if self._stop.is_set():
+                client.close()
+                return client
+            client.offer(dict(self._snapshot), self._max_lag)
+            self._clients.add(client)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="bff-sse", daemon=True)
+                self._thread.start()
+        return client
+
+    def unsubscribe(self, client: _SseClient) -> None:
+        client.close()
+        with self._lock:
+            self._clients.discard(client)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            clients = list(self._clients)
+            self._clients.clear()
+            thread = self._thread
+        for client in clients:
+            client.close()
+        if thread is not None:
+            thread.join(timeout=self.interval_sec * 2)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            clients = list(self._clients)
+        return {
+            "clients": len(clients),
+            "polls": self._polls,
+            "dropped": self._dropped,
+            "errors": self._errors,
+            "coalesced": sum(c.coalesced for c in clients),
+            "last_seq": self._last_seq,
+        }
+
+    def publish(self, topic: str, event: Dict[str, Any]) -> None:
+        with self._lock:
+            clients = list(self._clients)
+        if clients:
+            # Keyed per topic so a lagging client keeps the newest event of each topic;
+            # bursts do not count as missed poll ticks.
+            frames = {f"bus:{topic}": _sse_frame("bus", json.dumps({"topic": topic, "event": event}, ensure_ascii=False))}
+            for client in clients:
+                client.offer(frames, self._max_lag, tick=False)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval_sec)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            with self._lock:
+                clients = list(self._clients)
+            if not clients:
+                continue
+            self._broadcast(clients, self._poll())
+
+    def _poll(self) -> Dict[str, bytes]:
+        now = now_unix()
+        frames = {"heartbeat": _sse_frame("heartbeat", now)}
+        self._polls += 1
+        try:
+            if self._last_seq is None:
+                self._last_seq = self._db.current_seq()
+            # Change feed: one indexed read covers every watched table for all clients.
+            changes = self._db.changes_since(self._last_seq, limit=1000)
+            if changes:
+                self._last_seq = int(changes[-1]["seq"])
+            events = {_SSE_TABLE_EVENTS[c["table"]] for c in changes if c["table"] in _SSE_TABLE_EVENTS}
+            if self._queue is not None:
+                # Sharded work items change in the shard files, not in state_db's change feed.
+                seq = self._queue.current_seq()
+                if self._queue_seq is not None and seq != self._queue_seq:
+                    events.add(_SSE_TABLE_EVENTS["work_items"])
+                self._queue_seq = seq
+            for event in sorted(events):
+                frames[event] = _sse_frame(event, now)
+
+            counters = self._db.get_counters()
+            data = json.dumps({"pending_approvals": counters["pending_approvals"], "server_time": now})
+            frames["stats"] = self._snapshot["stats"] = _sse_frame("stats", data)
+
+            # Force refresh signals for other views periodically (every 5s)
+            if int(now) % 5 == 0:
+                for event in _SSE_REFRESH_EVENTS:
+                    frames[event] = _sse_frame(event, now)
+        except Exception:
+            self._errors += 1
+        self._snapshot["heartbeat"] = frames["heartbeat"]
+        return frames
+
+    def _broadcast(self, clients: list[_SseClient], frames: Dict[str, bytes]) -> None:
+        lagging = [c for c in clients if not c.offer(frames, self._max_lag)]
+        if lagging:
+            with self._lock:
+                for client in lagging:
+                    if client in self._clients:
+                        self._clients.discard(client)
+                        self._dropped += 1
+
+
+class _EtagCache:
+    def __init__(self, state_db, refresh_sec: float = 1.0, idle_sec: float = 60.0, max_entries: int = 256):
+        self._db = state_db
+        self._refresh_sec = max(0.05, float(refresh_sec))
+        self._idle_sec = max(self._refresh_sec, float(idle_sec))
+        self._max = max(1, int(max_entries))
+        self._epoch = f"{int(time.time()):x}"
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._entries: "collections.OrderedDict[str, tuple[str, bytes]]" = collections.OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._base = 0
+        self._seq: int | None = None
+        self._dirty = True
+        self._checked = 0.0
+        self._last_used = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stats = {"not_modified": 0, "hits": 0, "misses": 0, "refreshes": 0}
+
+    def etag(self, tables: tuple[str, ...], key: str) -> str:
+        now = time.monotonic()
+        with self._lock:
+            self._last_used = now
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(target=self._run, name="bff-etag", daemon=True)
+                self._thread.start()
+            stale = self._dirty or self._seq is None or now - self._checked > self._refresh_sec * 3
+        if stale:
+            self._refresh()
+        with self._lock:
+            versions = "-".join(str(self._versions.get(t, self._base)) for t in tables)
+        return f'"{self._epoch}-{versions}-{zlib.crc32(key.encode("utf-8")):08x}"'
+
+    def get(self, key: str, etag: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key: str, etag: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+
+    def not_modified(self) -> None:
+        with self._lock:
+            self._stats["not_modified"] += 1
+
+    def touch(self) -> None:
+        self._dirty = True
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "seq": self._seq}
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._refresh_sec):
+            if time.monotonic() - self._last_used < self._idle_sec:
+                try:
+                    self._refresh()
+                except Exception:
+                    self._dirty = True
+
+    def _refresh(self) -> None:
+        with self._refresh_lock:
+            self._dirty = False
+            if self._seq is None:
+                seq = self._db.current_seq()
+                with self._lock:
+                    self._seq = self._base = seq
+            while True:
+                changes = self._db.changes_since(self._seq, limit=1000)
+                with self._lock:
+                    for c in changes:
+                        self._versions[c["table"]] = int(c["seq"])
+                    if changes:
+                        self._seq = int(changes[-1]["seq"])
+                    self._checked = time.monotonic()
+                    self._stats["refreshes"] += 1
+                if len(changes) < 1000:
+                    break
+
+
+def _counters(rt) -> Dict[str, Any]:
+    counters = rt.state_db.get_counters()
+    if rt.work_queue is not rt.state_db:
+        queue = rt.work_queue.get_counters()
+        counters["work_items"] = queue["work_items"]
+        counters["archived"]["work_items"] = queue["archived"]["work_items"]
+    return counters
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    tags = [t.strip() for t in str(header or "").split(",")]
+    return "*" in tags or any(t.removeprefix("W/") == etag for t in tags)
+
+
+@dataclass(frozen=True)
+class _ExportSpec:
+    method: str
+    resource: str
+    key: str
+    ts_key: str
+    id_key: str
+    filters: tuple[str, ...]
+    archived: bool = False
+    source: str = "state_db"
+
+
+_EXPORTS = {
+    "audit": _ExportSpec("iter_audit_logs", "audit", "audit", "timestamp", "audit_id", ("trace_id",), archived=True),
+    "evidence": _ExportSpec("iter_evidence", "evidence", "evidence", "created_at", "evidence_id", ("trace_id",), archived=True),
+    "work-items": _ExportSpec("iter_work_items", "work_item", "work_items", "created_at", "task_id", ("status",), archived=True, source="work_queue"),
+    "approvals": _ExportSpec("iter_approvals", "approval", "approvals", "created_at", "approval_id", ("status",)),
+    "learning-reports": _ExportSpec("iter_learning_reports", "learning", "reports", "created_at", "report_id", ("agent_id",)),
+}
+
+
+def _encode_cursor(ts: Any, item_id: Any) -> str:
+    return f"{int(ts or 0)}:{item_id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[int, str] | None:
+    ts, sep, item_id = urllib.parse.unquote(str(cursor or "")).partition(":")
+    if not sep:
+        return None
+    try:
+        return int(ts), item_id
+    except ValueError:
+        return None
+
+
+def _seconds_until(iso_utc: Any) -> float | None:
+    try:
+        return (datetime.fromisoformat(str(iso_utc)) - datetime.utcnow()).total_seconds()
+    except ValueError:
+        return None
+
+
+def _truthy(value: Any) -> bool:
+    return str(value or "").strip().lower() in {"1", "true", "yes"}
+
+
+def _record_view(record) -> Dict[str, Any]:
+    data = {f.name: getattr(record, f.name) for f in dataclasses.fields(record)}
+    data["status"] = record.status.value
+    return data
+
+
+def _run_async(coro, loop: asyncio.AbstractEventLoop | None = None):
+    if loop is not None and loop.is_running():
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
     return asyncio.run(coro)
 
 
 class _Handler(BaseHTTPRequestHandler):
     container = None
     deps: _Deps | None = None
+    loop: asyncio.AbstractEventLoop | None = None
 
     def do_GET(self):
         if self.path == "/healthz":
@@ -168,28 +709,28 @@ class _Handler(BaseHTTPRequestHandler):
             if deny:
                 self._json(*deny)
                 return
-            self._json(*self._schedules_get())
+            self._cached_json(("schedules",), self._schedules_get)
             return
         if self.path.startswith("/v1/runs"):
             deny = self._guard(action="read", resource="run")
             if deny:
                 self._json(*deny)
                 return
-            self._json(*self._runs_get())
+            self._cached_json(("runs", "node_runs"), self._runs_get)
             return
         if self.path.startswith("/v1/approvals"):
             deny = self._guard(action="read", resource="approval")
             if deny:
                 self._json(*deny)
                 return
-            self._json(*self._approvals_get())
+            self._cached_json(("approvals",), self._approvals_get)
             return
         if self.path.startswith("/v1/workflows"):
             deny = self._guard(action="read", resource="workflow")
             if deny:
                 self._json(*deny)
                 return
-            self._json(*self._workflows_get())
+            self._cached_json(("workflows",), self._workflows_get)
             return
         if self.path.startswith("/v1/evidence"):
             deny = self._guard(action="read", resource="evidence")
@@ -219,7 +760,25 @@ class _Handler(BaseHTTPRequestHandler):
             if deny:
                 self._json(*deny)
                 return
-            self._json(*self._work_items_get())
+            self._cached_json(("work_items",) if self.container.work_queue is self.container.state_db else (), self._work_items_get)
+            return
+        if self.path.startswith("/v1/export/"):
+            spec = _EXPORTS.get(self.path.partition("?")[0][len("/v1/export/"):])
+            if not spec:
+                self._json(404, {"error": "not_found"})
+                return
+            deny = self._guard(action="read", resource=spec.resource)
+            if deny:
+                self._json(*deny)
+                return
+            self._export_stream(spec)
+            return
+        if self.path == "/v1/stats":
+            deny = self._guard(action="read", resource="stats")
+            if deny:
+                self._json(*deny)
+                return
+            self._json(*self._stats_get())
             return
         if self.path.startswith("/v1/learning/reports"):
             deny = self._guard(action="read", resource="learning")
@@ -258,6 +817,14 @@ class _Handler(BaseHTTPRequestHandler):
         if self.path == "/v1/system/logs":
             self._json(200, {"ok": True, "logs": self.deps.system.get_logs()})
             return
+        if self.path == "/v1/system/db":
+            deny = self._guard(action="read", resource="infrastructure")
+            if deny:
+                self._json(*deny)
+                return
+            db = self.container.state_db
+            self._json(200, {"ok": True, "lock_stats": db.get_lock_stats(), "vacuum": db.get_vacuum_status(), "archives": db.list_archives()})
+            return
 
         # Fallback to static files
         self._static_file(self.path)
@@ -267,10 +834,25 @@ class _Handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, PATCH, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization")
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
 
     def do_POST(self):
+        try:
+            self._post()
+        finally:
+            if self.deps:
+                self.deps.etags.touch()
+
+    def do_PATCH(self):
+        try:
+            self._patch()
+        finally:
+            if self.deps:
+                self.deps.etags.touch()
+
+    def _post(self):
         if self.path == "/v1/auth/login":
             self._json(*self._auth_login())
             return
@@ -351,7 +933,7 @@ class _Handler(BaseHTTPRequestHandler):
 
         self._json(404, {"error": "not_found"})
 
-    def do_PATCH(self):
+    def _patch(self):
         if self.path.startswith("/v1/schedules/"):
             deny = self._guard(action="write", resource="schedule", risk_ctx={"requires_write": True})
             if deny:
@@ -371,9 +953,76 @@ class _Handler(BaseHTTPRequestHandler):
         rt = self.container
         status = str(self._query().get("status", "")).strip()
         limit = int(self._query().get("limit", "50") or 50)
-        items = rt.state_db.list_work_items(status=status, limit=limit)
+        items = rt.work_queue.list_work_items(status=status, limit=limit)
         return 200, {"ok": True, "work_items": items}
 
+    def _export_stream(self, spec: "_ExportSpec"):
+        rt = self.container
+        q = self._query()
+        filters = {k: str(q.get(k, "")).strip() for k in spec.filters}
+        archive = {"include_archive": _truthy(q.get("archive"))} if spec.archived else {}
+        limit = int(q.get("limit", "0") or 0)
+        page_size = int(q.get("page_size", "500") or 500)
+        items = getattr(getattr(rt, spec.source), spec.method)(
+            since=int(q.get("since", "0") or 0),
+            until=int(q.get("until", "0") or 0),
+            after=_decode_cursor(str(q.get("cursor", ""))),
+            page_size=page_size,
+            **filters,
+            **archive,
+        )
+
+        chunked = self.request_version == "HTTP/1.1"
+        if chunked:
+            self.protocol_version = "HTTP/1.1"
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("traceparent", self._trace().traceparent)
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def _emit(text: str) -> None:
+            data = text.encode("utf-8")
+            if chunked:
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            else:
+                self.wfile.write(data)
+            self.wfile.flush()
+
+        sent = 0
+        next_cursor = ""
+        buf: list[str] = []
+        try:
+            _emit(json.dumps({"ok": True})[:-1] + f', "{spec.key}": [')
+            for item in items:
+                if limit and sent >= limit:
+                    break
+                if self.deps:
+                    item = self.deps.redactor.redact(item)
+                buf.append(json.dumps(item, ensure_ascii=False))
+                sent += 1
+                next_cursor = _encode_cursor(item.get(spec.ts_key), item.get(spec.id_key))
+                if len(buf) >= page_size:
+                    _emit(("," if sent > len(buf) else "") + ",".join(buf))
+                    buf = []
+            if buf:
+                _emit(("," if sent > len(buf) else "") + ",".join(buf))
+            if not limit or sent < limit:
+                next_cursor = ""
+            _emit("], " + json.dumps({"count": sent, "next_cursor": next_cursor})[1:])
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _stats_get(self) -> tuple[int, Dict[str, Any]]:
+        rt = self.container
+        return 200, {"ok": True, "stats": _counters(rt), "events": self.deps.events.stats(), "authz": dataclasses.asdict(self.deps.authz.stats()), "audit": rt.audit_writer.stats(), "etags": self.deps.etags.stats(), "follower": dataclasses.asdict(self.deps.follower.stats()) if self.deps.follower else None}
+
     def _learning_reports_get(self) -> tuple[int, Dict[str, Any]]:
         rt = self.container
         agent_id = str(self._query().get("agent_id", "")).strip()
@@ -381,8 +1030,7 @@ class _Handler(BaseHTTPRequestHandler):
         reports = rt.state_db.list_learning_reports(agent_id=agent_id, limit=limit)
         return 200, {"ok": True, "reports": reports}
 
-    def _events_stream(self):
-        # SSE Handler
+    def _events_headers(self):
         self.send_response(200)
         self.send_header("Content-Type", "text/event-stream")
         self.send_header("Cache-Control", "no-cache")
@@ -390,84 +1038,23 @@ class _Handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
 
-        rt = self.container
-        
-        # Tracking State
-        last_runs_ts = 0
-        last_approval_id = ""
-        last_queue_ts = 0
+    def _events_stream(self):
+        # SSE Handler
+        self._events_headers()
 
+        client = self.deps.events.subscribe()
         try:
             while True:
-                now = now_unix()
-                
-                # 1. Heartbeat
-                self.wfile.write(f"event: heartbeat\ndata: {now}\n\n".encode("utf-8"))
-                
-                try:
-                    # 2. Runs Update Check (by checking count or max updated_at if DB supported it)
-                    # For MVP, we check count of active runs or just trigger update periodically?
-                    # Let's check if any run was updated recently?
-                    # SQLite doesn't give us "max updated_at" easily without index/scan.
-                    # We'll rely on "polling signals" - checking counts or specific triggers.
-                    
-                    # Approvals
-                    pending_approvals = rt.state_db.list_approvals(status="pending", limit=1)
-                    latest_approval_id = str(pending_approvals[0]["approval_id"]) if pending_approvals else ""
-                    if latest_approval_id != last_approval_id:
-                        self.wfile.write(f"event: update:approvals\ndata: {now}\n\n".encode("utf-8"))
-                        last_approval_id = latest_approval_id
-
-                    # Infrastructure (Agents)
-                    # Check if any agent heartbeat is recent?
-                    # Let's just send a generic "refresh" signal every 5 seconds for all views
-                    # This is "Short Polling via SSE" but efficient enough for <50 clients.
-                    
-                    # Actually, we can check DB.
-                    # list_runs(limit=1) returns latest.
-                    runs, _ = rt.state_db.list_runs(limit=1)
-                    if runs:
-                        latest_run = runs[0]
-                        if latest_run.started_at > last_runs_ts:
-                            self.wfile.write(f"event: update:runs\ndata: {now}\n\n".encode("utf-8"))
-                            last_runs_ts = latest_run.started_at
-
-                    # Queue (Work Items)
-                    # Check latest work item
-                    latest_wi = rt.state_db.list_work_items(limit=1)
-                    if latest_wi:
-                        ts = int(latest_wi[0].get("updated_at", 0))
-                        if ts > last_queue_ts:
-                            self.wfile.write(f"event: update:queue\ndata: {now}\n\n".encode("utf-8"))
-                            last_queue_ts = ts
-
-                    # Dashboard Stats
-                    n_approvals = len(rt.state_db.list_approvals(status="pending", limit=100))
-                    data = json.dumps({"pending_approvals": n_approvals, "server_time": now})
-                    self.wfile.write(f"event: stats\ndata: {data}\n\n".encode("utf-8"))
-                    
-                    # Force refresh signals for other views periodically (every 5s)
-                    if int(now) % 5 == 0:
-                        self.wfile.write(f"event: update:agents\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:approvals\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:system\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:runs\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:queue\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:dashboard\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:schedules\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:workflows\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:skills\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:learning\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:evidence\ndata: {now}\n\n".encode("utf-8"))
-                        self.wfile.write(f"event: update:audit\ndata: {now}\n\n".encode("utf-8"))
-
-                except Exception:
-                    pass
-
-                self.wfile.flush()
-                time.sleep(2)
+                frames = client.take(timeout=self.deps.events.interval_sec * 2)
+                if frames is None:
+                    break
+                if frames:
+                    self.wfile.write(b"".join(frames))
+                    self.wfile.flush()
         except (BrokenPipeError, ConnectionResetError):
             pass # Client disconnected
+        finally:
+            self.deps.events.unsubscribe(client)
 
     def _static_file(self, path: str):
         # Determine web root
@@ -547,11 +1134,11 @@ class _Handler(BaseHTTPRequestHandler):
         if not user_id:
             return 400, {"ok": False, "error": "missing_user_id"}
         auth = deps.auth
-        token = _run_async(auth.authenticate({"user_id": user_id, "roles": roles}))
+        token = _run_async(auth.authenticate({"user_id": user_id, "roles": roles}), self.loop)
         if not token:
             return 401, {"ok": False, "error": "auth_failed"}
         for r in roles:
-            _run_async(deps.authorizer.assign_role(user_id, str(r)))
+            _run_async(deps.authorizer.assign_role(user_id, str(r)), self.loop)
         return 200, {"ok": True, "token": token}
 
     def _approvals_get(self) -> tuple[int, Dict[str, Any]]:
@@ -618,16 +1205,18 @@ class _Handler(BaseHTTPRequestHandler):
 
     def _evidence_get(self) -> tuple[int, Dict[str, Any]]:
         rt = self.container
-        trace_id = str(self._query().get("trace_id", "")).strip()
+        q = self._query()
+        trace_id = str(q.get("trace_id", "")).strip()
         if not trace_id:
             return 400, {"ok": False, "error": "missing_trace_id"}
-        items = rt.state_db.list_evidence(trace_id=trace_id, limit=int(self._query().get("limit", "100") or 100))
+        items = rt.state_db.list_evidence(trace_id=trace_id, limit=int(q.get("limit", "100") or 100), include_archive=_truthy(q.get("archive")))
         return 200, {"ok": True, "evidence": items}
 
     def _audit_get(self) -> tuple[int, Dict[str, Any]]:
         rt = self.container
-        trace_id = str(self._query().get("trace_id", "")).strip()
-        items = rt.state_db.list_audit_logs(trace_id=trace_id, limit=int(self._query().get("limit", "200") or 200))
+        q = self._query()
+        trace_id = str(q.get("trace_id", "")).strip()
+        items = rt.state_db.list_audit_logs(trace_id=trace_id, limit=int(q.get("limit", "200") or 200), include_archive=_truthy(q.get("archive")))
         return 200, {"ok": True, "audit": items}
 
     def _entropy_metrics_get(self) -> tuple[int, Dict[str, Any]]:
@@ -748,12 +1337,15 @@ class _Handler(BaseHTTPRequestHandler):
             limit = int(self._query().get("limit", "50") or 50)
             cursor = str(self._query().get("cursor", "")).strip()
             runs, next_cursor = rt.state_db.list_runs(workflow_id=workflow_id, limit=limit, cursor=cursor)
-            return 200, {"ok": True, "runs": [r.__dict__ | {"status": r.status.value} for r in runs], "next_cursor": next_cursor}
+            return 200, {"ok": True, "runs": [_record_view(r) for r in runs], "next_cursor": next_cursor}
         if self.path.startswith("/v1/runs/"):
             run_id = self.path.split("/", 3)[3]
             run = rt.state_db.get_run(run_id)
-            nodes = rt.state_db.list_node_runs(run_id) if run else []
-            return 200, {"ok": True, "run": (run.__dict__ | {"status": run.status.value}) if run else None, "nodes": [n.__dict__ | {"status": n.status.value} for n in nodes]}
+            archived = run is None
+            if archived:
+                run = rt.state_db.get_run(run_id, include_archive=True)
+            nodes = rt.state_db.list_node_runs(run_id, include_archive=archived) if run else []
+            return 200, {"ok": True, "run": _record_view(run) if run else None, "nodes": [_record_view(n) for n in nodes]}
         return 404, {"ok": False, "error": "not_found"}
 
     def _work_items_post(self) -> tuple[int, Dict[str, Any]]:
@@ -769,8 +1361,8 @@ class _Handler(BaseHTTPRequestHandler):
         payload = dict(body.get("payload") or {})
         idem = str(body.get("idempotency_key", "")).strip()
         try:
-            wi = rt.state_db.enqueue_work_item(task_id=task_id, priority=priority, payload=payload, idempotency_key=idem)
-            return 200, {"ok": True, "work_item": wi.__dict__ | {"status": wi.status.value}}
+            wi = rt.work_queue.enqueue_work_item(task_id=task_id, priority=priority, payload=payload, idempotency_key=idem)
+            return 200, {"ok": True, "work_item": _record_view(wi)}
         except Exception as e:
             return 409, {"ok": False, "error": str(e)}
 
@@ -785,8 +1377,8 @@ class _Handler(BaseHTTPRequestHandler):
             return 400, {"ok": False, "error": "missing_agent_id"}
         max_priority = int(body.get("max_priority", 10) or 10)
         lease_ttl_sec = int(body.get("lease_ttl_sec", 60) or 60)
-        wi = rt.state_db.claim_work_item(agent_id=agent_id, max_priority=max_priority, lease_ttl_sec=lease_ttl_sec)
-        return 200, {"ok": True, "work_item": (wi.__dict__ | {"status": wi.status.value}) if wi else None}
+        wi = rt.work_queue.claim_work_item(agent_id=agent_id, max_priority=max_priority, lease_ttl_sec=lease_ttl_sec)
+        return 200, {"ok": True, "work_item": _record_view(wi) if wi else None}
 
     def _work_items_ack(self) -> tuple[int, Dict[str, Any]]:
         rt = self.container
@@ -799,7 +1391,7 @@ class _Handler(BaseHTTPRequestHandler):
         ok = bool(body.get("ok", False))
         if not task_id or not agent_id:
             return 400, {"ok": False, "error": "missing_task_or_agent"}
-        updated = rt.state_db.ack_work_item(task_id=task_id, agent_id=agent_id, ok=ok)
+        updated = rt.work_queue.ack_work_item(task_id=task_id, agent_id=agent_id, ok=ok)
         if not updated:
             return 409, {"ok": False, "error": "work_item_not_updatable"}
         return 200, {"ok": True, "updated": True}
@@ -814,24 +1406,19 @@ class _Handler(BaseHTTPRequestHandler):
             token = self._bearer_token()
             if not token:
                 return 401, {"ok": False, "error": "missing_token", "trace_id": trace.trace_id}
-            info = _run_async(deps.auth.validate_token(token))
-            if not info:
+            decision = self._authorize(token, action, resource)
+            if decision is None:
                 return 401, {"ok": False, "error": "invalid_token", "trace_id": trace.trace_id}
-            user = dict(info.get("user") or {})
+            user = decision.user
             user_id = str(user.get("user_id") or "")
-            allowed = _run_async(deps.authorizer.check_permission(user_id=user_id, resource=resource, action=action))
-            if not allowed:
-                rt.state_db.add_audit_log(trace_id=trace.trace_id, actor=user_id, action=action, resource=resource, result={"ok": False, "reason": "rbac"})
-                return 403, {"ok": False, "error": "permission_denied", "trace_id": trace.trace_id}
-            pol = _run_async(deps.policy.decide(subject=user, action=action, resource={"type": resource}, context={"path": self.path}))
-            if not pol.get("allowed", False):
-                rt.state_db.add_audit_log(trace_id=trace.trace_id, actor=user_id, action=action, resource=resource, result={"ok": False, "reason": pol.get("reason")})
-                return 403, {"ok": False, "error": "policy_denied", "trace_id": trace.trace_id}
+            if not decision.allowed:
+                rt.audit_writer.record(trace_id=trace.trace_id, actor=user_id, action=action, resource=resource, result={"ok": False, "reason": decision.reason})
+                return 403, {"ok": False, "error": decision.error, "trace_id": trace.trace_id}
 
             if action == "write":
                 rs = deps.risk.score(command=f"bff:{resource}:{action}", context=risk_ctx or {})
                 if rs.disposition == "deny":
-                    rt.state_db.add_audit_log(trace_id=trace.trace_id, actor=user_id, action=action, resource=resource, result={"ok": False, "risk": rs.to_dict()})
+                    rt.audit_writer.record(trace_id=trace.trace_id, actor=user_id, action=action, resource=resource, result={"ok": False, "risk": rs.to_dict()})
                     return 403, {"ok": False, "error": "risk_denied", "risk": rs.to_dict(), "trace_id": trace.trace_id}
                 if rs.disposition == "approve":
                     appr = rt.state_db.create_approval(
@@ -841,12 +1428,38 @@ class _Handler(BaseHTTPRequestHandler):
                         requester={"user_id": user_id, "trace_id": trace.trace_id},
                         expires_at=int(now_unix() + 3600),
                     )
-                    rt.state_db.add_audit_log(trace_id=trace.trace_id, actor=user_id, action=action, resource=resource, result={"ok": False, "approval_id": appr.approval_id, "risk": rs.to_dict()})
+                    rt.audit_writer.record(trace_id=trace.trace_id, actor=user_id, action=action, resource=resource, result={"ok": False, "approval_id": appr.approval_id, "risk": rs.to_dict()})
                     return 409, {"ok": False, "error": "approval_required", "approval_id": appr.approval_id, "risk": rs.to_dict(), "trace_id": trace.trace_id}
 
-            rt.state_db.add_audit_log(trace_id=trace.trace_id, actor=user_id, action=action, resource=resource, result={"ok": True})
+            rt.audit_writer.record(trace_id=trace.trace_id, actor=user_id, action=action, resource=resource, result={"ok": True})
         return None
 
+    def _authorize(self, token: str, action: str, resource: str) -> AuthzDecision | None:
+        deps = self.deps
+        versions = tuple(getattr(d, "version", None) for d in (deps.auth, deps.authorizer, deps.policy))
+        cacheable = None not in versions
+        key = (token, action, resource, self.path.partition("?")[0])
+        if cacheable:
+            hit = deps.authz.get(key, versions)
+            if hit is not None:
+                return hit
+        info = _run_async(deps.auth.validate_token(token), self.loop)
+        if not info:
+            return None
+        user = dict(info.get("user") or {})
+        user_id = str(user.get("user_id") or "")
+        decision = AuthzDecision(allowed=True, user=user)
+        allowed = _run_async(deps.authorizer.check_permission(user_id=user_id, resource=resource, action=action), self.loop)
+        if not allowed:
+            decision = AuthzDecision(allowed=False, user=user, error="permission_denied", reason="rbac")
+        else:
+            pol = _run_async(deps.policy.decide(subject=user, action=action, resource={"type": resource}, context={"path": self.path}), self.loop)
+            if not pol.get("allowed", False):
+                decision = AuthzDecision(allowed=False, user=user, error="policy_denied", reason=pol.get("reason"))
+        if cacheable:
+            deps.authz.put(key, versions, decision, max_age_sec=_seconds_until(info.get("expires_at")))
+        return decision
+
     def _bearer_token(self) -> str:
         auth = str(self.headers.get("Authorization", "") or "")
         if not auth.lower().startswith("bearer "):
@@ -891,11 +1504,41 @@ class _Handler(BaseHTTPRequestHandler):
                 out[k] = v
         return out
 
+    def _cached_json(self, tables: tuple[str, ...], build: Callable[[], tuple[int, Dict[str, Any]]]):
+        etags = self.deps.etags if self.deps else None
+        if not tables or etags is None:
+            self._json(*build())
+            return
+        key = self.path
+        etag = etags.etag(tables, key)
+        if _etag_matches(self.headers.get("If-None-Match", ""), etag):
+            etags.not_modified()
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("traceparent", self._trace().traceparent)
+            self.end_headers()
+            return
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        body = etags.get(key, etag)
+        if body is not None:
+            self._send_body(200, body, headers)
+            return
+        status, obj = build()
+        if status != 200:
+            self._json(status, obj)
+            return
+        body = self._json_body(status, obj)
+        etags.put(key, etag, body)
+        self._send_body(200, body, headers)
+
     def _json(self, status: int, obj: Dict[str, Any]):
+        self._send_body(status, self._json_body(status, obj))
+
+    def _json_body(self, status: int, obj: Dict[str, Any]) -> bytes:
         deps = self.deps
         if deps:
             obj = deps.redactor.redact(obj)
-        trace = self._trace()
         if "ok" not in obj:
             obj["ok"] = status < 400
         if "error" in obj and "error_code" not in obj:
@@ -915,6 +1558,7 @@ class _Handler(BaseHTTPRequestHandler):
                     "approval",
                     "approvals",
                     "reports",
+                    "stats",
                     "agents",
                     "audit",
                     "evidence",
@@ -927,10 +1571,15 @@ class _Handler(BaseHTTPRequestHandler):
                     if key in obj:
                         obj["result"] = obj[key]
                         break
-        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def _send_body(self, status: int, body: bytes, headers: Dict[str, str] | None = None):
+        trace = self._trace()
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
         self.send_header("traceparent", trace.traceparent)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
@@ -940,12 +1589,17 @@ class BffService(ServiceBase):
     def __init__(self):
         super().__init__(ServiceConfig(name="bff", tick_interval_sec=2.0))
         self._rt = build_runtime_container()
-        self._server: _ThreadedHTTPServer | None = None
+        self._server: _ThreadedHTTPServer | _AsyncHTTPServer | None = None
         self._thread: threading.Thread | None = None
+        self._follower_task: asyncio.Task | None = None
         self._cfg = _BffConfig(
             host=os.environ.get("OPENCLAW_BFF_HOST", "127.0.0.1"),
             port=int(os.environ.get("OPENCLAW_BFF_PORT", "8080")),
+            server=os.environ.get("OPENCLAW_BFF_SERVER", "threaded") or "threaded",
+            workers=int(os.environ.get("OPENCLAW_BFF_WORKERS", "16") or 16),
         )
+        if self._cfg.server not in BFF_SERVER_MODES:
+            raise ValueError("invalid_bff_server")
 
     async def initialize(self) -> bool:
         ok = await super().initialize()
@@ -960,19 +1614,47 @@ class BffService(ServiceBase):
             redactor=SimpleRedactor(),
             risk=RiskScorer(),
             system=SystemManager(),
+            events=_SseBroadcaster(
+                self._rt.state_db,
+                interval_sec=float(os.environ.get("OPENCLAW_BFF_SSE_POLL_SEC", "2.0")),
+                max_lag=int(os.environ.get("OPENCLAW_BFF_SSE_MAX_LAG", "30")),
+                work_queue=self._rt.work_queue,
+            ),
+            authz=AuthzDecisionCache(ttl_sec=float(os.environ.get("OPENCLAW_BFF_AUTHZ_TTL_SEC", "2.0") or 0)),
+            etags=_EtagCache(self._rt.state_db, refresh_sec=float(os.environ.get("OPENCLAW_BFF_ETAG_REFRESH_SEC", "1.0") or 1.0)),
         )
         await deps.authorizer.add_role("admin", [{"resource": "*", "action": "*"}])
         await deps.authorizer.add_role("reader", [{"resource": "*", "action": "read"}])
+        # Forward event bus topics published by other processes to SSE clients. The follower
+        # feeds a local bus: republishing on the WAL-backed bus would append the events again.
+        topics = [t.strip() for t in os.environ.get("OPENCLAW_BFF_EVENT_TOPICS", "orchestrator").split(",") if t.strip()]
+        if topics:
+            bus = InMemoryEventBus()
+            for topic in topics:
+                await bus.subscribe(topic, lambda event, topic=topic: deps.events.publish(topic, deps.redactor.redact(event)))
+            deps.follower = WalEventFollower(self._rt.wal.path, self._rt.state_db, bus, subscriber_id="bff", topics=topics, start_seq=self._rt.wal.next_seq)
+            self._follower_task = asyncio.get_running_loop().create_task(deps.follower.run())
         _Handler.deps = deps
+        if self._cfg.server == "asyncio":
+            self._server = _AsyncHTTPServer((self._cfg.host, self._cfg.port), _Handler, workers=self._cfg.workers)
+            self._server.start()
+            return True
         self._server = _ThreadedHTTPServer((self._cfg.host, self._cfg.port), _Handler)
         self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
         self._thread.start()
         return True
 
     async def shutdown(self) -> bool:
+        if _Handler.deps is not None:
+            if _Handler.deps.follower is not None:
+                _Handler.deps.follower.stop()
+                await self._follower_task
+            _Handler.deps.events.stop()
+            _Handler.deps.etags.stop()
         if self._server:
             self._server.shutdown()
             self._server.server_close()
+        self._rt.audit_writer.close()
         return await super().shutdown()
 
     async def tick(self) -> None:
@@ -11,7 +11,7 @@ class OrchestratorService(ServiceBase):
     def __init__(self):
         super().__init__(ServiceConfig(name="orchestrator", tick_interval_sec=1.0))
         self._rt = build_runtime_container()
-        self._engine = RunEngine(state_db=self._rt.state_db, wal=self._rt.wal)
+        self._engine = RunEngine(state_db=self._rt.state_db, wal=self._rt.wal, work_queue=self._rt.work_queue)
 
     async def initialize(self) -> bool:
         ok = await super().initialize()
@@ -25,6 +25,8 @@ class OrchestratorService(ServiceBase):
 
     async def tick(self) -> None:
         health = self._engine.tick()
+        for record_type, data in self._engine.drain_events():
+            await self._rt.event_bus.publish("orchestrator", {"payload": {"type": record_type, **data}})
         payload = {"component": "orchestrator", "state": health.state, "scanned_runs": health.scanned_runs, "progressed_nodes": health.progressed_nodes}
         self._rt.state_store.put("orchestrator/health", payload)
         self._rt.wal.append("orchestrator_tick", payload)
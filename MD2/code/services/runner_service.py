@@ -60,25 +60,27 @@ class RunnerService(ServiceBase):
         return True
 
     async def shutdown(self) -> bool:
+        self._rt.heartbeats.flush()
+        self._rt.audit_writer.close()
         await self._coordinator.shutdown()
         await super().shutdown()
         return True
 
     async def tick(self) -> None:
-        self._rt.state_db.reclaim_expired_leases()
+        self._rt.work_queue.reclaim_expired_leases()
         
         skill_names = [s.name for s in self._loaded_skills]
-        
-        self._rt.state_db.write_agent_heartbeat(
+
+        work_item = self._rt.work_queue.claim_work_item(agent_id=self._config.name, lease_ttl_sec=60)
+        self._rt.heartbeats.record(
             agent_id=self._config.name,
-            status="idle",
+            status="running" if work_item else "idle",
             cpu=0.0,
             mem=0.0,
-            queue_depth=0,
+            queue_depth=1 if work_item else 0,
             skills=skill_names,
             metrics={},
         )
-        work_item = self._rt.state_db.claim_work_item(agent_id=self._config.name, lease_ttl_sec=60)
         if not work_item:
             return
 
@@ -86,25 +88,16 @@ class RunnerService(ServiceBase):
         idem_key = str(work_item.idempotency_key or f"task:{task_id}")
 
         try:
-            self._rt.state_db.write_agent_heartbeat(
-                agent_id=self._config.name,
-                status="running",
-                cpu=0.0,
-                mem=0.0,
-                queue_depth=1,
-                skills=skill_names,
-                metrics={},
-            )
-            marked = self._rt.state_db.mark_work_item_running(task_id=task_id, agent_id=self._config.name)
+            marked = self._rt.work_queue.mark_work_item_running(task_id=task_id, agent_id=self._config.name)
             if not marked:
                 self._rt.wal.append("runner_mark_running_failed", {"task_id": task_id})
                 self._write_audit(task_id=task_id, ok=False, trace_id=self._trace_id_from_work_item(work_item.payload), result={"task_id": task_id, "error": "mark_running_failed"})
-                self._rt.state_db.ack_work_item(task_id=task_id, agent_id=self._config.name, ok=False)
+                self._rt.work_queue.ack_work_item(task_id=task_id, agent_id=self._config.name, ok=False)
                 return
             if self._rt.idempotency.has(idem_key):
                 self._rt.wal.append("runner_skip_idempotent", {"task_id": task_id, "idempotency_key": idem_key})
                 self._write_audit(task_id=task_id, ok=True, trace_id=self._trace_id_from_work_item(work_item.payload), result={"skipped": "idempotent"})
-                self._rt.state_db.ack_work_item(task_id=task_id, agent_id=self._config.name, ok=True)
+                self._rt.work_queue.ack_work_item(task_id=task_id, agent_id=self._config.name, ok=True)
                 return
 
             payload = dict(work_item.payload or {})
@@ -121,13 +114,13 @@ class RunnerService(ServiceBase):
             trace_id = self._trace_id_from_work_item(work_item.payload)
             self._write_evidence(trace_id=trace_id, evidence_type="work_item_result", content={"task_id": task_id, "result": result_payload})
             self._write_audit(task_id=task_id, ok=True, trace_id=trace_id, result={"task_id": task_id})
-            self._rt.state_db.ack_work_item(task_id=task_id, agent_id=self._config.name, ok=True)
+            self._rt.work_queue.ack_work_item(task_id=task_id, agent_id=self._config.name, ok=True)
         except Exception as e:
             self._rt.wal.append("runner_task_error", {"task_id": task_id, "error": str(e)})
             trace_id = self._trace_id_from_work_item(work_item.payload)
             self._write_evidence(trace_id=trace_id, evidence_type="work_item_error", content={"task_id": task_id, "error": str(e)})
             self._write_audit(task_id=task_id, ok=False, trace_id=trace_id, result={"task_id": task_id, "error": str(e)})
-            self._rt.state_db.ack_work_item(task_id=task_id, agent_id=self._config.name, ok=False)
+            self._rt.work_queue.ack_work_item(task_id=task_id, agent_id=self._config.name, ok=False)
 
     async def health(self) -> Dict[str, Any]:
         return await self._coordinator.health_check()
@@ -147,7 +140,7 @@ class RunnerService(ServiceBase):
         return self._rt.state_db.add_evidence(trace_id=trace_id or "unknown", evidence_type=evidence_type, content=content, content_hash=digest)
 
     def _write_audit(self, task_id: str, ok: bool, trace_id: str, result: Dict[str, Any]) -> str:
-        return self._rt.state_db.add_audit_log(
+        return self._rt.audit_writer.record(
             trace_id=trace_id or "unknown",
             actor=self._config.name,
             action="work_item.execute",
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import asdict
 from typing import Any, Dict
 
 from core.runtime import build_runtime_container
@@ -28,6 +29,12 @@ class SchedulerService(ServiceBase):
         payload = {"component": "scheduler", "state": health.state, "due_checked": health.due_checked, "triggered": health.triggered}
         self._rt.state_store.put("scheduler/health", payload)
         self._rt.wal.append("scheduler_tick", payload)
+        retention = self._rt.retention.tick()
+        if retention.state in {"running", "backlog"}:
+            self._rt.state_store.put("retention/health", asdict(retention))
+        compaction = self._rt.wal_compactor.tick()
+        if compaction.state == "running":
+            self._rt.state_store.put("wal/compaction", asdict(compaction))
 
     async def health(self) -> Dict[str, Any]:
         obj = self._rt.state_store.get("scheduler/health") or {}
@@ -0,0 +1,108 @@
+import http.client
+import json
+import os
+import socket
+import sys
+import tempfile
+import unittest
+from http.server import BaseHTTPRequestHandler
+from types import SimpleNamespace
+
+code_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if code_dir not in sys.path:
+    sys.path.insert(0, code_dir)
+
+from core.persistence import DbConfig, StateDB
+from services.bff_service import _AsyncHTTPServer, _SseBroadcaster
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    deps = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._reply({"path": self.path})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", "0") or "0"))
+        self._reply({"path": self.path, "body": json.loads(body.decode("utf-8"))})
+
+    def _reply(self, obj):
+        data = json.dumps(obj).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _events_headers(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+
+class TestAsyncHTTPServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = StateDB(DbConfig(path=os.path.join(self.tmp.name, "state.db")))
+        self.events = _SseBroadcaster(self.db, interval_sec=0.05)
+        _EchoHandler.deps = SimpleNamespace(events=self.events)
+        self.port = _free_port()
+        self.server = _AsyncHTTPServer(("127.0.0.1", self.port), _EchoHandler, workers=2)
+        self.server.start()
+
+    def tearDown(self):
+        self.events.stop()
+        self.server.shutdown()
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_keep_alive_and_post_body_share_one_connection(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        conn.request("GET", "/a")
+        resp = conn.getresponse()
+        self.assertEqual(json.loads(resp.read()), {"path": "/a"})
+        sock = conn.sock
+        self.assertIsNotNone(sock)
+
+        conn.request("POST", "/b", body=json.dumps({"n": 1, "s": "x" * 70000}), headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        got = json.loads(resp.read())
+        self.assertEqual(got["path"], "/b")
+        self.assertEqual(got["body"]["n"], 1)
+        self.assertEqual(len(got["body"]["s"]), 70000)
+
+        conn.request("GET", "/c")
+        self.assertEqual(json.loads(conn.getresponse().read()), {"path": "/c"})
+        self.assertIs(conn.sock, sock)
+        conn.close()
+
+    def test_event_stream_delivers_published_frames(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        conn.request("GET", "/v1/events/stream")
+        resp = conn.getresponse()
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.getheader("Content-Type"), "text/event-stream")
+
+        # A heartbeat means the stream is subscribed, so the publish below is not missed.
+        while resp.fp.readline() != b"event: heartbeat\n":
+            pass
+        self.events.publish("jobs", {"id": 7})
+        frame = b""
+        while b"event: bus" not in frame:
+            frame = resp.fp.readline()
+        data = resp.fp.readline()
+        self.assertEqual(json.loads(data[len(b"data: "):]), {"topic": "jobs", "event": {"id": 7}})
+        conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
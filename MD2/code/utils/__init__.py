@@ -1,5 +1,29 @@
 from __future__ import annotations
 
 from utils.logger import get_logger
+from utils.validation import (
+    ValidationResult,
+    validate_workflow_create,
+    validate_schedule_create,
+    validate_schedule_update,
+    validate_run_trigger,
+    validate_work_item_enqueue,
+    validate_work_item_claim,
+    validate_work_item_ack,
+    validate_approval_decision,
+    validate_system_control,
+)
 
-__all__ = ["get_logger"]
+__all__ = [
+    "get_logger",
+    "ValidationResult",
+    "validate_workflow_create",
+    "validate_schedule_create",
+    "validate_schedule_update",
+    "validate_run_trigger",
+    "validate_work_item_enqueue",
+    "validate_work_item_claim",
+    "validate_work_item_ack",
+    "validate_approval_decision",
+    "validate_system_control",
+]
@@ -13,6 +13,14 @@ class Serializer:
     def loads(data: str) -> Any:
         return json.loads(data)
 
+    @staticmethod
+    def to_json(obj: Any) -> str:
+        return Serializer.dumps(obj)
+
+    @staticmethod
+    def from_json(data: str) -> Any:
+        return Serializer.loads(data)
+
     @staticmethod
     def _default(obj: Any) -> Any:
         if isinstance(obj, datetime):
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass
+class ValidationResult:
+    errors: List[Dict[str, str]] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"errors": list(self.errors)}
+
+
+_TYPES: Dict[str, Tuple[type, ...]] = {
+    "string": (str,),
+    "integer": (int,),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list,),
+}
+
+
+def _check(body: Any, fields: Dict[str, str], choices: Dict[str, Tuple[str, ...]] | None = None) -> ValidationResult:
+    res = ValidationResult()
+    if not isinstance(body, dict):
+        res.errors.append({"field": "", "error": "expected_object"})
+        return res
+    for name, kind in fields.items():
+        value = body.get(name)
+        if value is None:
+            continue
+        # bool is an int subclass, so integers are checked explicitly.
+        ok = isinstance(value, _TYPES[kind]) and not (kind == "integer" and isinstance(value, bool))
+        if not ok:
+            res.errors.append({"field": name, "error": f"expected_{kind}"})
+        elif choices and name in choices and value not in choices[name]:
+            res.errors.append({"field": name, "error": "invalid_choice"})
+    return res
+
+
+def validate_workflow_create(body: Any) -> ValidationResult:
+    return _check(body, {"workflow_id": "string", "version": "string", "dag": "object", "metadata": "object"})
+
+
+def validate_schedule_create(body: Any) -> ValidationResult:
+    return _check(body, {"workflow_id": "string", "version": "string", "enabled": "boolean", "policy": "object"})
+
+
+def validate_schedule_update(body: Any) -> ValidationResult:
+    return _check(body, {"enabled": "boolean", "policy": "object"})
+
+
+def validate_run_trigger(body: Any) -> ValidationResult:
+    return _check(body, {"workflow_id": "string", "version": "string", "run_id": "string", "trace_id": "string", "config_snapshot": "object"})
+
+
+def validate_work_item_enqueue(body: Any) -> ValidationResult:
+    return _check(body, {"task_id": "string", "priority": "integer", "payload": "object", "idempotency_key": "string"})
+
+
+def validate_work_item_claim(body: Any) -> ValidationResult:
+    return _check(body, {"agent_id": "string", "max_priority": "integer", "lease_ttl_sec": "integer"})
+
+
+def validate_work_item_ack(body: Any) -> ValidationResult:
+    return _check(body, {"task_id": "string", "agent_id": "string", "ok": "boolean"})
+
+
+def validate_approval_decision(body: Any) -> ValidationResult:
+    return _check(body, {"decision": "string", "approver": "string", "reason": "string", "conditions": "array"}, {"decision": ("approved", "rejected")})
+
+
+def validate_system_control(body: Any) -> ValidationResult:
+    return _check(body, {"action": "string"})